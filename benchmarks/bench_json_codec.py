@@ -0,0 +1,83 @@
+"""
+Benchmark the JSON backends behind extractors.json_codec.
+
+Decodes search responses the way DexScreenerClient does (raw body bytes,
+one response per page) and encodes the resulting tokens the way the JSON
+exporter does (indented array items and JSON Lines), once per installed
+backend. Pass recorded response bodies to measure real payloads instead
+of synthetic ones:
+
+    python benchmarks/bench_json_codec.py --pairs 100000 --repeat 3
+    python benchmarks/bench_json_codec.py --payload recorded/search-*.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+for path in (ROOT_DIR, ROOT_DIR / "src", ROOT_DIR / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from bench_token_model import best_of, make_pairs  # noqa: E402
+from extractors.json_codec import BACKENDS, JsonCodec  # noqa: E402
+from models.token_model import Token  # noqa: E402
+
+PAGE_SIZE = 30
+
+def synthetic_bodies(pairs: int) -> List[bytes]:
+    payload = make_pairs(pairs)
+    return [
+        json.dumps({"schemaVersion": "1.0.0", "pairs": payload[i : i + PAGE_SIZE]}).encode("utf-8")
+        for i in range(0, len(payload), PAGE_SIZE)
+    ]
+
+def installed_codecs() -> List[JsonCodec]:
+    codecs = []
+    for backend in BACKENDS:
+        try:
+            codecs.append(backend())
+        except ImportError:
+            print(f"{backend.name:<8} not installed, skipped")
+    return codecs
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON decode/encode backends.")
+    parser.add_argument("--pairs", type=int, default=100_000, help="Number of synthetic pairs.")
+    parser.add_argument(
+        "--payload",
+        nargs="*",
+        default=None,
+        help="Recorded response bodies to decode instead of synthetic pages.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; best is reported.")
+    args = parser.parse_args()
+
+    if args.payload:
+        bodies = [Path(name).read_bytes() for name in args.payload]
+    else:
+        bodies = synthetic_bodies(args.pairs)
+    reference = [json.loads(body) for body in bodies]
+    pairs: List[Dict[str, Any]] = [p for data in reference for p in data.get("pairs") or []]
+    records = [token.to_dict() for token in Token.from_pair_payloads(pairs)]
+    total_mb = sum(len(body) for body in bodies) / (1024 * 1024)
+    print(f"responses: {len(bodies)}  pairs: {len(pairs)}  body size: {total_mb:.1f} MiB")
+
+    for codec in installed_codecs():
+        decoded = [codec.loads(body) for body in bodies]
+        assert decoded == reference, f"{codec.name} decodes differently from json"
+
+        decode_s = best_of(args.repeat, lambda: [codec.loads(body) for body in bodies])
+        lines_s = best_of(args.repeat, lambda: [codec.dumps(record) for record in records])
+        indent_s = best_of(
+            args.repeat, lambda: [codec.dumps_indented(record) for record in records]
+        )
+        print(
+            f"{codec.name:<8} decode {decode_s:7.3f}s ({total_mb / decode_s:7.1f} MiB/s)  "
+            f"dumps {lines_s:7.3f}s  dumps_indented {indent_s:7.3f}s"
+        )
+
+if __name__ == "__main__":
+    main()
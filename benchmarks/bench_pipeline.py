@@ -0,0 +1,209 @@
+"""
+End-to-end benchmark of the scrape pipeline against replayed responses.
+
+Each size runs in a fresh subprocess: a fixture of `/search` responses
+(30 pairs each, like the live API) is generated or loaded, then the same
+code path as `src/main.py` fetches every target through a ReplaySession
+(or a local ReplayServer with `--transport server`), builds Tokens,
+de-duplicates them and writes JSON and CSV. Reported per size: pairs per
+second, per-stage timers (request, decode, parse, export) and peak RSS.
+
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 100000
+    python benchmarks/bench_pipeline.py --fixture recorded.jsonl --transport server
+    python benchmarks/bench_pipeline.py --output before.json
+    python benchmarks/bench_pipeline.py --baseline before.json
+
+Record a fixture from the live API with `python src/main.py --record FILE`;
+`--save-fixture` writes the synthetic one for replaying through main.py.
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+for path in (ROOT_DIR, ROOT_DIR / "src", ROOT_DIR / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from bench_raw_retention import current_rss_mb, peak_rss_mb  # noqa: E402
+from bench_token_model import make_pair  # noqa: E402
+from extractors.replay import Fixture, FixtureRecord, ReplayServer, ReplaySession  # noqa: E402
+
+PAGE_SIZE = 30
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+STAGES = ("request", "decode", "parse", "export")
+
+def synthetic_fixture(pairs: int, seed: int = 1) -> Fixture:
+    """One `/search` response per PAGE_SIZE pairs, queried as `bench-000001` etc."""
+    rng = random.Random(seed)
+    now_ms = int(time.time() * 1000)
+    fixture = Fixture()
+    for page, start in enumerate(range(0, pairs, PAGE_SIZE), start=1):
+        body = {
+            "schemaVersion": "1.0.0",
+            "pairs": [
+                make_pair(i, rng, now_ms) for i in range(start, min(start + PAGE_SIZE, pairs))
+            ],
+        }
+        fixture.add(
+            FixtureRecord(
+                path="search",
+                params={"q": f"bench-{page:06d}"},
+                headers={"Content-Type": "application/json"},
+                body=json.dumps(body),
+            )
+        )
+    return fixture
+
+def run_size(args: argparse.Namespace, size: Optional[int]) -> Dict[str, Any]:
+    import scraper
+    from extractors.dexscreener_parser import DexScreenerClient
+    from extractors.async_client import build_pooled_session
+
+    fixture = Fixture.load(Path(args.fixture)) if args.fixture else synthetic_fixture(size or 0)
+    queries = fixture.search_queries()
+    fixture_rss = current_rss_mb()
+
+    settings = scraper.load_settings(scraper.SRC_DIR / "config" / "settings.example.json")
+    settings["dexscreener"]["rateLimit"] = {}
+    settings["dexscreener"]["retry"] = {"maxRetries": 0}
+    settings["output"]["summaryFilename"] = None
+    settings["json"] = {"backend": args.json_backend}
+    pagination = settings.get("pagination", {})
+
+    server = None
+    if args.transport == "server":
+        server = ReplayServer(fixture).start()
+        settings["dexscreener"]["baseUrl"] = server.base_url
+        session = build_pooled_session(args.concurrency)
+    else:
+        session = ReplaySession(fixture, settings["dexscreener"]["baseUrl"])
+    client = DexScreenerClient.from_settings(settings, session=session)
+    jobs = scraper.build_fetch_jobs(
+        [{"query": query} for query in queries], 1, 1, pagination.get("pageSize", 50), pagination
+    )
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        json_path, csv_path = Path(out_dir) / "tokens.json", Path(out_dir) / "tokens.csv"
+        started = time.perf_counter()
+        results = scraper.iter_targets(client, args.concurrency, jobs)
+        writers = scraper.build_writers(settings, json_path, csv_path)
+        exported = scraper.export_streaming(
+            results, writers, deduplicate=True, timers=client.metrics.stages
+        )
+        elapsed = time.perf_counter() - started
+    if server is not None:
+        server.stop()
+
+    counters = client.metrics.as_dict()
+    return {
+        "size": size if size is not None else "recorded",
+        "targets": len(jobs),
+        "pairs": counters["tokens_built"],
+        "exported": exported,
+        "failures": counters["failures"],
+        "seconds": round(elapsed, 3),
+        "pairs_per_second": round(counters["tokens_built"] / elapsed, 1) if elapsed > 0 else 0.0,
+        "stages": {
+            name: stats["totalSeconds"] for name, stats in client.metrics.stages.as_dict().items()
+        },
+        "fixture_rss_mb": round(fixture_rss, 1) if fixture_rss is not None else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+def print_row(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    stages = "  ".join(f"{result['stages'].get(name, 0.0):7.3f}" for name in STAGES)
+    line = (
+        f"{str(result['size']):>8} {result['pairs']:>8} {result['seconds']:8.3f}s "
+        f"{result['pairs_per_second']:>11,.0f}  {stages}  {result['peak_rss_mb']:7.1f} MB"
+    )
+    if result.get("fixture_rss_mb") is not None:
+        line += f" (fixture loaded at {result['fixture_rss_mb']:.1f} MB)"
+    if baseline:
+        speed = result["pairs_per_second"] / baseline["pairs_per_second"] - 1
+        memory = result["peak_rss_mb"] - baseline["peak_rss_mb"]
+        line += f"   vs baseline: {speed:+.1%} pairs/s, {memory:+.1f} MB peak"
+    print(line)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scrape pipeline on replayed responses."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Synthetic pair counts."
+    )
+    parser.add_argument(
+        "--fixture", default=None, help="Replay this recorded fixture instead of synthetic pairs."
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("session", "server"),
+        default="session",
+        help="Replay through a fake requests.Session or a local HTTP server.",
+    )
+    parser.add_argument("--concurrency", type=int, default=1, help="Targets fetched in parallel.")
+    parser.add_argument("--json-backend", default="auto", help="json.backend setting to use.")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", default=None, help="Compare against a previous --output.")
+    parser.add_argument(
+        "--save-fixture",
+        default=None,
+        help="Write the synthetic fixture for the first size and exit.",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.save_fixture:
+        synthetic_fixture(args.sizes[0]).save(Path(args.save_fixture))
+        print(f"Wrote {args.sizes[0]} pairs to {args.save_fixture}")
+        return
+    if args.child:
+        print(json.dumps(run_size(args, args.size)))
+        return
+
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {str(r["size"]): r for r in json.load(f)["results"]}
+
+    child_args = ["--child", "--transport", args.transport]
+    child_args += ["--concurrency", str(args.concurrency), "--json-backend", args.json_backend]
+    runs: List[List[str]] = [["--size", str(size)] for size in args.sizes]
+    if args.fixture:
+        runs = [["--fixture", args.fixture]]
+
+    print(
+        f"{'size':>8} {'pairs':>8} {'wall':>9} {'pairs/s':>11}  "
+        + "  ".join(f"{name:>7}" for name in STAGES)
+        + f"  {'peak RSS':>10}"
+    )
+    results = []
+    for run in runs:
+        output = subprocess.run(
+            [sys.executable, __file__, *child_args, *run],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print_row(result, baseline.get(str(result["size"])))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"transport": args.transport, "concurrency": args.concurrency, "results": results},
+                f,
+                indent=2,
+            )
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Memory benchmark for the raw payload retention policies.
+
+For each policy a fresh subprocess decodes synthetic search responses page
+by page (as DexScreenerClient does), keeps the resulting Tokens and drops the
+response, then reports the resident set size growth:
+
+    python benchmarks/bench_raw_retention.py --pairs 100000
+"""
+import argparse
+import gc
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+for path in (ROOT_DIR, ROOT_DIR / "src", ROOT_DIR / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from bench_token_model import make_pair  # noqa: E402
+from models.token_model import RAW_RETENTION_POLICIES, RawRetention, Token  # noqa: E402
+
+PAGE_SIZE = 30
+
+def current_rss_mb() -> Optional[float]:
+    """Current RSS from /proc (Linux); None where unavailable."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        return None
+    return None
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+def run_policy(policy: str, pairs: int) -> None:
+    retention = RawRetention(policy)
+    rng = random.Random(1)
+    now_ms = int(time.time() * 1000)
+
+    gc.collect()
+    before = current_rss_mb()
+    tokens: List[Token] = []
+    for start in range(0, pairs, PAGE_SIZE):
+        page = [make_pair(i, rng, now_ms) for i in range(start, min(start + PAGE_SIZE, pairs))]
+        # Round-trip through JSON so each page is a fresh, unshared response.
+        body = json.dumps({"schemaVersion": "1.0", "pairs": page})
+        del page
+        response = json.loads(body)
+        tokens.extend(Token.from_pair_payloads(response["pairs"], retention=retention))
+        del response, body
+    gc.collect()
+    after = current_rss_mb()
+
+    result = {"policy": policy, "tokens": len(tokens), "peak_rss_mb": round(peak_rss_mb(), 1)}
+    if before is not None and after is not None:
+        result["retained_rss_mb"] = round(after - before, 1)
+    print(json.dumps(result))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare RSS across raw retention policies.")
+    parser.add_argument("--pairs", type=int, default=100_000, help="Number of synthetic pairs.")
+    parser.add_argument("--policy", choices=RAW_RETENTION_POLICIES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.policy:
+        run_policy(args.policy, args.pairs)
+        return
+
+    print(f"{'policy':<8} {'tokens':>8} {'retained RSS':>14} {'peak RSS':>10}")
+    for policy in RAW_RETENTION_POLICIES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--pairs", str(args.pairs), "--policy", policy],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        retained = result.get("retained_rss_mb")
+        retained_str = f"{retained:.1f} MB" if retained is not None else "n/a"
+        print(
+            f"{result['policy']:<8} {result['tokens']:>8} {retained_str:>14} "
+            f"{result['peak_rss_mb']:>7.1f} MB"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark CLI cold start with `python -X importtime`.
+
+Each scenario runs in fresh interpreters; reported per scenario are the
+best wall time, the total import time (sum of the modules' self times) and
+the slowest top-level imports by cumulative time:
+
+- `help`: `src/main.py --help`, i.e. argument parsing only
+- `history`: `src/history.py --help`
+- `scrape-imports`: everything a scrape run imports before its first request
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --output before.json
+    python benchmarks/bench_startup.py --baseline before.json
+    python benchmarks/bench_startup.py --max-import-ms 30
+
+With `--max-import-ms`, the exit status is 1 if the `help` scenario's
+import time exceeds the budget, so a CI job can keep cold start low.
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT_DIR / "src"
+
+SCENARIOS: Dict[str, List[str]] = {
+    "help": [str(SRC_DIR / "main.py"), "--help"],
+    "history": [str(SRC_DIR / "history.py"), "--help"],
+    "scrape-imports": [
+        "-c",
+        f"import sys; sys.path[:0] = [{str(SRC_DIR)!r}, {str(ROOT_DIR)!r}]; import scraper",
+    ],
+}
+
+# `import time: self [us] | cumulative | imported package`, nesting shown by indent.
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+def parse_importtime(stderr: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """(total import ms, [(top-level module, cumulative ms)]) from -X importtime output."""
+    total_us = 0
+    top_level: List[Tuple[str, float]] = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        total_us += int(self_us)
+        if len(indent) == 1:
+            top_level.append((name, int(cumulative_us) / 1000))
+    return total_us / 1000, top_level
+
+def run_scenario(args: List[str], repeat: int, top: int) -> Dict[str, Any]:
+    walls: List[float] = []
+    imports: List[float] = []
+    slowest: List[Tuple[str, float]] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", *args],
+            capture_output=True,
+            text=True,
+            cwd=str(ROOT_DIR),
+        )
+        walls.append((time.perf_counter() - started) * 1000)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} failed:\n{completed.stderr[-2000:]}")
+        total, top_level = parse_importtime(completed.stderr)
+        if not imports or total < min(imports):
+            slowest = sorted(top_level, key=lambda item: item[1], reverse=True)[:top]
+        imports.append(total)
+    return {
+        "wall_ms": round(min(walls), 1),
+        "import_ms": round(min(imports), 1),
+        "import_ms_median": round(statistics.median(imports), 1),
+        "slowest": [[name, round(ms, 1)] for name, ms in slowest],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold start and import time.")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per scenario; best is reported."
+    )
+    parser.add_argument("--top", type=int, default=8, help="Slowest top-level imports to list.")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", default=None, help="Compare against a previous --output.")
+    parser.add_argument(
+        "--max-import-ms",
+        type=float,
+        default=None,
+        help="Fail if the 'help' scenario imports take longer than this.",
+    )
+    args = parser.parse_args()
+
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in args.scenarios:
+        result = run_scenario(SCENARIOS[name], args.repeat, args.top)
+        results[name] = result
+        line = (
+            f"{name:<15} wall {result['wall_ms']:7.1f} ms   "
+            f"imports {result['import_ms']:7.1f} ms"
+        )
+        previous: Optional[Dict[str, Any]] = baseline.get(name)
+        if previous:
+            line += (
+                f"   vs baseline: {result['wall_ms'] - previous['wall_ms']:+.1f} ms wall, "
+                f"{result['import_ms'] - previous['import_ms']:+.1f} ms imports"
+            )
+        print(line)
+        for module, ms in result["slowest"]:
+            print(f"    {ms:7.1f} ms  {module}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.max_import_ms is not None and "help" in results:
+        if results["help"]["import_ms"] > args.max_import_ms:
+            print(
+                f"help imports took {results['help']['import_ms']:.1f} ms, "
+                f"over the {args.max_import_ms:.1f} ms budget."
+            )
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Micro-benchmark for Token construction and serialization.
+
+Builds a synthetic DexScreener search payload (100k pairs by default) and
+times `Token.from_pair_payload`, the batched `Token.from_pair_payloads`
+(one shared `now`) and `Token.to_dict` over it. Run it on two
+revisions to compare:
+
+    python benchmarks/bench_token_model.py --pairs 100000 --repeat 3
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+for path in (ROOT_DIR, ROOT_DIR / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from models.token_model import Token  # noqa: E402
+
+CHAINS = ("solana", "ethereum", "bsc", "base")
+DEXES = ("raydium", "uniswap", "pancakeswap", "pumpfun")
+
+def make_pair(i: int, rng: random.Random, now_ms: int) -> Dict[str, Any]:
+    chain = CHAINS[i % len(CHAINS)]
+    pair_address = f"Pool{i:08d}{rng.getrandbits(64):016x}"
+    return {
+        "chainId": chain,
+        "dexId": DEXES[i % len(DEXES)],
+        "url": f"https://dexscreener.com/{chain}/{pair_address.lower()}",
+        "pairAddress": pair_address,
+        "baseToken": {"address": f"Tok{i:08d}", "name": f"Token {i}", "symbol": f"T{i}"},
+        "quoteToken": {"address": "So11111111111111111111111111111111111111112", "symbol": "SOL"},
+        "priceNative": f"{rng.random():.9f}",
+        "priceUsd": f"{rng.random() * 10:.8f}",
+        "txns": {
+            "m5": {"buys": rng.randint(0, 50), "sells": rng.randint(0, 50)},
+            "h24": {"buys": rng.randint(0, 5000), "sells": rng.randint(0, 5000)},
+        },
+        "volume": {"m5": rng.random() * 1e3, "h24": rng.random() * 1e6},
+        "priceChange": {
+            "m5": rng.uniform(-10, 10),
+            "h1": rng.uniform(-30, 30),
+            "h6": rng.uniform(-50, 50),
+            "h24": rng.uniform(-90, 90),
+        },
+        "liquidity": {"usd": rng.random() * 1e6, "base": rng.random() * 1e9, "quote": rng.random() * 1e3},
+        "fdv": rng.random() * 1e8,
+        "marketCap": rng.random() * 1e8,
+        "pairCreatedAt": now_ms - rng.randint(0, 90 * 24 * 3600 * 1000),
+        "info": {
+            "imageUrl": f"https://dd.dexscreener.com/ds-data/tokens/{chain}/{i}.png",
+            "websites": [{"label": "Website", "url": f"https://token{i}.example"}],
+            "socials": [{"type": "twitter", "url": f"https://x.com/token{i}"}],
+        },
+        "boosts": {"active": rng.randint(0, 3)},
+    }
+
+def make_pairs(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    now_ms = int(time.time() * 1000)
+    return [make_pair(i, rng, now_ms) for i in range(count)]
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Token construction and to_dict().")
+    parser.add_argument("--pairs", type=int, default=100_000, help="Number of synthetic pairs.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; best is reported.")
+    args = parser.parse_args()
+
+    pairs = make_pairs(args.pairs)
+    tokens: List[Token] = []
+
+    def build() -> None:
+        tokens[:] = [Token.from_pair_payload(pair) for pair in pairs]
+
+    def build_batch() -> None:
+        tokens[:] = Token.from_pair_payloads(pairs)
+
+    def serialize() -> None:
+        for token in tokens:
+            token.to_dict()
+
+    build_s = best_of(args.repeat, build)
+    batch_s = best_of(args.repeat, build_batch) if hasattr(Token, "from_pair_payloads") else None
+    dict_s = best_of(args.repeat, serialize)
+
+    print(f"pairs:            {args.pairs}")
+    print(f"from_pair_payload {build_s:8.3f}s  {args.pairs / build_s:12,.0f} pairs/s")
+    if batch_s is not None:
+        print(f"from_pair_payloads{batch_s:8.3f}s  {args.pairs / batch_s:12,.0f} pairs/s")
+    print(f"to_dict           {dict_s:8.3f}s  {args.pairs / dict_s:12,.0f} tokens/s")
+    print(f"total             {build_s + dict_s:8.3f}s")
+
+if __name__ == "__main__":
+    main()
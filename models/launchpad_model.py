@@ -1,9 +1,20 @@
-thonfrom __future__ import annotations
+from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+# DexScreener dexIds of launchpads, mapped to the platform name exported in
+# `launchpadPlatform`. Pools that graduated to an AMM (e.g. pump.fun's
+# pumpswap) trade like any DEX pair and are deliberately not listed.
+LAUNCHPAD_PLATFORMS: Dict[str, str] = {
+    "moonshot": "moonshot",
+    "pumpfun": "pump.fun",
+    "pump.fun": "pump.fun",
+    "moonit": "moonit",
+    "launchlab": "launchlab",
+}
+
 @dataclass
 class Launchpad:
     """
@@ -41,4 +52,36 @@ class Launchpad:
                 ts = float(ts)
             except (TypeError, ValueError):
                 return None
-            if ts > 10_000_000_000:  # heuristically treat as ms
\ No newline at end of file
+            if ts > 10_000_000_000:  # heuristically treat as ms
+                ts /= 1000.0
+            try:
+                return datetime.utcfromtimestamp(ts)
+            except (OverflowError, OSError, ValueError):
+                return None
+
+        return cls(
+            platform=platform or payload.get("platform"),
+            status=payload.get("status"),
+            softCapUsd=to_float(payload.get("softCapUsd") or payload.get("softCap")),
+            hardCapUsd=to_float(payload.get("hardCapUsd") or payload.get("hardCap")),
+            raisedUsd=to_float(payload.get("raisedUsd") or payload.get("raised")),
+            progressPercent=to_float(payload.get("progressPercent") or payload.get("progress")),
+            startTime=parse_ts(payload.get("startTime")),
+            endTime=parse_ts(payload.get("endTime")),
+            raw=payload,
+        )
+
+    @classmethod
+    def from_pair(cls, pair: Dict[str, Any]) -> Optional["Launchpad"]:
+        """
+        Parse the launchpad section of a DexScreener pair payload, which is
+        keyed by the pair's dexId (e.g. `moonshot: {progress, ...}`) or a
+        generic `launchpad` key. Returns None if the pair carries neither.
+        """
+        dex_id = pair.get("dexId")
+        payload = pair.get(dex_id) if isinstance(dex_id, str) else None
+        if not isinstance(payload, dict):
+            payload = pair.get("launchpad")
+        if not isinstance(payload, dict):
+            return None
+        return cls.from_payload(payload, platform=LAUNCHPAD_PLATFORMS.get(dex_id, dex_id))
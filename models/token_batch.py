@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import time
+import typing
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.token_model import EXPORT_FIELDS, Token, extract_pair_values
+
+def _column_types() -> Dict[str, type]:
+    """Resolve each exported Token field to its scalar type (str/int/float)."""
+    hints = typing.get_type_hints(Token)
+    types: Dict[str, type] = {}
+    for name in EXPORT_FIELDS:
+        args = [arg for arg in typing.get_args(hints[name]) if arg is not type(None)]
+        types[name] = args[0] if args else hints[name]
+    return types
+
+# Scalar type of every exported column, in EXPORT_FIELDS order.
+COLUMN_TYPES: Dict[str, type] = _column_types()
+
+class TokenBatch:
+    """
+    Columnar representation of many tokens: one typed list per exported
+    Token field.
+
+    Batches can be filled straight from pair payloads without creating
+    Token objects, or from Tokens already built by the client. Either way no
+    per-row dict is created, which makes them the natural feed for columnar
+    exporters such as Parquet and Arrow IPC.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, List[Any]] = {name: [] for name in EXPORT_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.columns[EXPORT_FIELDS[0]])
+
+    def append_values(self, values: Tuple[Any, ...]) -> None:
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+
+    def append_token(self, token: Token) -> None:
+        for name, column in self.columns.items():
+            column.append(getattr(token, name))
+
+    def extend_tokens(self, tokens: Iterable[Token]) -> None:
+        for token in tokens:
+            self.append_token(token)
+
+    @classmethod
+    def from_pair_payloads(
+        cls, pairs: Iterable[Dict[str, Any]], now: Optional[float] = None
+    ) -> "TokenBatch":
+        now = time.time() if now is None else now
+        batch = cls()
+        for pair in pairs:
+            batch.append_values(extract_pair_values(pair, now))
+        return batch
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token]) -> "TokenBatch":
+        batch = cls()
+        batch.extend_tokens(tokens)
+        return batch
+
+    def clear(self) -> None:
+        for column in self.columns.values():
+            column.clear()
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Iterate rows as dicts, matching Token.to_dict() output."""
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
@@ -1,16 +1,66 @@
-thonfrom __future__ import annotations
+from __future__ import annotations
 
-from dataclasses import dataclass, asdict, field
-from typing import Any, Dict, Optional
+import logging
+import time
+from dataclasses import dataclass, field, fields
+from math import isfinite
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from extractors.token_utils import (
     derive_lower_pool_address,
     compute_age_hours_from_timestamp,
-    safe_get_nested,
     get_token_image_url,
 )
+from models.launchpad_model import LAUNCHPAD_PLATFORMS, Launchpad
 
-@dataclass
+logger = logging.getLogger("dexscreener.models.token_model")
+
+RAW_RETENTION_NONE = "none"
+RAW_RETENTION_SUBSET = "subset"
+RAW_RETENTION_FULL = "full"
+RAW_RETENTION_POLICIES = (RAW_RETENTION_NONE, RAW_RETENTION_SUBSET, RAW_RETENTION_FULL)
+
+# Top-level pair keys kept by the "subset" policy unless configured otherwise.
+DEFAULT_RAW_KEYS: Tuple[str, ...] = ("chainId", "dexId", "pairAddress", "url", "labels")
+
+@dataclass(frozen=True)
+class RawRetention:
+    """
+    How much of the source pair payload a Token keeps in `raw`.
+
+    - "none":   nothing; `raw` is an empty dict (the lean default for exports)
+    - "subset": only the top-level `keys`, shallow-copied out of the payload
+    - "full":   the payload itself, keeping the whole API response alive
+    """
+
+    policy: str = RAW_RETENTION_NONE
+    keys: Tuple[str, ...] = DEFAULT_RAW_KEYS
+
+    def __post_init__(self) -> None:
+        if self.policy not in RAW_RETENTION_POLICIES:
+            raise ValueError(
+                f"Unknown raw retention policy {self.policy!r}; "
+                f"expected one of {', '.join(RAW_RETENTION_POLICIES)}."
+            )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RawRetention":
+        keys = config.get("keys")
+        return cls(
+            policy=config.get("policy", RAW_RETENTION_NONE),
+            keys=tuple(keys) if keys is not None else DEFAULT_RAW_KEYS,
+        )
+
+    def apply(self, pair: Dict[str, Any]) -> Dict[str, Any]:
+        if self.policy == RAW_RETENTION_FULL:
+            return pair
+        if self.policy == RAW_RETENTION_SUBSET:
+            return {key: pair[key] for key in self.keys if key in pair}
+        return {}
+
+RETAIN_FULL = RawRetention(RAW_RETENTION_FULL)
+
+@dataclass(slots=True)
 class Token:
     tokenName: Optional[str] = None
     tokenSymbol: Optional[str] = None
@@ -30,92 +80,243 @@ class Token:
     address: Optional[str] = None
     lowerPoolAddress: Optional[str] = None
     tokenImageUrl: Optional[str] = None
+    # Set for pairs on a launchpad dexId; the rest is filled in by the
+    # launchpad enrichment stage.
+    launchpadPlatform: Optional[str] = None
+    launchpadStatus: Optional[str] = None
+    launchpadProgress: Optional[float] = None
+    launchpadRaisedUsd: Optional[float] = None
 
     raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+    launchpad: Optional[Launchpad] = field(default=None, repr=False)
 
     @classmethod
-    def from_pair_payload(cls, pair: Dict[str, Any]) -> "Token":
+    def from_pair_payload(
+        cls,
+        pair: Dict[str, Any],
+        now: Optional[float] = None,
+        retention: RawRetention = RETAIN_FULL,
+    ) -> "Token":
         """
         Build a Token instance from a single DexScreener pair payload.
 
         The mapping is intentionally defensive and tolerant of missing keys.
+        `now` (epoch seconds) is the reference time for `age`; pass one value
+        for a whole batch to avoid re-reading the clock per pair.
         """
-        base_token = pair.get("baseToken") or {}
-        chain_id = pair.get("chainId")
-        pair_address = pair.get("pairAddress")
-
-        # Price, volume, txns, and price change snapshots
-        price_usd = _to_float(pair.get("priceUsd"))
-        liquidity_usd = _to_float(safe_get_nested(pair, "liquidity", "usd"))
-        market_cap_usd = _to_float(pair.get("fdv"))
-        volume_24h = _to_float(safe_get_nested(pair, "volume", "h24"))
-
-        # Transactions count over the last 24h
-        tx_buys_24h = _to_int(safe_get_nested(pair, "txns", "h24", "buys", default=0))
-        tx_sells_24h = _to_int(safe_get_nested(pair, "txns", "h24", "sells", default=0))
-        transaction_count = (tx_buys_24h or 0) + (tx_sells_24h or 0)
-
-        # Price changes
-        price_change_5m = _to_float(safe_get_nested(pair, "priceChange", "m5"))
-        price_change_1h = _to_float(safe_get_nested(pair, "priceChange", "h1"))
-        price_change_6h = _to_float(safe_get_nested(pair, "priceChange", "h6"))
-        price_change_24h = _to_float(safe_get_nested(pair, "priceChange", "h24"))
-
-        # Boost metrics (DexScreener exposes e.g. boostScore)
-        boost_score = _to_float(pair.get("boostScore") or pair.get("boost"))
+        now = time.time() if now is None else now
+        return cls(*extract_pair_values(pair, now), raw=retention.apply(pair))
 
-        # Age in hours from pairCreatedAt
-        created_ms = pair.get("pairCreatedAt")
-        age_hours = compute_age_hours_from_timestamp(created_ms) if created_ms else None
-
-        # Pair details URL
-        explicit_url = pair.get("url")
-        if not explicit_url and chain_id and pair_address:
-            explicit_url = f"https://dexscreener.com/{chain_id}/{pair_address}"
-
-        lower_pool_address = derive_lower_pool_address(explicit_url)
+    @classmethod
+    def from_pair_payloads(
+        cls,
+        pairs: Iterable[Dict[str, Any]],
+        now: Optional[float] = None,
+        retention: RawRetention = RETAIN_FULL,
+    ) -> List["Token"]:
+        """
+        Build Tokens for a batch of pairs sharing a single `now`. Pairs that
+        fail to map are skipped, as in DexScreenerClient.
 
-        token_image_url = get_token_image_url(pair)
+        `retention` controls how much of each pair is kept in `raw`.
+        """
+        now = time.time() if now is None else now
+        keep = retention.apply
+        tokens: List[Token] = []
+        for pair in pairs:
+            try:
+                tokens.append(cls(*extract_pair_values(pair, now), raw=keep(pair)))
+            except Exception as exc:
+                logger.debug("Failed to parse pair into Token, skipping. Error: %s", exc, exc_info=True)
+        return tokens
 
-        return cls(
-            tokenName=base_token.get("name"),
-            tokenSymbol=base_token.get("symbol"),
-            priceUsd=price_usd,
-            age=age_hours,
-            transactionCount=transaction_count or None,
-            volumeUsd=volume_24h,
-            makerCount=_to_int(safe_get_nested(pair, "makers", "h24") or pair.get("makerCount")),
-            priceChange5m=price_change_5m,
-            priceChange1h=price_change_1h,
-            priceChange6h=price_change_6h,
-            priceChange24h=price_change_24h,
-            liquidityUsd=liquidity_usd,
-            marketCapUsd=market_cap_usd,
-            boost=boost_score,
-            pairDetailUrl=explicit_url,
-            address=base_token.get("address"),
-            lowerPoolAddress=lower_pool_address,
-            tokenImageUrl=token_image_url,
-            raw=pair,
-        )
+    @classmethod
+    def from_pair_rows(
+        cls,
+        rows: Iterable[Tuple[Dict[str, Any], Optional[Tuple[Any, ...]]]],
+        now: Optional[float] = None,
+        retention: RawRetention = RETAIN_FULL,
+    ) -> List["Token"]:
+        """
+        Like from_pair_payloads, for (pair, values) rows whose
+        extract_pair_values() tuple may already be known (e.g. from a
+        PairPipeline). Only rows without one are mapped here.
+        """
+        now = time.time() if now is None else now
+        keep = retention.apply
+        tokens: List[Token] = []
+        for pair, values in rows:
+            try:
+                if values is None:
+                    values = extract_pair_values(pair, now)
+                tokens.append(cls(*values, raw=keep(pair)))
+            except Exception as exc:
+                logger.debug("Failed to parse pair into Token, skipping. Error: %s", exc, exc_info=True)
+        return tokens
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Represent the token as a JSON-serializable dict with the fields defined
         in the README. The internal `raw` payload is intentionally omitted.
+
+        Written out by hand: dataclasses.asdict() would deep-copy `raw`
+        only for it to be thrown away.
         """
-        data = asdict(self)
-        # Remove raw payload
-        data.pop("raw", None)
-        return data
+        return {
+            "tokenName": self.tokenName,
+            "tokenSymbol": self.tokenSymbol,
+            "priceUsd": self.priceUsd,
+            "age": self.age,
+            "transactionCount": self.transactionCount,
+            "volumeUsd": self.volumeUsd,
+            "makerCount": self.makerCount,
+            "priceChange5m": self.priceChange5m,
+            "priceChange1h": self.priceChange1h,
+            "priceChange6h": self.priceChange6h,
+            "priceChange24h": self.priceChange24h,
+            "liquidityUsd": self.liquidityUsd,
+            "marketCapUsd": self.marketCapUsd,
+            "boost": self.boost,
+            "pairDetailUrl": self.pairDetailUrl,
+            "address": self.address,
+            "lowerPoolAddress": self.lowerPoolAddress,
+            "tokenImageUrl": self.tokenImageUrl,
+            "launchpadPlatform": self.launchpadPlatform,
+            "launchpadStatus": self.launchpadStatus,
+            "launchpadProgress": self.launchpadProgress,
+            "launchpadRaisedUsd": self.launchpadRaisedUsd,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Token":
+        """Rebuild a Token from its to_dict() form (e.g. a partial export)."""
+        return cls(*(data.get(name) for name in EXPORT_FIELDS))
+
+    def attach_launchpad(self, launchpad: Launchpad) -> None:
+        """Attach parsed launchpad metrics and copy them into the exported fields."""
+        self.launchpad = launchpad
+        self.launchpadPlatform = launchpad.platform or self.launchpadPlatform
+        self.launchpadStatus = launchpad.status
+        self.launchpadProgress = launchpad.progressPercent
+        self.launchpadRaisedUsd = launchpad.raisedUsd
+
+# Exported field names, in output column order (everything except the
+# `raw` payload and the parsed `launchpad` object).
+EXPORT_FIELDS: Tuple[str, ...] = tuple(
+    f.name for f in fields(Token) if f.name not in ("raw", "launchpad")
+)
+
+def extract_pair_values(pair: Dict[str, Any], now: Optional[float] = None) -> Tuple[Any, ...]:
+    """
+    Map a single DexScreener pair payload to Token field values, in
+    EXPORT_FIELDS order.
+
+    Shared by Token.from_pair_payload and the columnar TokenBatch so both
+    produce identical values. The mapping is intentionally defensive and
+    tolerant of missing keys, and reads each nested section of the payload
+    only once.
+    """
+    get = pair.get
+    base_token = get("baseToken") or {}
+    chain_id = get("chainId")
+    pair_address = get("pairAddress")
+
+    # Nested sections; anything that is not a dict behaves as missing.
+    liquidity = get("liquidity")
+    volume = get("volume")
+    txns = get("txns")
+    price_change = get("priceChange")
+    makers = get("makers")
+    if not isinstance(liquidity, dict):
+        liquidity = _EMPTY
+    if not isinstance(volume, dict):
+        volume = _EMPTY
+    if not isinstance(price_change, dict):
+        price_change = _EMPTY
+    txns_24h = txns.get("h24", _EMPTY) if isinstance(txns, dict) else _EMPTY
+    if not isinstance(txns_24h, dict):
+        txns_24h = _EMPTY
+
+    # Transactions count over the last 24h
+    tx_buys_24h = _to_int(txns_24h.get("buys", 0))
+    tx_sells_24h = _to_int(txns_24h.get("sells", 0))
+    transaction_count = (tx_buys_24h or 0) + (tx_sells_24h or 0)
+
+    # Age in hours from pairCreatedAt
+    created_ms = get("pairCreatedAt")
+    age_hours = compute_age_hours_from_timestamp(created_ms, now) if created_ms else None
+
+    # Pair details URL
+    explicit_url = get("url")
+    if not explicit_url and chain_id and pair_address:
+        explicit_url = f"https://dexscreener.com/{chain_id}/{pair_address}"
+
+    maker_count = makers.get("h24") if isinstance(makers, dict) else None
+    dex_id = get("dexId")
+
+    return (
+        base_token.get("name"),
+        base_token.get("symbol"),
+        _to_float(get("priceUsd")),
+        age_hours,
+        transaction_count or None,
+        _to_float(volume.get("h24")),
+        _to_int(maker_count or get("makerCount")),
+        _to_float(price_change.get("m5")),
+        _to_float(price_change.get("h1")),
+        _to_float(price_change.get("h6")),
+        _to_float(price_change.get("h24")),
+        _to_float(liquidity.get("usd")),
+        _to_float(get("fdv")),
+        # Boost metrics (DexScreener exposes e.g. boostScore)
+        _to_float(get("boostScore") or get("boost")),
+        explicit_url,
+        base_token.get("address"),
+        derive_lower_pool_address(explicit_url),
+        get_token_image_url(pair),
+        LAUNCHPAD_PLATFORMS.get(dex_id) if dex_id else None,
+        # Launchpad status, progress and raised amount come from enrichment.
+        None,
+        None,
+        None,
+    )
+
+_EMPTY: Dict[str, Any] = {}
+
+# Numeric Token fields that pairs can be filtered and ranked on before any
+# Token is built, with their position in extract_pair_values()' result, so
+# a filter sees exactly the value the exported Token would have.
+PAIR_NUMERIC_FIELDS: Dict[str, int] = {
+    name: EXPORT_FIELDS.index(name)
+    for name in (
+        "priceUsd",
+        "age",
+        "transactionCount",
+        "volumeUsd",
+        "makerCount",
+        "priceChange5m",
+        "priceChange1h",
+        "priceChange6h",
+        "priceChange24h",
+        "liquidityUsd",
+        "marketCapUsd",
+        "boost",
+    )
+}
 
 def _to_float(value: Any) -> Optional[float]:
+    """
+    Numeric API value as a float. NaN and infinities count as missing, so
+    every exporter writes them as null (JSON has no literal for them).
+    """
     if value is None:
         return None
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
+    if type(value) is not float:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+    return value if isfinite(value) else None
 
 def _to_int(value: Any) -> Optional[int]:
     if value is None:
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from extractors.address_lookup import plan_lookup_batches
+from extractors.async_client import FetchJob, FetchResult
+from models.token_model import Token
+
+logger = logging.getLogger("dexscreener.extractors.adaptive_scheduler")
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    """
+    Settings of the adaptive watch scheduler (the `scheduler` block).
+
+    A token's heat adds up its normalized signals: |priceChange5m| in units
+    of `volatility_5m_percent`, |priceChange1h| in units of
+    `volatility_1h_percent`, log2(1 + volumeUsd / `hot_volume_usd`), and up
+    to `new_pair_heat` for a pair younger than `new_pair_hours`, fading
+    linearly with age. A target refreshes every
+    `max_interval / (1 + heat)` seconds, clamped to
+    [`min_interval`, `max_interval`].
+    """
+
+    requests_per_minute: float = 240.0
+    min_interval: float = 5.0
+    max_interval: float = 300.0
+    tick_seconds: float = 1.0
+    volatility_5m_percent: float = 2.0
+    volatility_1h_percent: float = 10.0
+    hot_volume_usd: float = 100_000.0
+    new_pair_hours: float = 6.0
+    new_pair_heat: float = 20.0
+
+    def __post_init__(self) -> None:
+        if self.requests_per_minute <= 0:
+            raise ValueError("scheduler.requestsPerMinute must be positive.")
+        if not 0 < self.min_interval <= self.max_interval:
+            raise ValueError(
+                "scheduler.minIntervalSeconds must be positive and at most maxIntervalSeconds."
+            )
+
+    @classmethod
+    def from_config(
+        cls, config: Dict[str, Any], rate_limit_per_minute: Optional[float] = None
+    ) -> "SchedulerConfig":
+        """
+        Build from the `scheduler` settings block. Without a
+        `requestsPerMinute`, the budget is 80% of the client's rate limit so
+        retries keep some headroom.
+        """
+        default = cls()
+        budget = config.get("requestsPerMinute")
+        if budget is None:
+            budget = (
+                0.8 * rate_limit_per_minute
+                if rate_limit_per_minute
+                else default.requests_per_minute
+            )
+        return cls(
+            requests_per_minute=float(budget),
+            min_interval=float(config.get("minIntervalSeconds", default.min_interval)),
+            max_interval=float(config.get("maxIntervalSeconds", default.max_interval)),
+            tick_seconds=float(config.get("tickSeconds", default.tick_seconds)),
+            volatility_5m_percent=float(
+                config.get("volatility5mPercent", default.volatility_5m_percent)
+            ),
+            volatility_1h_percent=float(
+                config.get("volatility1hPercent", default.volatility_1h_percent)
+            ),
+            hot_volume_usd=float(config.get("hotVolumeUsd", default.hot_volume_usd)),
+            new_pair_hours=float(config.get("newPairHours", default.new_pair_hours)),
+            new_pair_heat=float(config.get("newPairHeat", default.new_pair_heat)),
+        )
+
+def token_heat(token: Token, config: SchedulerConfig) -> float:
+    """How much a pair is moving; 0 for a flat, illiquid, old pair."""
+    heat = 0.0
+    if token.priceChange5m is not None:
+        heat += abs(token.priceChange5m) / config.volatility_5m_percent
+    if token.priceChange1h is not None:
+        heat += abs(token.priceChange1h) / config.volatility_1h_percent
+    if token.volumeUsd:
+        heat += math.log2(1.0 + max(0.0, token.volumeUsd) / config.hot_volume_usd)
+    if token.age is not None and 0 <= token.age < config.new_pair_hours:
+        heat += config.new_pair_heat * (1.0 - token.age / config.new_pair_hours)
+    return heat
+
+def interval_for_heat(heat: float, config: SchedulerConfig) -> float:
+    return min(config.max_interval, max(config.min_interval, config.max_interval / (1.0 + heat)))
+
+def estimate_cost(job: FetchJob) -> int:
+    """Requests one refresh of `job` takes, before any result has been seen."""
+    if job.is_lookup:
+        return max(1, len(plan_lookup_batches([job.lookup_request()])))
+    return max(1, job.max_pages)
+
+@dataclass
+class ScheduleEntry:
+    position: int
+    cost: int
+    interval: float
+    heat: float = 0.0
+    fetched_at: Optional[float] = None
+
+class AdaptiveScheduler:
+    """
+    Decides which watch targets to refresh on each tick.
+
+    Every target gets an interval from the heat of the hottest pair it
+    returned last time, so a query or pool list with an exploding new token
+    refreshes every few seconds and one with only stale pairs every few
+    minutes. The refreshes are paced by a request budget per minute:
+
+    - if the desired intervals would need more than the budget, all of
+      them are stretched by the same factor, so hot targets stay
+      proportionally ahead of cold ones;
+    - a credit bucket refilled at the budget rate is charged each target's
+      cost (search pages or lookup batches), and due targets are taken
+      most-overdue first while credit lasts.
+
+    The first round fetches every target regardless of credit, since there
+    is no snapshot yet; the resulting debt is paid off before the next one.
+    Entries are scanned linearly each tick, which stays cheap for the
+    hundreds of targets a watch deployment tracks and keeps rescaling free.
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[FetchJob],
+        config: Optional[SchedulerConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.jobs = jobs
+        self.config = config or SchedulerConfig()
+        self._clock = clock
+        self._rate = self.config.requests_per_minute / 60.0
+        self._capacity = max(
+            self._rate * self.config.min_interval,
+            float(max((estimate_cost(job) for job in jobs), default=1)),
+        )
+        self._credit = self._capacity
+        self._updated = clock()
+        self.entries: List[ScheduleEntry] = [
+            ScheduleEntry(position, estimate_cost(job), self.config.max_interval)
+            for position, job in enumerate(jobs)
+        ]
+        self.scale = 1.0
+        self.requests_planned = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._credit = min(self._capacity, self._credit + elapsed * self._rate)
+            self._updated = now
+
+    def _rescale(self) -> None:
+        demand = sum(entry.cost / entry.interval for entry in self.entries) * 60.0
+        self.scale = max(1.0, demand / self.config.requests_per_minute)
+
+    def due_at(self, entry: ScheduleEntry) -> float:
+        if entry.fetched_at is None:
+            return float("-inf")
+        return entry.fetched_at + entry.interval * self.scale
+
+    def due(self, now: Optional[float] = None) -> List[int]:
+        """
+        Positions of the targets to refresh now, in job order, charged
+        against the request budget.
+        """
+        now = self._clock() if now is None else now
+        self._refill(now)
+        first_round = all(entry.fetched_at is None for entry in self.entries)
+        overdue = [entry for entry in self.entries if self.due_at(entry) <= now]
+        overdue.sort(key=lambda entry: (now - self.due_at(entry)) / entry.interval, reverse=True)
+
+        selected: List[int] = []
+        for entry in overdue:
+            if not first_round and entry.cost > self._credit:
+                break
+            self._credit -= entry.cost
+            self.requests_planned += entry.cost
+            selected.append(entry.position)
+        return sorted(selected)
+
+    def seconds_until_due(self, now: Optional[float] = None) -> float:
+        """Time until some target is both due and affordable."""
+        now = self._clock() if now is None else now
+        self._refill(now)
+        wait = self.config.max_interval * self.scale
+        for entry in self.entries:
+            ready = self.due_at(entry) - now
+            if entry.cost > self._credit:
+                ready = max(ready, (entry.cost - self._credit) / self._rate)
+            wait = min(wait, ready)
+        return max(0.0, wait)
+
+    def observe(
+        self, position: int, result: FetchResult, now: Optional[float] = None
+    ) -> None:
+        """
+        Record a refresh of `position`. A successful one resets the target's
+        interval from the heat of its tokens (and, for searches, its cost
+        from the pages actually fetched); a failed one keeps the previous
+        interval so the target is simply retried on its usual cadence.
+        """
+        now = self._clock() if now is None else now
+        entry = self.entries[position]
+        entry.fetched_at = now
+        if result.ok:
+            entry.heat = max(
+                (token_heat(token, self.config) for token in result.tokens), default=0.0
+            )
+            entry.interval = interval_for_heat(entry.heat, self.config)
+            if result.coverage is not None:
+                entry.cost = max(1, result.coverage.pages_fetched)
+        self._rescale()
+
+    def observe_many(
+        self, results: Iterable[Tuple[int, FetchResult]], now: Optional[float] = None
+    ) -> None:
+        for position, result in results:
+            self.observe(position, result, now)
+
+    def hottest(self, limit: int = 5) -> List[ScheduleEntry]:
+        return sorted(self.entries, key=lambda entry: entry.heat, reverse=True)[:limit]
+
+def build_scheduler(
+    config: Dict[str, Any],
+    jobs: Sequence[FetchJob],
+    rate_limit_per_minute: Optional[float] = None,
+    enabled: bool = False,
+) -> Optional[AdaptiveScheduler]:
+    """
+    Build the scheduler from the `scheduler` settings block.
+
+    Returns None unless the block or `enabled` (e.g. `--adaptive`) turns it on.
+    Raises ValueError for inconsistent intervals or budgets.
+    """
+    if not (enabled or config.get("enabled", False)):
+        return None
+    scheduler = AdaptiveScheduler(
+        jobs, SchedulerConfig.from_config(config, rate_limit_per_minute)
+    )
+    logger.info(
+        "Adaptive scheduling: %d targets, %.0f requests/min, intervals %.0f-%.0fs.",
+        len(jobs),
+        scheduler.config.requests_per_minute,
+        scheduler.config.min_interval,
+        scheduler.config.max_interval,
+    )
+    return scheduler
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("dexscreener.extractors.address_lookup")
+
+# DexScreener accepts at most this many comma-separated addresses per call.
+MAX_ADDRESSES_PER_REQUEST = 30
+
+LOOKUP_PAIRS = "pairs"
+LOOKUP_TOKENS = "tokens"
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize an address for matching and de-duplication.
+
+    EVM (0x...) addresses are case-insensitive and come back checksummed, so
+    they are lowercased; base58 addresses (e.g. Solana) are case-sensitive
+    and kept as-is.
+    """
+    address = address.strip()
+    return address.lower() if address[:2].lower() == "0x" else address
+
+@dataclass(frozen=True)
+class LookupBatch:
+    """One multi-address request: up to MAX_ADDRESSES_PER_REQUEST addresses."""
+
+    kind: str
+    chain_id: Optional[str]
+    addresses: Tuple[str, ...]
+
+    @property
+    def path(self) -> str:
+        joined = ",".join(self.addresses)
+        if self.kind == LOOKUP_PAIRS:
+            return f"pairs/{self.chain_id}/{joined}"
+        return f"tokens/{joined}"
+
+def plan_lookup_batches(
+    requests: Iterable[Tuple[str, Optional[str], Sequence[str]]],
+    batch_size: int = MAX_ADDRESSES_PER_REQUEST,
+) -> List[LookupBatch]:
+    """
+    Merge (kind, chain_id, addresses) requests from many targets into the
+    smallest set of batches.
+
+    Addresses requested by several targets are fetched once. Pair lookups are
+    grouped per chain because the endpoint is chain-scoped; token lookups
+    are chain-agnostic and filtered per target afterwards.
+    """
+    grouped: Dict[Tuple[str, Optional[str]], Dict[str, str]] = {}
+    for kind, chain_id, addresses in requests:
+        group_key = (kind, chain_id if kind == LOOKUP_PAIRS else None)
+        seen = grouped.setdefault(group_key, {})
+        for address in addresses:
+            if address and address.strip():
+                seen.setdefault(normalize_address(address), address.strip())
+
+    batches: List[LookupBatch] = []
+    for (kind, chain_id), unique in grouped.items():
+        addresses = list(unique.values())
+        for start in range(0, len(addresses), batch_size):
+            batches.append(
+                LookupBatch(kind, chain_id, tuple(addresses[start : start + batch_size]))
+            )
+
+    logger.debug("Planned %d lookup batches.", len(batches))
+    return batches
+
+class LookupResults:
+    """
+    Pairs returned by lookup batches, indexed so each target can pick out
+    the pairs for its own addresses.
+    """
+
+    def __init__(self) -> None:
+        self._by_pair: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+        self._by_token: Dict[str, List[Dict[str, Any]]] = {}
+        self._failed: Dict[Tuple[str, Optional[str], str], BaseException] = {}
+
+    def mark_failed(self, batch: LookupBatch, error: BaseException) -> None:
+        for address in batch.addresses:
+            self._failed[(batch.kind, batch.chain_id, normalize_address(address))] = error
+
+    def failure_for(
+        self, kind: str, chain_id: Optional[str], addresses: Sequence[str]
+    ) -> Optional[BaseException]:
+        """The error of any failed batch covering one of `addresses`, if any."""
+        scope = chain_id if kind == LOOKUP_PAIRS else None
+        for address in addresses:
+            error = self._failed.get((kind, scope, normalize_address(address)))
+            if error is not None:
+                return error
+        return None
+
+    def add(self, batch: LookupBatch, pairs: Iterable[Dict[str, Any]]) -> None:
+        for pair in pairs:
+            if batch.kind == LOOKUP_PAIRS:
+                pair_address = pair.get("pairAddress")
+                if pair_address:
+                    key = (pair.get("chainId") or batch.chain_id, normalize_address(pair_address))
+                    self._by_pair[key] = pair
+                continue
+
+            for side in ("baseToken", "quoteToken"):
+                token_address = (pair.get(side) or {}).get("address")
+                if token_address:
+                    self._by_token.setdefault(normalize_address(token_address), []).append(pair)
+
+    def pairs_for(
+        self, kind: str, chain_id: Optional[str], addresses: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        """Pairs for one target, in the order its addresses were listed."""
+        found: List[Dict[str, Any]] = []
+        seen: set = set()
+        for address in addresses:
+            normalized = normalize_address(address)
+            if kind == LOOKUP_PAIRS:
+                pair = self._by_pair.get((chain_id, normalized))
+                candidates = [pair] if pair is not None else []
+            else:
+                candidates = self._by_token.get(normalized, [])
+
+            for pair in candidates:
+                if chain_id and pair.get("chainId") and pair.get("chainId") != chain_id:
+                    continue
+                identity = (pair.get("chainId"), pair.get("pairAddress"))
+                if identity in seen:
+                    continue
+                seen.add(identity)
+                found.append(pair)
+        return found
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from extractors.token_index import TokenKey, token_key
+from extractors.token_utils import derive_chain_id
+from models.token_batch import COLUMN_TYPES
+from models.token_model import Token
+
+logger = logging.getLogger("dexscreener.extractors.alert_rules")
+
+# Token fields rules can compare numerically.
+NUMERIC_FIELDS: Tuple[str, ...] = tuple(
+    name for name, kind in COLUMN_TYPES.items() if kind in (int, float)
+)
+
+# Rule keys that match string attributes of a token.
+_MEMBERSHIP_FIELDS: Dict[str, Callable[[Token], Optional[str]]] = {
+    "chainId": lambda token: derive_chain_id(token.pairDetailUrl),
+    "launchpadPlatform": lambda token: token.launchpadPlatform,
+}
+
+TokenPredicate = Callable[[Token], bool]
+
+class AlertRuleError(ValueError):
+    """Raised when an alert rule in the settings cannot be compiled."""
+
+@dataclass
+class Alert:
+    """One rule match for one pool."""
+
+    rule: str
+    timestamp: float
+    chain_id: str
+    token: Token
+    values: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        details = ", ".join(f"{name}={value}" for name, value in self.values.items())
+        return (
+            f"[{self.rule}] {self.token.tokenSymbol or '?'} on {self.chain_id or '?'} "
+            f"({self.token.pairDetailUrl or self.token.lowerPoolAddress}): {details}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rule": self.rule,
+            "timestamp": datetime.fromtimestamp(self.timestamp, tz=timezone.utc).isoformat(),
+            "chainId": self.chain_id,
+            "lowerPoolAddress": self.token.lowerPoolAddress,
+            "values": self.values,
+            "text": self.text,
+            "token": self.token.to_dict(),
+        }
+
+class AlertSink(Protocol):
+    def emit(self, alert: Alert) -> None: ...
+
+    def close(self) -> None: ...
+
+class RollingExtreme:
+    """
+    Maximum (or minimum) of one field over a sliding time window.
+
+    A monotonic deque keeps only the samples that can still become the
+    extreme, so each update is amortized O(1) no matter how many samples
+    fall inside the window.
+    """
+
+    __slots__ = ("window", "is_max", "_samples")
+
+    def __init__(self, window: float, is_max: bool) -> None:
+        self.window = window
+        self.is_max = is_max
+        self._samples: Deque[Tuple[float, float]] = deque()
+
+    def push(self, ts: float, value: float) -> Optional[float]:
+        """Add a sample; returns the extreme over the window *before* it."""
+        samples = self._samples
+        while samples and samples[0][0] < ts - self.window:
+            samples.popleft()
+        reference = samples[0][1] if samples else None
+        if self.is_max:
+            while samples and samples[-1][1] <= value:
+                samples.pop()
+        else:
+            while samples and samples[-1][1] >= value:
+                samples.pop()
+        samples.append((ts, value))
+        return reference
+
+@dataclass
+class WindowCondition:
+    """`drop<Field>` / `rise<Field>`: relative move against the window's extreme."""
+
+    name: str
+    percent: float
+    window: float
+    is_drop: bool
+
+    @property
+    def state_key(self) -> Tuple[str, float, bool]:
+        return (self.name, self.window, self.is_drop)
+
+    def matches(self, value: float, reference: Optional[float]) -> bool:
+        if reference is None or reference <= 0:
+            return False
+        change = (value - reference) / reference * 100.0
+        return change <= -self.percent if self.is_drop else change >= self.percent
+
+@dataclass
+class AlertRule:
+    name: str
+    predicates: List[TokenPredicate] = field(default_factory=list)
+    windows: List[WindowCondition] = field(default_factory=list)
+    fields: Tuple[str, ...] = ()
+    cooldown: float = 0.0
+
+def _range_predicate(name: str, bound: float, is_min: bool) -> TokenPredicate:
+    def predicate(token: Token) -> bool:
+        value = getattr(token, name)
+        if value is None:
+            return False
+        return value >= bound if is_min else value <= bound
+
+    return predicate
+
+def _membership_predicate(name: str, allowed: Iterable[str]) -> TokenPredicate:
+    getter = _MEMBERSHIP_FIELDS[name]
+    allowed_set = frozenset(value.lower() for value in allowed)
+
+    def predicate(token: Token) -> bool:
+        value = getter(token)
+        return value is not None and str(value).lower() in allowed_set
+
+    return predicate
+
+def _field_name(key: str, prefix: str) -> Optional[str]:
+    if not key.startswith(prefix):
+        return None
+    rest = key[len(prefix) :]
+    name = rest[:1].lower() + rest[1:]
+    return name if name in NUMERIC_FIELDS else None
+
+def _bound_field(key: str) -> Optional[str]:
+    return _field_name(key, "min") or _field_name(key, "max")
+
+def compile_token_condition(key: str, value: Any) -> TokenPredicate:
+    """
+    Compile one static condition on a Token: `chainId` / `launchpadPlatform`
+    (a value or list of values) or `min`/`max` plus a numeric field name.
+    """
+    if key in _MEMBERSHIP_FIELDS:
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise AlertRuleError(f"'{key}' needs a string or a list of strings, got {value!r}.")
+        return _membership_predicate(key, value)
+    name = _bound_field(key)
+    if name is None:
+        raise AlertRuleError(
+            f"Unknown condition '{key}'. Use chainId/launchpadPlatform, or min/max followed "
+            f"by one of: {', '.join(n[0].upper() + n[1:] for n in NUMERIC_FIELDS)}."
+        )
+    try:
+        bound = float(value)
+    except (TypeError, ValueError) as exc:
+        raise AlertRuleError(f"'{key}' needs a numeric value, got {value!r}.") from exc
+    return _range_predicate(name, bound, key.startswith("min"))
+
+def _window_condition(rule: str, key: str, name: str, spec: Any) -> WindowCondition:
+    if not isinstance(spec, dict):
+        raise AlertRuleError(
+            f"Rule '{rule}': '{key}' needs an object like "
+            '{"percent": 50, "withinMinutes": 5}.'
+        )
+    try:
+        percent = float(spec["percent"])
+        window = float(spec.get("withinMinutes", 5)) * 60.0
+    except (KeyError, TypeError, ValueError) as exc:
+        raise AlertRuleError(
+            f"Rule '{rule}': '{key}' needs a numeric 'percent' and 'withinMinutes'."
+        ) from exc
+    if percent <= 0 or window <= 0:
+        raise AlertRuleError(f"Rule '{rule}': '{key}' percent and window must be positive.")
+    return WindowCondition(name, percent, window, is_drop=key.startswith("drop"))
+
+def compile_rule(spec: Dict[str, Any], index: int = 0) -> AlertRule:
+    """
+    Compile one rule from the `alerts.rules` settings list.
+
+        {
+          "name": "liquidity-drain",
+          "when": {"dropLiquidityUsd": {"percent": 50, "withinMinutes": 5},
+                   "minLiquidityUsd": 1000, "chainId": ["solana"]},
+          "cooldownMinutes": 30
+        }
+
+    `when` takes `min`/`max` plus a numeric Token field name, `drop`/`rise`
+    plus a field name for moves relative to the window's high/low, and
+    `chainId` / `launchpadPlatform` allow-lists. All conditions must hold.
+    """
+    if not isinstance(spec, dict):
+        raise AlertRuleError(f"Alert rule #{index + 1} must be an object.")
+    name = str(spec.get("name") or f"rule-{index + 1}")
+    when = spec.get("when")
+    if not isinstance(when, dict) or not when:
+        raise AlertRuleError(f"Rule '{name}' needs a non-empty 'when' object.")
+
+    try:
+        cooldown = float(spec.get("cooldownMinutes", 15)) * 60.0
+    except (TypeError, ValueError) as exc:
+        raise AlertRuleError(f"Rule '{name}': 'cooldownMinutes' must be a number.") from exc
+    rule = AlertRule(name=name, cooldown=cooldown)
+    fields: List[str] = []
+    for key, value in when.items():
+        if key in _MEMBERSHIP_FIELDS or _bound_field(key) is not None:
+            try:
+                rule.predicates.append(compile_token_condition(key, value))
+            except AlertRuleError as exc:
+                raise AlertRuleError(f"Rule '{name}': {exc}") from exc
+            if key not in _MEMBERSHIP_FIELDS:
+                fields.append(_bound_field(key))
+            continue
+        window_name = _field_name(key, "drop") or _field_name(key, "rise")
+        if window_name is not None:
+            rule.windows.append(_window_condition(name, key, window_name, value))
+            fields.append(window_name)
+            continue
+        raise AlertRuleError(
+            f"Rule '{name}': unknown condition '{key}'. Use chainId/launchpadPlatform, or "
+            f"min/max/drop/rise followed by one of: "
+            f"{', '.join(n[0].upper() + n[1:] for n in NUMERIC_FIELDS)}."
+        )
+    rule.fields = tuple(dict.fromkeys(fields))
+    return rule
+
+def compile_rules(specs: Iterable[Dict[str, Any]]) -> List[AlertRule]:
+    rules = [compile_rule(spec, index) for index, spec in enumerate(specs or [])]
+    names = [rule.name for rule in rules]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise AlertRuleError(f"Duplicate alert rule names: {', '.join(sorted(duplicates))}.")
+    return rules
+
+@dataclass
+class PoolState:
+    """Rolling per-pool state: one window tracker per distinct windowed condition."""
+
+    last_seen: float = 0.0
+    windows: Dict[Tuple[str, float, bool], RollingExtreme] = field(default_factory=dict)
+
+class AlertEngine:
+    """
+    Evaluates compiled rules against each Token as it arrives.
+
+    Static conditions are plain predicates. Windowed conditions read the
+    pool's RollingExtreme trackers, which are updated once per token
+    whether or not any rule matches. The cost per token is therefore fixed
+    by the rule set, not by how long a pool has been tracked. A rule fires
+    at most once per pool per `cooldownMinutes`. Pools not seen for longer
+    than the widest window are dropped by `prune()`.
+    """
+
+    def __init__(self, rules: List[AlertRule], sinks: List[AlertSink]) -> None:
+        self.rules = rules
+        self.sinks = sinks
+        self.fired = 0
+        self._pools: Dict[TokenKey, PoolState] = {}
+        self._last_fired: Dict[Tuple[str, TokenKey], float] = {}
+        # Each distinct (field, window, direction) is tracked once per pool,
+        # however many rules share it.
+        self._trackers: Dict[Tuple[str, float, bool], WindowCondition] = {
+            condition.state_key: condition for rule in rules for condition in rule.windows
+        }
+        self._max_window = max((c.window for c in self._trackers.values()), default=0.0)
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def _update_windows(
+        self, key: TokenKey, token: Token, now: float
+    ) -> Dict[Tuple[str, float, bool], Optional[float]]:
+        references: Dict[Tuple[str, float, bool], Optional[float]] = {}
+        if not self._trackers:
+            return references
+        state = self._pools.get(key)
+        if state is None:
+            state = self._pools[key] = PoolState()
+        state.last_seen = now
+        for state_key, condition in self._trackers.items():
+            value = getattr(token, condition.name)
+            if value is None:
+                references[state_key] = None
+                continue
+            tracker = state.windows.get(state_key)
+            if tracker is None:
+                # A drop is measured from the window's high, a rise from its low.
+                tracker = state.windows[state_key] = RollingExtreme(
+                    condition.window, is_max=condition.is_drop
+                )
+            references[state_key] = tracker.push(now, float(value))
+        return references
+
+    def evaluate(self, token: Token, now: Optional[float] = None) -> List[Alert]:
+        """Update the pool's state with `token` and return (and emit) new alerts."""
+        key = token_key(token)
+        if key is None:
+            return []
+        now = time.time() if now is None else now
+        references = self._update_windows(key, token, now)
+
+        alerts: List[Alert] = []
+        for rule in self.rules:
+            if not all(predicate(token) for predicate in rule.predicates):
+                continue
+            if not all(
+                condition.matches(
+                    getattr(token, condition.name), references.get(condition.state_key)
+                )
+                for condition in rule.windows
+            ):
+                continue
+            fired_key = (rule.name, key)
+            last = self._last_fired.get(fired_key)
+            if last is not None and now - last < rule.cooldown:
+                continue
+            self._last_fired[fired_key] = now
+            values = {name: getattr(token, name) for name in rule.fields}
+            for condition in rule.windows:
+                values[f"{condition.name}WindowRef"] = references.get(condition.state_key)
+            alerts.append(Alert(rule.name, now, key[0], token, values))
+
+        for alert in alerts:
+            self._emit(alert)
+        return alerts
+
+    def _emit(self, alert: Alert) -> None:
+        self.fired += 1
+        for sink in self.sinks:
+            try:
+                sink.emit(alert)
+            except Exception as exc:
+                logger.error("Alert sink %s failed: %s", type(sink).__name__, exc)
+
+    def evaluate_many(self, tokens: Iterable[Token], now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return sum(len(self.evaluate(token, now)) for token in tokens)
+
+    def observe_results(self, results: Iterable[Any], now: Optional[float] = None) -> Iterator[Any]:
+        """Pass FetchResults through unchanged while evaluating their tokens."""
+        now = time.time() if now is None else now
+        for result in results:
+            if result.ok:
+                self.evaluate_many(result.tokens, now)
+            yield result
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop state of pools not seen within the widest window; returns how many."""
+        now = time.time() if now is None else now
+        horizon = now - max(self._max_window, max((r.cooldown for r in self.rules), default=0.0))
+        stale = [key for key, state in self._pools.items() if state.last_seen < horizon]
+        for key in stale:
+            del self._pools[key]
+        expired = [k for k, fired_at in self._last_fired.items() if fired_at < horizon]
+        for k in expired:
+            del self._last_fired[k]
+        return len(stale)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
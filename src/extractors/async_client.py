@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from extractors.address_lookup import LookupResults, plan_lookup_batches
+from extractors.dexscreener_parser import DexScreenerClient, log_coverage
+from extractors.pair_filters import PairPipeline
+from extractors.query_planner import CoverageReport, ExpansionConfig
+from models.token_model import Token
+
+logger = logging.getLogger("dexscreener.extractors.async_client")
+
+JOB_SEARCH = "search"
+
+@dataclass
+class FetchJob:
+    """
+    A single scrape target resolved from the input file.
+
+    Search jobs run `query` against `/search`. Lookup jobs (`kind` "pairs" or
+    "tokens") refresh a known list of `addresses`; their `query` is only a
+    label for logs.
+    """
+
+    query: str
+    max_pages: int = 1
+    page_size: int = 50
+    kind: str = JOB_SEARCH
+    chain_id: Optional[str] = None
+    addresses: Tuple[str, ...] = ()
+    pipeline: Optional[PairPipeline] = None
+    expansion: ExpansionConfig = field(default_factory=ExpansionConfig)
+    # The input target this job was built from, e.g. for rebuilding the job
+    # in a worker process.
+    spec: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def is_lookup(self) -> bool:
+        return self.kind != JOB_SEARCH
+
+    def lookup_request(self) -> Tuple[str, Optional[str], List[str]]:
+        return (self.kind, self.chain_id, list(self.addresses))
+
+def tokens_from_lookup(
+    client: DexScreenerClient, lookups: LookupResults, job: FetchJob
+) -> List[Token]:
+    """Pick a lookup job's pairs out of the shared results and build Tokens."""
+    error = lookups.failure_for(job.kind, job.chain_id, job.addresses)
+    if error is not None:
+        raise error
+    pairs = lookups.pairs_for(job.kind, job.chain_id, job.addresses)
+    return client.tokens_from_pairs(job.query, pairs, pipeline=job.pipeline)
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of a FetchJob. Exactly one of `tokens` / `error` is meaningful,
+    so a failing target never affects the others. Search jobs also carry the
+    coverage report of their query expansion.
+    """
+
+    job: FetchJob
+    tokens: List[Token] = field(default_factory=list)
+    error: Optional[BaseException] = None
+    coverage: Optional[CoverageReport] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def build_pooled_session(pool_size: int) -> requests.Session:
+    """
+    Create a requests.Session whose connection pool is large enough to keep
+    one keep-alive connection per concurrent worker.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class AsyncDexScreenerClient:
+    """
+    Asyncio front-end over DexScreenerClient.
+
+    Requests are executed on a dedicated thread pool sharing a single pooled
+    `requests.Session`, so every blocking call made by the wrapped client
+    (and anything layered on top of `_request`) keeps working unchanged while
+    up to `concurrency` targets are in flight at once.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://api.dexscreener.com/latest/dex",
+        timeout: int = 10,
+        concurrency: int = 8,
+        client: Optional[DexScreenerClient] = None,
+    ) -> None:
+        self.concurrency = max(1, int(concurrency))
+        # Only close the session on exit if this wrapper created it.
+        self._owns_client = client is None
+        self.client = client or DexScreenerClient(
+            base_url=base_url,
+            timeout=timeout,
+            session=build_pooled_session(self.concurrency),
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix="dexscreener-fetch",
+            )
+        return self._executor
+
+    async def _run_blocking(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), lambda: func(*args, **kwargs))
+
+    async def search_pairs(self, query: str) -> List[Dict[str, Any]]:
+        return await self._run_blocking(self.client.search_pairs, query)
+
+    async def fetch_tokens_for_query(
+        self,
+        query: str,
+        max_pages: int = 1,
+        page_size: int = 50,
+        pipeline: Optional[PairPipeline] = None,
+        expansion: Optional[ExpansionConfig] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> List[Token]:
+        tokens, _ = await self.fetch_query(
+            query, max_pages, page_size, pipeline, expansion, semaphore
+        )
+        return tokens
+
+    async def fetch_query(
+        self,
+        query: str,
+        max_pages: int = 1,
+        page_size: int = 50,
+        pipeline: Optional[PairPipeline] = None,
+        expansion: Optional[ExpansionConfig] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Tuple[List[Token], CoverageReport]:
+        """
+        Async counterpart of DexScreenerClient.fetch_query.
+
+        Sub-queries are planned in waves of up to `concurrency` pages that
+        run in parallel, each holding `semaphore` only for its own request,
+        so a wide fan-out shares the request budget fairly with other
+        targets.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+        planner = (expansion or ExpansionConfig()).planner(query, max_pages)
+
+        async def fetch_page(sub_query: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.search_pairs(sub_query)
+
+        while True:
+            wave = planner.next_wave(self.concurrency)
+            if not wave:
+                break
+            pages = await asyncio.gather(
+                *(fetch_page(sub_query) for sub_query in wave), return_exceptions=True
+            )
+            for sub_query, page in zip(wave, pages):
+                if isinstance(page, Exception):
+                    planner.record_error(sub_query, page)
+                elif isinstance(page, BaseException):
+                    raise page
+                else:
+                    planner.record(sub_query, page)
+        log_coverage(planner.coverage, max_pages)
+
+        tokens = await self._run_blocking(
+            self.client.tokens_from_pairs,
+            query,
+            planner.pairs(),
+            max_items=max(1, max_pages) * page_size,
+            pipeline=pipeline,
+        )
+        return tokens, planner.coverage
+
+    async def resolve_lookups(
+        self, jobs: Sequence[FetchJob], semaphore: asyncio.Semaphore
+    ) -> LookupResults:
+        """
+        Run every lookup batch needed by `jobs` in parallel.
+
+        Addresses shared by several targets are merged into one request, and
+        large address lists are split into API-sized batches.
+        """
+        results = LookupResults()
+        batches = plan_lookup_batches(job.lookup_request() for job in jobs if job.is_lookup)
+
+        async def run_batch(batch: Any) -> None:
+            async with semaphore:
+                try:
+                    pairs = await self._run_blocking(self.client.lookup_batch, batch)
+                except Exception as exc:
+                    logger.error("Lookup of %d addresses failed: %s", len(batch.addresses), exc)
+                    results.mark_failed(batch, exc)
+                    return
+                results.add(batch, pairs)
+
+        if batches:
+            logger.info("Resolving address lookups in %d batched requests.", len(batches))
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+        return results
+
+    async def _fetch_job(
+        self,
+        job: FetchJob,
+        semaphore: asyncio.Semaphore,
+        lookups: "Optional[asyncio.Future[LookupResults]]" = None,
+    ) -> FetchResult:
+        if job.is_lookup and lookups is not None:
+            try:
+                tokens = tokens_from_lookup(self.client, await lookups, job)
+            except Exception as exc:
+                logger.error("Failed to look up addresses for '%s': %s", job.query, exc)
+                return FetchResult(job=job, error=exc)
+            return FetchResult(job=job, tokens=tokens)
+
+        logger.info("Fetching tokens for query '%s' (max_pages=%s)...", job.query, job.max_pages)
+        try:
+            tokens, coverage = await self.fetch_query(
+                query=job.query,
+                max_pages=job.max_pages,
+                page_size=job.page_size,
+                pipeline=job.pipeline,
+                expansion=job.expansion,
+                semaphore=semaphore,
+            )
+        except Exception as exc:
+            logger.error("Failed to fetch tokens for query '%s': %s", job.query, exc)
+            return FetchResult(job=job, error=exc)
+        return FetchResult(job=job, tokens=tokens, coverage=coverage)
+
+    async def fetch_all(self, jobs: Sequence[FetchJob]) -> List[FetchResult]:
+        """
+        Fetch every job with at most `concurrency` requests in flight.
+
+        Results are returned in the same order as `jobs`, so the output is
+        identical to running the jobs one after another.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        lookups = asyncio.ensure_future(self.resolve_lookups(jobs, semaphore))
+        return list(
+            await asyncio.gather(*(self._fetch_job(job, semaphore, lookups) for job in jobs))
+        )
+
+    async def iter_results(self, jobs: Iterable[FetchJob]) -> AsyncIterator[FetchResult]:
+        """
+        Yield results in job order as soon as each one (and every job before
+        it) has completed.
+
+        Only a window of `2 * concurrency` jobs is scheduled at a time, so a
+        slow early target never causes the whole input to be buffered.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        window = self.concurrency * 2
+        jobs = list(jobs)
+        job_iter = iter(jobs)
+        pending: Deque["asyncio.Task[FetchResult]"] = deque()
+
+        # Lookup batches are planned across all targets up front so duplicate
+        # addresses are coalesced, and run alongside the search window.
+        lookups = None
+        if any(job.is_lookup for job in jobs):
+            lookups = asyncio.ensure_future(self.resolve_lookups(jobs, semaphore))
+
+        def schedule_next() -> None:
+            job = next(job_iter, None)
+            if job is not None:
+                pending.append(asyncio.ensure_future(self._fetch_job(job, semaphore, lookups)))
+
+        for _ in range(window):
+            schedule_next()
+
+        try:
+            while pending:
+                result = await pending.popleft()
+                schedule_next()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+            if lookups is not None and not lookups.done():
+                lookups.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owns_client:
+            self.client.session.close()
+
+    async def __aenter__(self) -> "AsyncDexScreenerClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def iter_fetch_results(
+    jobs: Iterable[FetchJob],
+    client: DexScreenerClient,
+    concurrency: int = 8,
+) -> Iterator[FetchResult]:
+    """
+    Synchronous generator over `AsyncDexScreenerClient.iter_results`.
+
+    The event loop is driven one result at a time, so callers can write each
+    target's tokens out before the next one is handed over.
+    """
+    loop = asyncio.new_event_loop()
+    async_client = AsyncDexScreenerClient(concurrency=concurrency, client=client)
+    results = async_client.iter_results(jobs)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(results.aclose())
+        async_client.close()
+        loop.close()
+
+def fetch_all_sync(
+    jobs: Sequence[FetchJob],
+    client: Optional[DexScreenerClient] = None,
+    base_url: str = "https://api.dexscreener.com/latest/dex",
+    timeout: int = 10,
+    concurrency: int = 8,
+) -> List[FetchResult]:
+    """Convenience wrapper for callers that are not running an event loop."""
+
+    async def runner() -> List[FetchResult]:
+        async with AsyncDexScreenerClient(
+            base_url=base_url, timeout=timeout, concurrency=concurrency, client=client
+        ) as async_client:
+            return await async_client.fetch_all(jobs)
+
+    return asyncio.run(runner())
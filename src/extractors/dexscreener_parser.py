@@ -1,22 +1,80 @@
-thonimport logging
-from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
-from models.token_model import Token
+from extractors.rate_limiter import (
+    RetryPolicy,
+    TokenBucket,
+    build_rate_limiter,
+    build_retry_policy,
+    parse_retry_after,
+)
+from extractors.address_lookup import (
+    LOOKUP_PAIRS,
+    LookupBatch,
+    LookupResults,
+    plan_lookup_batches,
+)
+from extractors.json_codec import JsonCodec, codec_from_settings, get_codec
+from extractors.pair_filters import PairPipeline
+from extractors.query_planner import CoverageReport, ExpansionConfig, QueryPlanner
+from extractors.response_cache import CachedResponse, ResponseCache
+from extractors.run_metrics import STAGE_DECODE, STAGE_PARSE, STAGE_REQUEST, StageTimers
+from models.token_model import RawRetention, Token
 
 logger = logging.getLogger("dexscreener.extractors.dexscreener_parser")
 
 class DexScreenerError(RuntimeError):
     """Generic error raised when interacting with the DexScreener API."""
 
+@dataclass
+class ClientMetrics:
+    """
+    Counters describing how much work (and waiting) a client has done, plus
+    per-stage timers for requests, JSON decoding and Token parsing.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    throttled: int = 0
+    throttle_wait_seconds: float = 0.0
+    retry_wait_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_revalidated: int = 0
+    response_bytes: int = 0
+    parse_failures: int = 0
+    tokens_built: int = 0
+    launchpads_enriched: int = 0
+
+    stages: StageTimers = field(default_factory=StageTimers, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                f.name: round(getattr(self, f.name), 3)
+                for f in fields(self)
+                if not f.name.startswith("_") and f.name != "stages"
+            }
+
 class DexScreenerClient:
     """
     Lightweight client for the DexScreener public API.
 
     This client focuses on the `/latest/dex/search` endpoint, which allows
     queries in the form of `chain/dex` (e.g. `solana/moonshot`) or general
-    token / pair queries.
+    token / pair queries, plus the multi-address `/pairs/{chain}/{addresses}`
+    and `/tokens/{addresses}` lookups for refreshing known pairs.
     """
 
     def __init__(
@@ -24,22 +82,158 @@ class DexScreenerClient:
         base_url: str = "https://api.dexscreener.com/latest/dex",
         timeout: int = 10,
         session: Optional[requests.Session] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        raw_retention: Optional[RawRetention] = None,
+        codec: Optional[JsonCodec] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.session = session or requests.Session()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy(max_retries=0)
+        self.cache = cache
+        # Tokens built by the client feed the exporters, which never read
+        # `raw`, so by default none of the payload is kept.
+        self.raw_retention = raw_retention or RawRetention()
+        # Responses are decoded from the raw body bytes by the fastest
+        # installed JSON backend rather than `response.json()`.
+        self.codec = codec or get_codec()
+        self.metrics = ClientMetrics()
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Dict[str, Any],
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> "DexScreenerClient":
+        """
+        Build a client from the `dexscreener` block of the settings file,
+        including its `rateLimit` and `retry` sub-sections. The JSON backend
+        comes from the top-level `json` block.
+
+        The response cache depends on CLI overrides, so it is built by the
+        caller and passed in as-is.
+        """
+        config = settings.get("dexscreener", {})
+        return cls(
+            base_url=config.get("baseUrl", "https://api.dexscreener.com/latest/dex"),
+            timeout=config.get("timeoutSeconds", 10),
+            session=session,
+            rate_limiter=build_rate_limiter(config.get("rateLimit", {})),
+            retry_policy=build_retry_policy(config.get("retry", {})),
+            cache=cache,
+            raw_retention=RawRetention.from_config(config.get("rawRetention", {})),
+            codec=codec_from_settings(settings),
+        )
+
+    def _throttle(self) -> None:
+        if self.rate_limiter is None:
+            return
+        waited = self.rate_limiter.acquire()
+        if waited > 0:
+            self.metrics.add("throttled")
+            self.metrics.add("throttle_wait_seconds", waited)
+
+    def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """
+        Perform a GET with rate limiting and retries.
+
+        Network errors and retryable statuses (429/5xx) are retried with
+        jittered exponential backoff; a Retry-After header takes precedence
+        and also pauses the shared rate limiter.
+        """
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            self._throttle()
+            self.metrics.add("requests")
+
+            started = time.perf_counter()
+            try:
+                response = self.session.get(
+                    url, params=params, headers=headers, timeout=self.timeout
+                )
+            except requests.RequestException as exc:
+                self.metrics.stages.observe(STAGE_REQUEST, time.perf_counter() - started)
+                if attempt >= policy.max_retries:
+                    self.metrics.add("failures")
+                    logger.error("HTTP error while contacting DexScreener: %s", exc)
+                    raise DexScreenerError("Network error while contacting DexScreener") from exc
+                delay = policy.backoff(attempt)
+                logger.warning(
+                    "HTTP error while contacting DexScreener (attempt %d/%d), retrying in %.2fs: %s",
+                    attempt + 1,
+                    policy.max_retries + 1,
+                    delay,
+                    exc,
+                )
+            else:
+                self.metrics.stages.observe(STAGE_REQUEST, time.perf_counter() - started)
+                self.metrics.add("response_bytes", len(response.content))
+                if response.ok or not policy.should_retry_status(response.status_code):
+                    return response
+                if attempt >= policy.max_retries:
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = retry_after if retry_after is not None else policy.backoff(attempt)
+                logger.warning(
+                    "DexScreener returned HTTP %s (attempt %d/%d), retrying in %.2fs.",
+                    response.status_code,
+                    attempt + 1,
+                    policy.max_retries + 1,
+                    delay,
+                )
+                if retry_after is not None and self.rate_limiter is not None:
+                    # The shared limiter now holds back this and every other
+                    # caller; the wait is accounted for by the next _throttle().
+                    self.rate_limiter.pause(retry_after)
+                    delay = 0.0
+
+            attempt += 1
+            self.metrics.add("retries")
+            if delay > 0:
+                self.metrics.add("retry_wait_seconds", delay)
+                time.sleep(delay)
 
     def _request(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         url = f"{self.base_url}/{path.lstrip('/')}"
         logger.debug("Requesting %s with params=%s", url, params)
 
-        try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
-        except requests.RequestException as exc:
-            logger.error("HTTP error while contacting DexScreener: %s", exc)
-            raise DexScreenerError("Network error while contacting DexScreener") from exc
+        cache_key: Optional[str] = None
+        cached: Optional[CachedResponse] = None
+        headers: Optional[Dict[str, str]] = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(path, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None and cached.is_fresh(self.cache.ttl_for(path)):
+                self.metrics.add("cache_hits")
+                logger.debug("Cache hit for %s", cache_key)
+                with self.metrics.stages.time(STAGE_DECODE):
+                    return self.codec.loads(cached.body)
+            self.metrics.add("cache_misses")
+            if cached is not None:
+                headers = cached.validators() or None
+
+        response = self._send(url, params, headers=headers)
+
+        if response.status_code == 304 and cached is not None and cache_key is not None:
+            self.metrics.add("cache_revalidated")
+            logger.debug("Cached response for %s revalidated (HTTP 304).", cache_key)
+            self.cache.touch(cache_key)
+            with self.metrics.stages.time(STAGE_DECODE):
+                return self.codec.loads(cached.body)
 
         if not response.ok:
+            self.metrics.add("failures")
             logger.error(
                 "DexScreener returned non-OK status: %s %s",
                 response.status_code,
@@ -50,11 +244,23 @@ class DexScreenerClient:
             )
 
         try:
-            data = response.json()
+            with self.metrics.stages.time(STAGE_DECODE):
+                data = self.codec.loads(response.content)
         except ValueError as exc:
             logger.error("Failed to parse JSON from DexScreener: %s", exc)
             raise DexScreenerError("Invalid JSON from DexScreener") from exc
 
+        if self.cache is not None and cache_key is not None:
+            self.cache.set(
+                cache_key,
+                CachedResponse(
+                    body=response.text,
+                    stored_at=time.time(),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                ),
+            )
+
         return data
 
     def search_pairs(self, query: str) -> List[Dict[str, Any]]:
@@ -72,43 +278,172 @@ class DexScreenerClient:
         logger.debug("DexScreener search returned %d pairs for query '%s'.", len(pairs), query)
         return pairs
 
-    def fetch_tokens_for_query(
+    def lookup_batch(self, batch: LookupBatch) -> List[Dict[str, Any]]:
+        """
+        Fetch the pairs for one multi-address lookup batch.
+
+        The pairs endpoint has historically returned either `pairs` or a
+        single `pair`; the tokens endpoint returns `pairs`.
+        """
+        data = self._request(batch.path)
+        pairs = data.get("pairs") or []
+        if not pairs and data.get("pair"):
+            pairs = [data["pair"]]
+        logger.debug(
+            "DexScreener %s lookup returned %d pairs for %d addresses.",
+            batch.kind,
+            len(pairs),
+            len(batch.addresses),
+        )
+        return pairs
+
+    def lookup_addresses(
+        self, requests: List[Tuple[str, Optional[str], List[str]]]
+    ) -> LookupResults:
+        """
+        Resolve (kind, chain_id, addresses) requests one batch at a time,
+        merging duplicate addresses into a single request.
+        """
+        results = LookupResults()
+        for batch in plan_lookup_batches(requests):
+            try:
+                results.add(batch, self.lookup_batch(batch))
+            except DexScreenerError as exc:
+                logger.error("Lookup of %d addresses failed: %s", len(batch.addresses), exc)
+                results.mark_failed(batch, exc)
+        return results
+
+    def get_pairs_by_address(self, chain_id: str, pair_addresses: List[str]) -> List[Dict[str, Any]]:
+        """Fetch pairs by address on one chain, batching as needed."""
+        results = self.lookup_addresses([(LOOKUP_PAIRS, chain_id, pair_addresses)])
+        error = results.failure_for(LOOKUP_PAIRS, chain_id, pair_addresses)
+        if error is not None:
+            raise error
+        return results.pairs_for(LOOKUP_PAIRS, chain_id, pair_addresses)
+
+    def search_query_space(
         self,
         query: str,
         max_pages: int = 1,
-        page_size: int = 50,
-    ) -> List[Token]:
+        expansion: Optional[ExpansionConfig] = None,
+    ) -> QueryPlanner:
         """
-        Fetch Token models for a given query.
+        Run `query` plus up to `max_pages - 1` narrower sub-queries, one
+        request per page, and return the planner holding the unique pairs
+        and the coverage report.
+        """
+        planner = (expansion or ExpansionConfig()).planner(query, max_pages)
+        while True:
+            wave = planner.next_wave()
+            if not wave:
+                break
+            for sub_query in wave:
+                try:
+                    pairs = self.search_pairs(sub_query)
+                except DexScreenerError as exc:
+                    planner.record_error(sub_query, exc)
+                    continue
+                planner.record(sub_query, pairs)
+        log_coverage(planner.coverage, max_pages)
+        return planner
 
-        DexScreener search is not strictly paginated in the usual sense, but this
-        function exposes `max_pages` and `page_size` to fit the project's
-        abstraction. For now it simply truncates to `max_pages * page_size`.
+    def tokens_from_pairs(
+        self,
+        query: str,
+        pairs: List[Dict[str, Any]],
+        max_items: int = 0,
+        pipeline: Optional[PairPipeline] = None,
+        now: Optional[float] = None,
+    ) -> List[Token]:
         """
-        if max_pages < 1:
-            max_pages = 1
+        Filter/rank a target's pairs, cap them at `max_items` and build
+        Token models.
 
-        pairs = self.search_pairs(query)
-        max_items = max_pages * page_size
-        if max_items and len(pairs) > max_items:
+        An optional `pipeline` runs first, so the cap keeps the best matches
+        rather than arbitrary API order.
+        """
+        now = time.time() if now is None else now
+        rows = None
+        if pipeline is not None:
+            rows = pipeline.select(pairs, now)
             logger.debug(
-                "Truncating pairs from %d to %d (max_pages=%d, page_size=%d).",
-                len(pairs),
-                max_items,
-                max_pages,
-                page_size,
+                "Pipeline kept %d of %d pairs for query '%s'.", len(rows), len(pairs), query
             )
+            pairs = [pair for pair, _ in rows]
+        if max_items and len(pairs) > max_items:
+            logger.debug("Truncating pairs from %d to %d.", len(pairs), max_items)
             pairs = pairs[:max_items]
+            rows = rows[:max_items] if rows is not None else None
 
-        tokens: List[Token] = []
-        for pair in pairs:
-            try:
-                token = Token.from_pair_payload(pair)
-                tokens.append(token)
-            except Exception as exc:
-                logger.debug("Failed to parse pair into Token, skipping. Error: %s", exc, exc_info=True)
+        with self.metrics.stages.time(STAGE_PARSE):
+            if rows is not None:
+                # Reuse the values the pipeline already extracted.
+                tokens = Token.from_pair_rows(rows, now=now, retention=self.raw_retention)
+            else:
+                tokens = Token.from_pair_payloads(pairs, now=now, retention=self.raw_retention)
+        self.metrics.add("tokens_built", len(tokens))
+        failed = len(pairs) - len(tokens)
+        if failed:
+            self.metrics.add("parse_failures", failed)
+            logger.warning(
+                "Skipped %d of %d pairs for query '%s' that could not be parsed "
+                "(run with --log-level DEBUG for details).",
+                failed,
+                len(pairs),
+                query,
+            )
 
         logger.info(
             "Converted %d pairs into Token models for query '%s'.", len(tokens), query
         )
-        return tokens
\ No newline at end of file
+        return tokens
+
+    def fetch_query(
+        self,
+        query: str,
+        max_pages: int = 1,
+        page_size: int = 50,
+        pipeline: Optional[PairPipeline] = None,
+        expansion: Optional[ExpansionConfig] = None,
+    ) -> Tuple[List[Token], CoverageReport]:
+        """Fetch Token models for a query together with its coverage report."""
+        now = time.time()
+        planner = self.search_query_space(query, max_pages=max_pages, expansion=expansion)
+        tokens = self.tokens_from_pairs(
+            query,
+            planner.pairs(),
+            max_items=max(1, max_pages) * page_size,
+            pipeline=pipeline,
+            now=now,
+        )
+        return tokens, planner.coverage
+
+    def fetch_tokens_for_query(
+        self,
+        query: str,
+        max_pages: int = 1,
+        page_size: int = 50,
+        pipeline: Optional[PairPipeline] = None,
+        expansion: Optional[ExpansionConfig] = None,
+    ) -> List[Token]:
+        """
+        Fetch Token models for a given query.
+
+        `/search` has no page parameter and caps its results, so each page
+        beyond the first is a narrower sub-query planned by QueryPlanner
+        (see `search_query_space`). At most `max_pages` requests are made and
+        at most `max_pages * page_size` unique pairs are kept.
+        """
+        tokens, _ = self.fetch_query(
+            query,
+            max_pages=max_pages,
+            page_size=page_size,
+            pipeline=pipeline,
+            expansion=expansion,
+        )
+        return tokens
+
+def log_coverage(coverage: CoverageReport, max_pages: int) -> None:
+    # Single-page targets are the common case; only report real fan-out.
+    level = logging.INFO if max_pages > 1 else logging.DEBUG
+    logger.log(level, "Coverage for query '%s': %s.", coverage.query, coverage.summary())
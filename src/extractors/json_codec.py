@@ -0,0 +1,142 @@
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple, Type, Union
+
+logger = logging.getLogger("dexscreener.extractors.json_codec")
+
+Payload = Union[bytes, bytearray, memoryview, str]
+
+class JsonCodec:
+    """
+    JSON encode/decode backed by the standard library.
+
+    Subclasses swap in a faster parser but keep the same contract: `loads`
+    accepts bytes or text and raises ValueError on malformed input, and
+    `dumps`/`dumps_indented` return text equivalent to
+    `json.dumps(..., ensure_ascii=False)` (the indented form with
+    `indent=2`). Only the stdlib backend is byte-identical to `json`;
+    other backends may spell some floats differently (`1e-05` as
+    `0.00001`), which parses back to the same value.
+    """
+
+    name = "json"
+
+    def loads(self, data: Payload) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def dumps_indented(self, obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+class OrjsonCodec(JsonCodec):
+    """orjson backend: decodes straight from the response bytes."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        self._indent = orjson.OPT_INDENT_2
+
+    def loads(self, data: Payload) -> Any:
+        # orjson.JSONDecodeError subclasses ValueError already.
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        try:
+            return self._orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            # Types orjson refuses (non-str keys, ints beyond 64 bits, ...)
+            # still encode the way they always did.
+            return super().dumps(obj)
+
+    def dumps_indented(self, obj: Any) -> str:
+        try:
+            return self._orjson.dumps(obj, option=self._indent).decode("utf-8")
+        except TypeError:
+            return super().dumps_indented(obj)
+
+class MsgspecCodec(JsonCodec):
+    """msgspec backend; decoding errors are re-raised as ValueError."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._msgspec = msgspec
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: Payload) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    def dumps(self, obj: Any) -> str:
+        try:
+            return self._encoder.encode(obj).decode("utf-8")
+        except (TypeError, OverflowError):
+            return super().dumps(obj)
+
+    def dumps_indented(self, obj: Any) -> str:
+        try:
+            encoded = self._encoder.encode(obj)
+        except (TypeError, OverflowError):
+            return super().dumps_indented(obj)
+        return self._msgspec.json.format(encoded, indent=2).decode("utf-8")
+
+# Preference order for `auto`: fastest first, stdlib always last.
+BACKENDS: Tuple[Type[JsonCodec], ...] = (OrjsonCodec, MsgspecCodec, JsonCodec)
+BACKEND_NAMES = ("auto",) + tuple(backend.name for backend in BACKENDS)
+
+_codecs: Dict[str, JsonCodec] = {}
+
+def _load_backend(backend: Type[JsonCodec]) -> Optional[JsonCodec]:
+    try:
+        return backend()
+    except ImportError:
+        return None
+
+def get_codec(name: str = "auto") -> JsonCodec:
+    """
+    Return the (shared) codec for `name`: `auto`, `orjson`, `msgspec` or
+    `json`. `auto` picks the fastest installed backend; naming a backend
+    that is not installed logs a warning and falls back to the stdlib.
+    """
+    name = (name or "auto").lower()
+    if name == "stdlib":
+        name = JsonCodec.name
+    if name not in BACKEND_NAMES:
+        raise ValueError(
+            f"Unknown JSON backend {name!r}; expected one of: {', '.join(BACKEND_NAMES)}"
+        )
+    codec = _codecs.get(name)
+    if codec is not None:
+        return codec
+
+    candidates = BACKENDS if name == "auto" else tuple(b for b in BACKENDS if b.name == name)
+    for backend in candidates:
+        codec = _load_backend(backend)
+        if codec is not None:
+            break
+    if codec is None:
+        logger.warning(
+            "JSON backend '%s' is not installed (pip install %s); using the standard library.",
+            name,
+            name,
+        )
+        codec = JsonCodec()
+    logger.debug("Using JSON backend '%s' (requested '%s').", codec.name, name)
+    _codecs[name] = codec
+    return codec
+
+def codec_from_settings(settings: Dict[str, Any]) -> JsonCodec:
+    """Codec named by `json.backend` in the settings file (default `auto`)."""
+    return get_codec(settings.get("json", {}).get("backend", "auto"))
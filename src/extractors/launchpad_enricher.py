@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from extractors.address_lookup import (
+    LOOKUP_PAIRS,
+    LookupBatch,
+    normalize_address,
+    plan_lookup_batches,
+)
+from extractors.async_client import FetchResult
+from extractors.dexscreener_parser import DexScreenerClient, DexScreenerError
+from extractors.rate_limiter import build_rate_limiter
+from extractors.token_utils import derive_chain_id, derive_pool_address
+from models.launchpad_model import Launchpad
+from models.token_model import Token
+
+logger = logging.getLogger("dexscreener.extractors.launchpad_enricher")
+
+PoolKey = Tuple[str, str]
+
+# Budget of the enricher's own client when `launchpad.rateLimit` is not set.
+DEFAULT_RATE_LIMIT: Dict[str, Any] = {"requestsPerMinute": 60, "burst": 5}
+
+def launchpad_pool(token: Token) -> Optional[Tuple[str, str]]:
+    """(chain_id, pair address) of a token on a launchpad dexId, else None."""
+    if not token.launchpadPlatform:
+        return None
+    chain_id = derive_chain_id(token.pairDetailUrl)
+    address = derive_pool_address(token.pairDetailUrl)
+    if not chain_id or not address:
+        return None
+    return chain_id, address
+
+class LaunchpadEnricher:
+    """
+    Attaches launchpad metrics to tokens on launchpad dexIds.
+
+    The token model marks such pairs via `launchpadPlatform` while parsing.
+    Their metrics come from the `/pairs/{chain}/{addresses}` endpoint, whose
+    payloads carry the launchpad section, fetched up to 30 pools per request
+    on a small thread pool of its own. `client` should be a client of its
+    own (see `from_config`), so lookups are paced by their own budget and
+    counted in their own metrics rather than slowing down the scrape.
+    Results are cached per pool for `cache_ttl` seconds, so watch cycles and
+    pools shared by several targets cost one lookup; at most `cache_size`
+    pools are kept, the least recently fetched going first.
+
+    The scrape never waits for enrichment: `enrich_results` keeps pulling
+    FetchResults while lookups run in the background, and once the scrape
+    is done waits at most `timeout` seconds for the outstanding ones. Tokens
+    whose lookup failed or timed out are exported without launchpad fields.
+    """
+
+    def __init__(
+        self,
+        client: DexScreenerClient,
+        concurrency: int = 4,
+        timeout: float = 10.0,
+        cache_ttl: float = 300.0,
+        cache_size: int = 10_000,
+    ) -> None:
+        self.client = client
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = max(0.0, float(timeout))
+        self.cache_ttl = float(cache_ttl)
+        self.cache_size = max(1, int(cache_size))
+        self._lock = threading.Lock()
+        # Pool -> (fetched at, parsed launchpad or None if the pair has none).
+        self._cache: Dict[PoolKey, Tuple[float, Optional[Launchpad]]] = {}
+        self._inflight: Dict[PoolKey, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(
+        cls, config: Dict[str, Any], client: DexScreenerClient
+    ) -> Optional["LaunchpadEnricher"]:
+        """
+        Build from the `launchpad` settings block; None when disabled.
+
+        Lookups go through a client of their own that shares `client`'s
+        endpoint, session and retry policy, but is limited by
+        `launchpad.rateLimit` and bypasses the response cache.
+        """
+        if not config.get("enabled", False):
+            return None
+        lookup_client = DexScreenerClient(
+            base_url=client.base_url,
+            timeout=client.timeout,
+            session=client.session,
+            rate_limiter=build_rate_limiter(config.get("rateLimit", DEFAULT_RATE_LIMIT)),
+            retry_policy=client.retry_policy,
+            codec=client.codec,
+        )
+        return cls(
+            lookup_client,
+            concurrency=config.get("concurrency", 4),
+            timeout=config.get("timeoutSeconds", 10),
+            cache_ttl=config.get("cacheTtlSeconds", 300),
+            cache_size=config.get("cacheMaxPools", 10_000),
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="dexscreener-launchpad"
+            )
+        return self._executor
+
+    def _cached(self, key: PoolKey, now: float) -> bool:
+        entry = self._cache.get(key)
+        return entry is not None and now - entry[0] < self.cache_ttl
+
+    def _prune(self, now: float) -> None:
+        """Drop expired pools, then the oldest ones beyond `cache_size`."""
+        cache = self._cache
+        if len(cache) <= self.cache_size:
+            return
+        for key in [key for key, entry in cache.items() if now - entry[0] >= self.cache_ttl]:
+            del cache[key]
+        # Entries are re-inserted when refreshed, so the dict is in fetch order.
+        excess = len(cache) - self.cache_size
+        if excess > 0:
+            for key in list(itertools.islice(cache, excess)):
+                del cache[key]
+
+    def _fetch_batch(self, batch: LookupBatch) -> None:
+        keys = [(batch.chain_id or "", normalize_address(a)) for a in batch.addresses]
+        try:
+            pairs = self.client.lookup_batch(batch)
+        except DexScreenerError as exc:
+            logger.warning("Launchpad lookup of %d pools failed: %s", len(keys), exc)
+            pairs = None
+        finally:
+            with self._lock:
+                for key in keys:
+                    self._inflight.pop(key, None)
+        if pairs is None:
+            return
+
+        found: Dict[PoolKey, Optional[Launchpad]] = {}
+        for pair in pairs:
+            address = pair.get("pairAddress")
+            if address:
+                found[(batch.chain_id or "", normalize_address(str(address)))] = (
+                    Launchpad.from_pair(pair)
+                )
+        now = time.time()
+        with self._lock:
+            # Pools the endpoint did not return are cached as "no launchpad
+            # data" too, so they are not requested again until the TTL ends.
+            for key in keys:
+                self._cache.pop(key, None)
+                self._cache[key] = (now, found.get(key))
+            self._prune(now)
+
+    def submit(self, tokens: Iterable[Token]) -> List[Future]:
+        """Start lookups for the uncached launchpad pools among `tokens`."""
+        now = time.time()
+        wanted: Dict[str, List[str]] = {}
+        requested = set()
+        pending: List[Future] = []
+        with self._lock:
+            for token in tokens:
+                pool = launchpad_pool(token)
+                if pool is None:
+                    continue
+                key = (pool[0], normalize_address(pool[1]))
+                if key in requested or self._cached(key, now):
+                    continue
+                if key in self._inflight:
+                    pending.append(self._inflight[key])
+                    continue
+                requested.add(key)
+                wanted.setdefault(pool[0], []).append(pool[1])
+
+            batches = plan_lookup_batches(
+                (LOOKUP_PAIRS, chain_id, addresses) for chain_id, addresses in wanted.items()
+            )
+            for batch in batches:
+                future = self._get_executor().submit(self._fetch_batch, batch)
+                for address in batch.addresses:
+                    self._inflight[(batch.chain_id or "", normalize_address(address))] = future
+                pending.append(future)
+        return pending
+
+    def attach(self, tokens: Iterable[Token]) -> int:
+        """Copy cached launchpad metrics onto `tokens`; returns how many got some."""
+        attached = 0
+        with self._lock:
+            for token in tokens:
+                pool = launchpad_pool(token)
+                if pool is None:
+                    continue
+                entry = self._cache.get((pool[0], normalize_address(pool[1])))
+                if entry is not None and entry[1] is not None:
+                    token.attach_launchpad(entry[1])
+                    attached += 1
+        if attached:
+            self.client.metrics.add("launchpads_enriched", attached)
+        return attached
+
+    def enrich(self, tokens: List[Token]) -> int:
+        """Fetch (waiting at most `timeout`) and attach launchpad metrics."""
+        wait(self.submit(tokens), timeout=self.timeout)
+        return self.attach(tokens)
+
+    def enrich_results(self, results: Iterable[FetchResult]) -> Iterator[FetchResult]:
+        """
+        Pass FetchResults through in order, each with its launchpad tokens
+        enriched. A result is held back only while its own lookups are
+        running and never holds back the scrape producing the next ones.
+        """
+        queue: Deque[Tuple[FetchResult, List[Future]]] = deque()
+
+        def ready() -> Iterator[FetchResult]:
+            while queue and all(future.done() for future in queue[0][1]):
+                result, _ = queue.popleft()
+                self.attach(result.tokens)
+                yield result
+
+        for result in results:
+            queue.append((result, self.submit(result.tokens) if result.ok else []))
+            yield from ready()
+
+        deadline = time.monotonic() + self.timeout
+        while queue:
+            result, futures = queue.popleft()
+            _, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+            if not_done:
+                logger.warning(
+                    "Launchpad lookups for '%s' did not finish within %.1fs; "
+                    "exporting without them.",
+                    result.job.query,
+                    self.timeout,
+                )
+            self.attach(result.tokens)
+            yield result
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
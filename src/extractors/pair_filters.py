@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models.token_model import PAIR_NUMERIC_FIELDS, extract_pair_values
+
+logger = logging.getLogger("dexscreener.extractors.pair_filters")
+
+# Membership filters read the raw pair dict; numeric filters and ranking
+# read its extract_pair_values() tuple, which is only computed when one of
+# them needs it.
+PairValues = Tuple[Any, ...]
+PairPredicate = Callable[[Dict[str, Any]], bool]
+ValuePredicate = Callable[[PairValues], bool]
+# A pair and its values tuple, or None if nothing needed the values.
+PairRow = Tuple[Dict[str, Any], Optional[PairValues]]
+
+# Target keys that select string-valued pair attributes.
+_MEMBERSHIP_FILTERS = {
+    "chainId": lambda pair: pair.get("chainId"),
+    "dexId": lambda pair: pair.get("dexId"),
+    "quoteSymbol": lambda pair: (pair.get("quoteToken") or {}).get("symbol"),
+}
+
+class FilterSpecError(ValueError):
+    """Raised when a target's filters/sort section cannot be compiled."""
+
+def _range_predicate(name: str, bound: float, is_min: bool) -> ValuePredicate:
+    position = PAIR_NUMERIC_FIELDS[name]
+
+    def predicate(values: PairValues) -> bool:
+        value = values[position]
+        if value is None:
+            return False
+        return value >= bound if is_min else value <= bound
+
+    return predicate
+
+def _membership_predicate(name: str, allowed: Iterable[str]) -> PairPredicate:
+    getter = _MEMBERSHIP_FILTERS[name]
+    allowed_set = frozenset(str(value).lower() for value in allowed)
+
+    def predicate(pair: Dict[str, Any]) -> bool:
+        value = getter(pair)
+        return value is not None and str(value).lower() in allowed_set
+
+    return predicate
+
+def _compile_membership(key: str, value: Any) -> PairPredicate:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise FilterSpecError(f"Filter '{key}' needs a string or a list of strings, got {value!r}.")
+    return _membership_predicate(key, value)
+
+def _compile_range(key: str, value: Any) -> ValuePredicate:
+    prefix, name = key[:3], key[3:4].lower() + key[4:]
+    if prefix in ("min", "max") and name in PAIR_NUMERIC_FIELDS:
+        try:
+            bound = float(value)
+        except (TypeError, ValueError) as exc:
+            raise FilterSpecError(f"Filter '{key}' needs a numeric value, got {value!r}.") from exc
+        return _range_predicate(name, bound, is_min=prefix == "min")
+
+    raise FilterSpecError(
+        f"Unknown filter '{key}'. Use chainId/dexId/quoteSymbol, or min/max followed by "
+        f"one of: {', '.join(sorted(k[0].upper() + k[1:] for k in PAIR_NUMERIC_FIELDS))}."
+    )
+
+@dataclass
+class PairPipeline:
+    """
+    Per-target filter + top-N evaluated on raw pair dicts.
+
+    Running before Token.from_pair_payload means rejected pairs never cost a
+    model allocation; top-N uses a bounded heap (O(n log k)) rather than a
+    full sort. Membership filters run on the dict first. Only the pairs they
+    keep are mapped to their extract_pair_values() tuple, and only if a
+    numeric filter or the ranking needs it. `select` hands the tuples on so
+    the Tokens can be built from them without mapping the pairs again.
+    """
+
+    pair_predicates: List[PairPredicate] = field(default_factory=list)
+    value_predicates: List[ValuePredicate] = field(default_factory=list)
+    sort_by: Optional[str] = None
+    descending: bool = True
+    limit: Optional[int] = None
+
+    def select(self, pairs: Iterable[Dict[str, Any]], now: Optional[float] = None) -> List[PairRow]:
+        """The kept pairs in output order, each with its values tuple if computed."""
+        pair_predicates = self.pair_predicates
+        if pair_predicates:
+            pairs = (pair for pair in pairs if all(pred(pair) for pred in pair_predicates))
+
+        value_predicates = self.value_predicates
+        if not value_predicates and self.sort_by is None:
+            rows: List[PairRow] = [(pair, None) for pair in pairs]
+            return rows[: self.limit] if self.limit is not None else rows
+
+        now = time.time() if now is None else now
+        mapped = (row for row in (_with_values(pair, now) for pair in pairs) if row is not None)
+        if value_predicates:
+            mapped = (row for row in mapped if all(pred(row[1]) for pred in value_predicates))
+
+        if self.sort_by is None:
+            rows = list(mapped)
+            return rows[: self.limit] if self.limit is not None else rows
+
+        position = PAIR_NUMERIC_FIELDS[self.sort_by]
+        # Pairs missing the sort field always rank last, in either direction.
+        sign = 1.0 if self.descending else -1.0
+
+        def rank(item: Tuple[int, Tuple[Dict[str, Any], PairValues]]) -> Tuple[bool, float, int]:
+            index, (_, values) = item
+            value = values[position]
+            if value is None:
+                return (False, 0.0, -index)
+            return (True, sign * value, -index)
+
+        indexed = enumerate(mapped)
+        if self.limit is not None:
+            ranked = heapq.nlargest(self.limit, indexed, key=rank)
+        else:
+            ranked = sorted(indexed, key=rank, reverse=True)
+        return [row for _, row in ranked]
+
+    def apply(self, pairs: Iterable[Dict[str, Any]], now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """The kept pairs in output order."""
+        return [pair for pair, _ in self.select(pairs, now)]
+
+def _with_values(pair: Dict[str, Any], now: float) -> Optional[Tuple[Dict[str, Any], PairValues]]:
+    try:
+        return pair, extract_pair_values(pair, now)
+    except Exception as exc:
+        # The Token build would skip this pair too.
+        logger.debug("Dropping a pair that cannot be mapped: %s", exc)
+        return None
+
+def compile_pipeline(target: Dict[str, Any]) -> Optional[PairPipeline]:
+    """
+    Compile a target's declarative `filters`, `sortBy`, `sortOrder` and
+    `limit` keys. Returns None when the target has none of them.
+
+        {
+          "query": "solana",
+          "filters": {"minLiquidityUsd": 10000, "maxAge": 24, "dexId": ["raydium"]},
+          "sortBy": "volumeUsd",
+          "sortOrder": "desc",
+          "limit": 50
+        }
+    """
+    filters = target.get("filters") or {}
+    sort_by = target.get("sortBy")
+    limit = target.get("limit")
+    if not filters and sort_by is None and limit is None:
+        return None
+
+    if not isinstance(filters, dict):
+        raise FilterSpecError("'filters' must be an object.")
+    if sort_by is not None and sort_by not in PAIR_NUMERIC_FIELDS:
+        raise FilterSpecError(
+            f"Cannot sort by '{sort_by}'; choose one of: {', '.join(PAIR_NUMERIC_FIELDS)}."
+        )
+    sort_order = str(target.get("sortOrder", "desc")).lower()
+    if sort_order not in ("asc", "desc"):
+        raise FilterSpecError("'sortOrder' must be 'asc' or 'desc'.")
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError) as exc:
+            raise FilterSpecError(f"'limit' must be an integer, got {limit!r}.") from exc
+        if limit < 0:
+            raise FilterSpecError("'limit' must not be negative.")
+
+    return PairPipeline(
+        pair_predicates=[
+            _compile_membership(key, value)
+            for key, value in filters.items()
+            if key in _MEMBERSHIP_FILTERS
+        ],
+        value_predicates=[
+            _compile_range(key, value)
+            for key, value in filters.items()
+            if key not in _MEMBERSHIP_FILTERS
+        ],
+        sort_by=sort_by,
+        descending=sort_order == "desc",
+        limit=limit,
+    )
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from extractors.address_lookup import normalize_address
+
+logger = logging.getLogger("dexscreener.extractors.query_planner")
+
+# Why a planner stopped issuing sub-queries.
+STOP_BUDGET = "page budget reached"
+STOP_SATURATED = "no unseen pairs"
+STOP_EXHAUSTED = "no sub-queries left"
+
+DEFAULT_STOP_AFTER_EMPTY_PAGES = 2
+
+@dataclass
+class PageResult:
+    """What one sub-query ("page") contributed to its target."""
+
+    query: str
+    returned: int
+    new: int
+    error: Optional[str] = None
+
+@dataclass
+class CoverageReport:
+    """How thoroughly a target's query space was explored."""
+
+    query: str
+    pages: List[PageResult] = field(default_factory=list)
+    unique_pairs: int = 0
+    stop_reason: Optional[str] = None
+
+    @property
+    def pages_fetched(self) -> int:
+        return len(self.pages)
+
+    @property
+    def pairs_returned(self) -> int:
+        return sum(page.returned for page in self.pages)
+
+    @property
+    def failed_pages(self) -> int:
+        return sum(1 for page in self.pages if page.error is not None)
+
+    def summary(self) -> str:
+        return (
+            f"{self.pages_fetched} pages, {self.unique_pairs} unique pairs "
+            f"({self.pairs_returned} returned, {self.failed_pages} failed pages), "
+            f"stopped: {self.stop_reason}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.query,
+            "pagesFetched": self.pages_fetched,
+            "failedPages": self.failed_pages,
+            "pairsReturned": self.pairs_returned,
+            "uniquePairs": self.unique_pairs,
+            "stopReason": self.stop_reason,
+            "pages": [
+                {"query": p.query, "returned": p.returned, "new": p.new, "error": p.error}
+                for p in self.pages
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CoverageReport":
+        return cls(
+            query=data["query"],
+            pages=[
+                PageResult(p["query"], p["returned"], p["new"], error=p.get("error"))
+                for p in data.get("pages", [])
+            ],
+            unique_pairs=data.get("uniquePairs", 0),
+            stop_reason=data.get("stopReason"),
+        )
+
+@dataclass(frozen=True)
+class ExpansionConfig:
+    """How a target's query may be expanded into sub-queries."""
+
+    terms: Tuple[str, ...] = ()
+    from_results: bool = True
+    stop_after_empty: int = DEFAULT_STOP_AFTER_EMPTY_PAGES
+
+    @classmethod
+    def from_config(
+        cls, pagination: Dict[str, Any], target: Optional[Dict[str, Any]] = None
+    ) -> "ExpansionConfig":
+        """
+        Read `expansionTerms`, `expandFromResults` and `stopAfterEmptyPages`
+        from the `pagination` settings block; a target may override the
+        first two.
+        """
+        target = target or {}
+        terms = target.get("expansionTerms", pagination.get("expansionTerms")) or []
+        if isinstance(terms, str):
+            terms = terms.split(",")
+        return cls(
+            terms=tuple(str(term).strip() for term in terms if str(term).strip()),
+            from_results=bool(
+                target.get("expandFromResults", pagination.get("expandFromResults", True))
+            ),
+            stop_after_empty=int(
+                pagination.get("stopAfterEmptyPages", DEFAULT_STOP_AFTER_EMPTY_PAGES)
+            ),
+        )
+
+    def planner(self, query: str, max_pages: int) -> "QueryPlanner":
+        return QueryPlanner(
+            query,
+            max_pages=max_pages,
+            expansions=self.terms,
+            expand_from_results=self.from_results,
+            stop_after_empty=self.stop_after_empty,
+        )
+
+def pair_identity(pair: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    address = pair.get("pairAddress")
+    if not address:
+        return None
+    return (pair.get("chainId") or "", normalize_address(str(address)))
+
+class QueryPlanner:
+    """
+    Expands one broad search target into narrower sub-queries.
+
+    `/search` caps how many pairs a single query returns, so each extra
+    "page" is the seed query narrowed by a term: the configured `expansions`
+    first, then dexIds and quote symbols discovered in earlier results.
+    Pairs are de-duplicated across pages, and planning stops once
+    `max_pages` requests were made, no candidate terms are left, or
+    `stop_after_empty` consecutive pages yielded no unseen pairs.
+
+    The planner does no I/O: callers take `next_wave()` sub-queries, fetch
+    them (serially or concurrently) and hand each page back to `record()`.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        max_pages: int = 1,
+        expansions: Sequence[str] = (),
+        expand_from_results: bool = True,
+        stop_after_empty: int = DEFAULT_STOP_AFTER_EMPTY_PAGES,
+    ) -> None:
+        self.query = query
+        self.max_pages = max(1, int(max_pages))
+        self.expand_from_results = expand_from_results
+        self.stop_after_empty = max(1, int(stop_after_empty))
+
+        self._pending: List[str] = [query]
+        self._planned: Set[str] = {query.lower()}
+        self._query_terms = {term.lower() for term in query.replace("/", " ").split()}
+        for term in expansions:
+            self._add_term(term)
+
+        self._issued = 0
+        self._empty_streak = 0
+        self._seen: Set[Tuple[str, str]] = set()
+        self._pairs: List[Dict[str, Any]] = []
+        self.coverage = CoverageReport(query=query)
+
+    def _add_term(self, term: Any) -> None:
+        term = str(term or "").strip()
+        if not term or term.lower() in self._query_terms:
+            return
+        sub_query = f"{self.query} {term}"
+        if sub_query.lower() not in self._planned:
+            self._planned.add(sub_query.lower())
+            self._pending.append(sub_query)
+
+    @property
+    def done(self) -> bool:
+        if self.coverage.stop_reason is not None:
+            return True
+        if self._issued >= self.max_pages:
+            self.coverage.stop_reason = STOP_BUDGET
+        elif self._empty_streak >= self.stop_after_empty:
+            self.coverage.stop_reason = STOP_SATURATED
+        elif not self._pending:
+            self.coverage.stop_reason = STOP_EXHAUSTED
+        return self.coverage.stop_reason is not None
+
+    def next_wave(self, size: int = 1) -> List[str]:
+        """Up to `size` sub-queries to fetch next; empty once planning is done."""
+        if self.done:
+            return []
+        size = min(max(1, size), self.max_pages - self._issued, len(self._pending))
+        wave, self._pending = self._pending[:size], self._pending[size:]
+        self._issued += len(wave)
+        return wave
+
+    def record(
+        self,
+        sub_query: str,
+        pairs: Iterable[Dict[str, Any]] = (),
+        error: Optional[BaseException] = None,
+    ) -> int:
+        """Merge one page's pairs; returns how many were not seen before."""
+        returned = new = 0
+        for pair in pairs:
+            returned += 1
+            identity = pair_identity(pair)
+            if identity is not None:
+                if identity in self._seen:
+                    continue
+                self._seen.add(identity)
+            new += 1
+            self._pairs.append(pair)
+            if self.expand_from_results:
+                self._add_term(pair.get("dexId"))
+                self._add_term((pair.get("quoteToken") or {}).get("symbol"))
+
+        # A failed page says nothing about saturation, so it does not count
+        # towards the empty streak.
+        if error is None:
+            self._empty_streak = 0 if new else self._empty_streak + 1
+        self.coverage.pages.append(
+            PageResult(sub_query, returned, new, error=str(error) if error is not None else None)
+        )
+        self.coverage.unique_pairs = len(self._pairs)
+        logger.debug(
+            "Page '%s' for '%s': %d pairs, %d new.", sub_query, self.query, returned, new
+        )
+        return new
+
+    def record_error(self, sub_query: str, error: BaseException) -> None:
+        """
+        Note a failed page. The seed query failing fails the whole target,
+        as it did before expansion existed; narrower pages are best-effort.
+        """
+        if sub_query == self.query and not self.coverage.pages:
+            raise error
+        logger.warning("Sub-query '%s' for '%s' failed: %s", sub_query, self.query, error)
+        self.record(sub_query, error=error)
+
+    def pairs(self) -> List[Dict[str, Any]]:
+        """Unique pairs collected so far, in first-seen order."""
+        return list(self._pairs)
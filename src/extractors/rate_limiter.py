@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+logger = logging.getLogger("dexscreener.extractors.rate_limiter")
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Callers reserve a token under the lock and sleep outside it, so waiting
+    threads are served in arrival order and the bucket never over-issues.
+    `pause()` lets a 429 response hold back every caller sharing the bucket,
+    not just the thread that received it.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive.")
+        self.rate = float(rate_per_second)
+        self.capacity = float(max(1, burst))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: int = 1) -> "TokenBucket":
+        return cls(rate_per_second=requests_per_minute / 60.0, burst=burst)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Take one token, blocking until it is available.
+
+        Returns the number of seconds the caller was held back.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1.0
+            wait = max(0.0, -self._tokens / self.rate, self._blocked_until - now)
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all callers for at least `seconds` from now."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry settings for transient DexScreener failures.
+
+    Backoff uses "full jitter": a random delay between 0 and
+    `backoff_base * 2 ** attempt`, capped at `backoff_max`.
+    """
+
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def should_retry_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, which may be delta-seconds or an HTTP date.
+
+    Returns the delay in seconds, or None if the header is missing/invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        logger.debug("Ignoring unparseable Retry-After header: %r", value)
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(tz=timezone.utc)).total_seconds())
+
+def build_rate_limiter(config: Dict[str, Any]) -> Optional[TokenBucket]:
+    """
+    Build a TokenBucket from the `dexscreener.rateLimit` settings block.
+
+    A missing block or a non-positive `requestsPerMinute` disables limiting.
+    """
+    requests_per_minute = config.get("requestsPerMinute")
+    if not requests_per_minute or requests_per_minute <= 0:
+        return None
+    return TokenBucket.per_minute(requests_per_minute, burst=int(config.get("burst", 1)))
+
+def build_retry_policy(config: Dict[str, Any]) -> RetryPolicy:
+    """Build a RetryPolicy from the `dexscreener.retry` settings block."""
+    defaults = RetryPolicy()
+    return RetryPolicy(
+        max_retries=int(config.get("maxRetries", defaults.max_retries)),
+        backoff_base=float(config.get("backoffBaseSeconds", defaults.backoff_base)),
+        backoff_max=float(config.get("backoffMaxSeconds", defaults.backoff_max)),
+    )
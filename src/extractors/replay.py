@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from extractors.response_cache import ResponseCache
+
+logger = logging.getLogger("dexscreener.extractors.replay")
+
+# Response headers worth keeping in a fixture; the rest is transport noise.
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+@dataclass
+class FixtureRecord:
+    """One recorded API response, addressed like a response cache entry."""
+
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: str = ""
+
+    @property
+    def key(self) -> str:
+        return ResponseCache.make_key(self.path, self.params)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "params": self.params,
+            "status": self.status,
+            "headers": self.headers,
+            "body": self.body,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FixtureRecord":
+        return cls(
+            path=data["path"],
+            params=dict(data.get("params") or {}),
+            status=int(data.get("status", 200)),
+            headers=dict(data.get("headers") or {}),
+            body=data.get("body", ""),
+        )
+
+class Fixture:
+    """
+    Recorded responses, replayed by request path and params.
+
+    On disk a fixture is JSON Lines, one FixtureRecord per line, so it can
+    be appended to while recording. A request recorded several times (e.g.
+    across watch cycles) replays its responses in order and then keeps
+    returning the last one.
+    """
+
+    def __init__(self, records: Iterable[FixtureRecord] = ()) -> None:
+        self._lock = threading.Lock()
+        self._responses: Dict[str, List[FixtureRecord]] = {}
+        self._served: Dict[str, int] = {}
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def load(cls, path: Path) -> "Fixture":
+        with Path(path).open("r", encoding="utf-8") as f:
+            fixture = cls(FixtureRecord.from_dict(json.loads(line)) for line in f if line.strip())
+        logger.info("Loaded %d recorded responses from %s.", len(fixture), path)
+        return fixture
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            for record in self:
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False))
+                f.write("\n")
+
+    def add(self, record: FixtureRecord) -> None:
+        with self._lock:
+            self._responses.setdefault(record.key, []).append(record)
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._responses.values())
+
+    def __iter__(self) -> Iterator[FixtureRecord]:
+        for records in list(self._responses.values()):
+            yield from records
+
+    def search_queries(self) -> List[str]:
+        """Distinct `/search` queries in the fixture, in recording order."""
+        queries: List[str] = []
+        for records in self._responses.values():
+            first = records[0]
+            if first.path == "search" and first.params.get("q") not in (None, *queries):
+                queries.append(str(first.params["q"]))
+        return queries
+
+    def has_path(self, prefix: str) -> bool:
+        """Whether any request below `prefix` (e.g. `pairs/`) was recorded."""
+        return any(record.path.startswith(prefix) for record in self)
+
+    def response_for(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[FixtureRecord]:
+        key = ResponseCache.make_key(path, params)
+        with self._lock:
+            records = self._responses.get(key)
+            if not records:
+                return None
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+        return records[min(served, len(records) - 1)]
+
+def relative_path(url: str, base_url: str) -> str:
+    """Endpoint path of `url` below `base_url`, e.g. `search` or `pairs/solana/...`."""
+    base_path = urlsplit(base_url).path.rstrip("/")
+    path = urlsplit(url).path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path) :]
+    return path.strip("/")
+
+def build_response(url: str, record: Optional[FixtureRecord]) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.encoding = "utf-8"
+    if record is None:
+        response.status_code = 404
+        response._content = b'{"error": "not recorded"}'
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        return response
+    response.status_code = record.status
+    response._content = record.body.encode("utf-8")
+    response.headers = CaseInsensitiveDict(record.headers)
+    return response
+
+class ReplaySession(requests.Session):
+    """
+    A requests.Session that answers from a Fixture instead of the network,
+    for `DexScreenerClient(session=ReplaySession(...))`.
+
+    Requests that were never recorded get an HTTP 404, which the client
+    reports like any other failed target. `latency` adds a fixed delay per
+    request to approximate a real round trip.
+    """
+
+    def __init__(self, fixture: Fixture, base_url: str, latency: float = 0.0) -> None:
+        super().__init__()
+        self.fixture = fixture
+        self.base_url = base_url
+        self.latency = latency
+        self.misses = 0
+
+    def get(  # type: ignore[override]
+        self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> requests.Response:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        record = self.fixture.response_for(relative_path(url, self.base_url), params)
+        if record is None:
+            self.misses += 1
+            logger.warning("No recorded response for %s params=%s.", url, params)
+        return build_response(url, record)
+
+class RecordingSession(requests.Session):
+    """
+    A requests.Session that performs real requests and appends every
+    response it receives to a fixture file, one JSON line per response.
+    """
+
+    def __init__(
+        self, output_path: Path, base_url: str, session: Optional[requests.Session] = None
+    ) -> None:
+        super().__init__()
+        self.output_path = Path(output_path)
+        self.base_url = base_url
+        self.session = session or requests.Session()
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.output_path.open("a", encoding="utf-8")
+
+    def get(  # type: ignore[override]
+        self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> requests.Response:
+        response = self.session.get(url, params=params, **kwargs)
+        headers = response.headers
+        record = FixtureRecord(
+            path=relative_path(url, self.base_url),
+            params=dict(params or {}),
+            status=response.status_code,
+            headers={name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            body=response.text,
+        )
+        line = json.dumps(record.to_dict(), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line)
+            self._file.write("\n")
+            self.recorded += 1
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                logger.info("Recorded %d responses to %s.", self.recorded, self.output_path)
+        self.session.close()
+        super().close()
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY every
+    # keep-alive response stalls on the peer's delayed ACK.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        server: ReplayServer = self.server  # type: ignore[assignment]
+        if server.latency > 0:
+            time.sleep(server.latency)
+        parts = urlsplit(self.path)
+        path = relative_path(parts.path, server.base_path)
+        record = server.fixture.response_for(path, dict(parse_qsl(parts.query)))
+        if record is None:
+            logger.warning("No recorded response for %s.", self.path)
+        status = record.status if record is not None else 404
+        headers = record.headers if record is not None else {"Content-Type": "application/json"}
+        body = record.body.encode("utf-8") if record is not None else b'{"error": "not recorded"}'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("Replay server: " + format, *args)
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Local HTTP stub that serves a Fixture from a daemon thread, so the full
+    network stack (sockets, connection pooling, HTTP parsing) is exercised.
+    Point the client's `baseUrl` at `server.base_url`.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        fixture: Fixture,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        base_path: str = "/latest/dex",
+        latency: float = 0.0,
+    ) -> None:
+        super().__init__((host, port), _ReplayHandler)
+        self.fixture = fixture
+        self.base_path = base_path
+        self.latency = latency
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="dexscreener-replay", daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}{self.base_path}"
+
+    def start(self) -> "ReplayServer":
+        self._thread.start()
+        logger.info("Replaying %d recorded responses at %s", len(self.fixture), self.base_url)
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
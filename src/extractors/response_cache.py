@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger("dexscreener.extractors.response_cache")
+
+@dataclass
+class CachedResponse:
+    """A stored API response body plus the validators needed to revalidate it."""
+
+    body: str
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, ttl_seconds: float, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return ttl_seconds > 0 and (now - self.stored_at) < ttl_seconds
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache(ABC):
+    """
+    Interface for response caches used by DexScreenerClient.
+
+    Entries are keyed by endpoint path and query params. TTLs are resolved
+    per endpoint (the first path segment, e.g. `search`), falling back to
+    `default_ttl`.
+    """
+
+    def __init__(self, default_ttl: float = 30.0, ttls: Optional[Dict[str, float]] = None) -> None:
+        self.default_ttl = float(default_ttl)
+        self.ttls = {k: float(v) for k, v in (ttls or {}).items()}
+
+    @staticmethod
+    def make_key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        path = path.strip("/")
+        if not params:
+            return path
+        return f"{path}?{urlencode(sorted(params.items()))}"
+
+    def ttl_for(self, path: str) -> float:
+        endpoint = path.strip("/").split("/", 1)[0]
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def cap_ttls(self, max_ttl: float) -> None:
+        """Lower every TTL above `max_ttl`, e.g. to a watch loop's refresh interval."""
+        self.default_ttl = min(self.default_ttl, max_ttl)
+        self.ttls = {endpoint: min(ttl, max_ttl) for endpoint, ttl in self.ttls.items()}
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """The stored entry for `key`, fresh or not, or None."""
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """Store `entry` under `key`, replacing any previous one."""
+
+    @abstractmethod
+    def touch(self, key: str) -> None:
+        """Mark an entry as revalidated now (e.g. after an HTTP 304)."""
+
+    def close(self) -> None:
+        pass
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Response cache persisted in a single SQLite file.
+
+    Every read updates `last_access`; once the stored bodies exceed
+    `max_bytes`, the least recently used entries are evicted. The total
+    size is kept as a running count, so a write only queries the table when
+    it actually has to evict.
+    """
+
+    # Entries deleted per eviction query.
+    EVICT_BATCH = 64
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 30.0,
+        ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        super().__init__(default_ttl=default_ttl, ttls=ttls)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+        (self._total_bytes,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, stored_at, etag, last_modified FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return CachedResponse(body=row[0], stored_at=row[1], etag=row[2], last_modified=row[3])
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        size = len(entry.body.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.debug("Response for %s is larger than the cache (%d bytes), not storing.", key, size)
+            return
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, body, size, etag, last_modified, stored_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, entry.body, size, entry.etag, entry.last_modified, entry.stored_at, time.time()),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        evicted = 0
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC LIMIT ?",
+                (self.EVICT_BATCH,),
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                evicted += 1
+        logger.debug("Evicted %d cached responses (now %d bytes).", evicted, self._total_bytes)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def build_response_cache(
+    config: Dict[str, Any],
+    root_dir: Path,
+    directory_override: Optional[str] = None,
+    disabled: bool = False,
+) -> Optional[ResponseCache]:
+    """
+    Build a response cache from the `cache` settings block.
+
+    Caching is off unless `cache.enabled` is set or a `directory_override`
+    is given. Returns None when it is off or `disabled`.
+    """
+    if disabled or not (config.get("enabled", False) or directory_override):
+        return None
+
+    directory = directory_override or config.get("directory", ".cache")
+    cache_dir = (root_dir / directory).resolve()
+    return SQLiteResponseCache(
+        path=cache_dir / "responses.sqlite3",
+        max_bytes=int(float(config.get("maxSizeMb", 256)) * 1024 * 1024),
+        default_ttl=config.get("defaultTtlSeconds", 30),
+        ttls=config.get("ttlSeconds", {}),
+    )
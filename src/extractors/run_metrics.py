@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from outputs.atomic_file import replacement_mode
+
+logger = logging.getLogger("dexscreener.extractors.run_metrics")
+
+# Pipeline stages timed during a run.
+STAGE_REQUEST = "request"
+STAGE_DECODE = "decode"
+STAGE_PARSE = "parse"
+STAGE_EXPORT = "export"
+
+@dataclass
+class StageStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "totalSeconds": round(self.total_seconds, 6),
+            "maxSeconds": round(self.max_seconds, 6),
+            "meanSeconds": round(self.total_seconds / self.count, 6) if self.count else 0.0,
+        }
+
+class StageTimers:
+    """Thread-safe wall-clock timers, one StageStats per named stage."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageStats] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(seconds)
+
+    @contextlib.contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def merge(self, stages: Dict[str, StageStats]) -> None:
+        """Fold in timers collected elsewhere, e.g. by a worker process."""
+        with self._lock:
+            for name, other in stages.items():
+                stats = self._stages.get(name)
+                if stats is None:
+                    stats = self._stages[name] = StageStats()
+                stats.count += other.count
+                stats.total_seconds += other.total_seconds
+                stats.max_seconds = max(stats.max_seconds, other.max_seconds)
+
+    def snapshot(self) -> Dict[str, StageStats]:
+        with self._lock:
+            return {
+                name: StageStats(s.count, s.total_seconds, s.max_seconds)
+                for name, s in self._stages.items()
+            }
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self.snapshot().items()}
+
+@dataclass
+class TargetSummary:
+    query: str
+    ok: bool
+    tokens: int
+    error: Optional[str] = None
+    coverage: Optional[Dict[str, Any]] = None
+
+@dataclass
+class RunSummary:
+    """
+    Run-level figures that do not belong to the HTTP client: per-target
+    outcomes and, in watch mode, the state of the latest cycle.
+    """
+
+    started_at: float = field(default_factory=time.time)
+    targets: List[TargetSummary] = field(default_factory=list)
+    exported: int = 0
+    cycles: int = 0
+    pools_tracked: int = 0
+    changes_written: int = 0
+    alerts_fired: int = 0
+    last_cycle_seconds: float = 0.0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @staticmethod
+    def summarize_result(result: Any) -> TargetSummary:
+        coverage = getattr(result, "coverage", None)
+        return TargetSummary(
+            query=result.job.query,
+            ok=result.ok,
+            tokens=len(result.tokens),
+            error=str(result.error) if result.error is not None else None,
+            coverage=coverage.to_dict() if coverage is not None else None,
+        )
+
+    def observe_results(self, results: Iterator[Any]) -> Iterator[Any]:
+        """Pass FetchResults through unchanged while recording their outcome."""
+        for result in results:
+            self.targets.append(self.summarize_result(result))
+            yield result
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def gauges(self) -> Dict[str, float]:
+        return {
+            "targets_ok": sum(1 for t in self.targets if t.ok),
+            "targets_failed": sum(1 for t in self.targets if not t.ok),
+            "tokens_exported": self.exported,
+            "watch_cycles": self.cycles,
+            "pools_tracked": self.pools_tracked,
+            "changes_written": self.changes_written,
+            "alerts_fired": self.alerts_fired,
+            "last_cycle_seconds": round(self.last_cycle_seconds, 6),
+            "uptime_seconds": round(self.elapsed, 3),
+        }
+
+    def to_dict(self, counters: Dict[str, Any], stages: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        elapsed = self.elapsed
+        tokens_built = counters.get("tokens_built", 0)
+        parse_seconds = stages.get(STAGE_PARSE, {}).get("totalSeconds", 0.0)
+        return {
+            "startedAt": datetime.fromtimestamp(self.started_at, tz=timezone.utc).isoformat(),
+            "elapsedSeconds": round(elapsed, 3),
+            "tokensExported": self.exported,
+            "tokensPerSecond": round(self.exported / elapsed, 2) if elapsed > 0 else 0.0,
+            "alertsFired": self.alerts_fired,
+            "parseTokensPerSecond": (
+                round(tokens_built / parse_seconds, 2) if parse_seconds > 0 else 0.0
+            ),
+            "counters": counters,
+            "stages": stages,
+            "targets": [
+                {
+                    "query": t.query,
+                    "ok": t.ok,
+                    "tokens": t.tokens,
+                    "error": t.error,
+                    "coverage": t.coverage,
+                }
+                for t in self.targets
+            ],
+        }
+
+def write_run_summary(summary: Dict[str, Any], output_path: Path) -> None:
+    """Write the summary JSON next to the exports, replacing it atomically."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=str(output_path.parent), prefix=f".{output_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        os.chmod(tmp_name, replacement_mode(output_path))
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+def render_prometheus(
+    counters: Dict[str, Any],
+    stages: Dict[str, StageStats],
+    gauges: Dict[str, float],
+    prefix: str = "dexscreener",
+) -> str:
+    """Render metrics in the Prometheus text exposition format (v0.0.4)."""
+    lines: List[str] = []
+    for name, value in counters.items():
+        metric = f"{prefix}_{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    for name, value in gauges.items():
+        metric = f"{prefix}_{name}"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value}")
+    if stages:
+        metric = f"{prefix}_stage_seconds"
+        lines.append(f"# TYPE {metric} summary")
+        for stage, stats in sorted(stages.items()):
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {stats.total_seconds:.6f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {stats.count}')
+        lines.append(f"# TYPE {prefix}_stage_max_seconds gauge")
+        for stage, stats in sorted(stages.items()):
+            lines.append(f'{prefix}_stage_max_seconds{{stage="{stage}"}} {stats.max_seconds:.6f}')
+    return "\n".join(lines) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.render().encode("utf-8")  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("Metrics endpoint: " + format, *args)
+
+class MetricsServer(ThreadingHTTPServer):
+    """Serves `render()` at /metrics from a daemon thread."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int, render: Callable[[], str]) -> None:
+        super().__init__((host, port), _MetricsHandler)
+        self.render = render
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="dexscreener-metrics", daemon=True
+        )
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        logger.info(
+            "Serving Prometheus metrics on http://%s:%d/metrics",
+            self.server_address[0],
+            self.server_address[1],
+        )
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+@contextlib.contextmanager
+def profile_run(output_dir: Path, top: int = 25) -> Iterator[None]:
+    """
+    Profile the enclosed block with cProfile and tracemalloc.
+
+    Writes `profile.pstats` (open with `python -m pstats` or snakeviz) and
+    `profile_memory.txt` (top allocation sites) into `output_dir`. cProfile
+    only sees the calling thread, so request work done on worker threads
+    with --concurrency > 1 shows up as time waiting on them.
+    """
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    tracemalloc.start(25)
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        memory = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats_path = output_dir / "profile.pstats"
+        profiler.dump_stats(str(stats_path))
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(top)
+        logger.info("Top %d functions by cumulative time:\n%s", top, report.getvalue())
+
+        memory_path = output_dir / "profile_memory.txt"
+        with memory_path.open("w", encoding="utf-8") as f:
+            f.write(f"current={current} bytes peak={peak} bytes\n\n")
+            for stat in memory.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
+        logger.info(
+            "Profile written to %s and %s (peak traced memory %.1f MiB).",
+            stats_path,
+            memory_path,
+            peak / (1024 * 1024),
+        )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+from models.token_model import Token
+
+logger = logging.getLogger("dexscreener.extractors.snapshot_diff")
+
+# Token fields whose changes are reported between snapshots.
+WATCHED_FIELDS: Tuple[str, ...] = ("priceUsd", "liquidityUsd", "volumeUsd")
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_UPDATED = "changed"
+
+@dataclass
+class TokenChange:
+    """A single entry of the change stream produced by watch mode."""
+
+    type: str
+    lowerPoolAddress: str
+    timestamp: str
+    token: Optional[Dict[str, Any]] = None
+    changes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "type": self.type,
+            "lowerPoolAddress": self.lowerPoolAddress,
+            "timestamp": self.timestamp,
+        }
+        if self.token is not None:
+            data["token"] = self.token
+        if self.changes:
+            data["changes"] = self.changes
+        return data
+
+def diff_snapshots(
+    previous: Mapping[Hashable, Token],
+    current: Mapping[Hashable, Token],
+    watched_fields: Iterable[str] = WATCHED_FIELDS,
+    now: Optional[datetime] = None,
+) -> List[TokenChange]:
+    """
+    Compare two keyed snapshots (typically TokenIndex instances) and return
+    the changes between them.
+
+    New pools are reported with their full token payload, removed pools with
+    their last known payload, and existing pools only when one of
+    `watched_fields` differs.
+    """
+    timestamp = (now or datetime.now(tz=timezone.utc)).isoformat()
+    watched = tuple(watched_fields)
+    changes: List[TokenChange] = []
+
+    for key, token in current.items():
+        address = token.lowerPoolAddress or ""
+        old = previous.get(key)
+        if old is None:
+            changes.append(
+                TokenChange(CHANGE_ADDED, address, timestamp, token=token.to_dict())
+            )
+            continue
+
+        field_changes = {
+            name: {"old": getattr(old, name), "new": getattr(token, name)}
+            for name in watched
+            if getattr(old, name) != getattr(token, name)
+        }
+        if field_changes:
+            changes.append(
+                TokenChange(CHANGE_UPDATED, address, timestamp, changes=field_changes)
+            )
+
+    for key, token in previous.items():
+        if key not in current:
+            changes.append(
+                TokenChange(
+                    CHANGE_REMOVED, token.lowerPoolAddress or "", timestamp, token=token.to_dict()
+                )
+            )
+
+    logger.debug(
+        "Snapshot diff: %d previous, %d current, %d changes.",
+        len(previous),
+        len(current),
+        len(changes),
+    )
+    return changes
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from extractors.alert_rules import TokenPredicate, compile_token_condition
+from extractors.json_codec import JsonCodec, get_codec
+from extractors.snapshot_diff import TokenChange
+from extractors.token_index import TokenIndex
+from models.token_batch import COLUMN_TYPES
+from models.token_model import Token
+
+logger = logging.getLogger("dexscreener.extractors.snapshot_server")
+
+# Query parameters of /tokens that are not filters.
+_RESERVED_PARAMS = ("sort", "order", "limit", "offset")
+
+class QueryError(ValueError):
+    """Raised for /tokens query parameters that cannot be applied."""
+
+class Snapshot:
+    """
+    One immutable, deduplicated token set as served to readers.
+
+    It wraps the watch cycle's TokenIndex, which must not change once
+    published, and reuses its address index for lookups. Each token's JSON
+    encoding, including the queries that returned the pair as `sources`, is
+    prepared once on the scrape thread. Sort orders are computed on first
+    use and cached. Readers only ever see a complete snapshot, since
+    publishing swaps a single reference.
+    """
+
+    def __init__(
+        self,
+        index: TokenIndex,
+        version: int = 0,
+        updated_at: Optional[float] = None,
+        codec: Optional[JsonCodec] = None,
+    ) -> None:
+        codec = codec or get_codec()
+        self.index = index
+        self.version = version
+        self.updated_at = time.time() if updated_at is None else updated_at
+        self.tokens: List[Token] = []
+        self.encoded: List[bytes] = []
+        for entry in index.entries():
+            self.tokens.append(entry.token)
+            data = entry.token.to_dict()
+            data["sources"] = entry.sources
+            self.encoded.append(codec.dumps(data).encode("utf-8"))
+        self._orders: Dict[Tuple[str, bool], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def updated_at_iso(self) -> str:
+        return datetime.fromtimestamp(self.updated_at, tz=timezone.utc).isoformat()
+
+    def lookup(self, address: str) -> List[int]:
+        """Positions of the pairs with this pool or base-token address."""
+        return [entry.position for entry in self.index.lookup(address)]
+
+    def order(self, field: str, descending: bool) -> List[int]:
+        """Token positions sorted by `field`, tokens without a value last."""
+        key = (field, descending)
+        order = self._orders.get(key)
+        if order is None:
+            tokens = self.tokens
+            present = [i for i, token in enumerate(tokens) if getattr(token, field) is not None]
+            missing = [i for i, token in enumerate(tokens) if getattr(token, field) is None]
+            present.sort(key=lambda i: getattr(tokens[i], field), reverse=descending)
+            order = self._orders[key] = present + missing
+        return order
+
+    def query(
+        self,
+        predicates: List[TokenPredicate],
+        sort: Optional[str] = None,
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> Tuple[int, List[int]]:
+        """(number of matches, positions of the requested page)."""
+        positions: Iterable[int] = (
+            self.order(sort, descending) if sort else range(len(self.tokens))
+        )
+        if not predicates:
+            positions = list(positions)
+            return len(positions), positions[offset : offset + limit]
+        total = 0
+        page: List[int] = []
+        tokens = self.tokens
+        for position in positions:
+            token = tokens[position]
+            if all(predicate(token) for predicate in predicates):
+                if offset <= total < offset + limit:
+                    page.append(position)
+                total += 1
+        return total, page
+
+class _Subscriber:
+    def __init__(self, max_pending: int) -> None:
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_pending)
+        self.dropped = False
+
+class SnapshotHub:
+    """
+    Holds the latest Snapshot and fans change events out to stream
+    subscribers. The scrape loop calls `publish` once per cycle. A
+    subscriber that falls `max_pending` events behind is disconnected
+    rather than slowing the others down.
+    """
+
+    def __init__(self, codec: Optional[JsonCodec] = None, max_pending: int = 64) -> None:
+        self.codec = codec or get_codec()
+        self.max_pending = max_pending
+        self.snapshot = Snapshot(TokenIndex(), codec=self.codec)
+        self._lock = threading.Lock()
+        self._subscribers: List[_Subscriber] = []
+
+    def publish(self, index: TokenIndex, changes: Iterable[TokenChange] = ()) -> Snapshot:
+        snapshot = Snapshot(index, self.snapshot.version + 1, codec=self.codec)
+        self.snapshot = snapshot
+        event = self.codec.dumps(
+            {
+                "version": snapshot.version,
+                "updatedAt": snapshot.updated_at_iso,
+                "tokens": len(snapshot),
+                "changes": [change.to_dict() for change in changes],
+            }
+        )
+        self._broadcast(
+            f"id: {snapshot.version}\nevent: changes\ndata: {event}\n\n".encode("utf-8")
+        )
+        return snapshot
+
+    def _broadcast(self, message: Optional[bytes]) -> None:
+        with self._lock:
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber.queue.put_nowait(message)
+                except queue.Full:
+                    subscriber.dropped = True
+                    self._subscribers.remove(subscriber)
+                    logger.warning("Dropped a stream subscriber that fell behind.")
+
+    def subscribe(self) -> _Subscriber:
+        subscriber = _Subscriber(self.max_pending)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: _Subscriber) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def close(self) -> None:
+        self._broadcast(None)
+
+def parse_token_query(
+    params: Dict[str, str], default_limit: int, max_limit: int
+) -> Tuple[List[TokenPredicate], Optional[str], bool, int, int]:
+    """
+    Turn /tokens query parameters into (predicates, sort, descending,
+    offset, limit). Filters use the alert rule syntax, with comma-separated
+    lists for chainId and launchpadPlatform.
+    """
+    predicates: List[TokenPredicate] = []
+    for key, value in params.items():
+        if key in _RESERVED_PARAMS:
+            continue
+        condition: Any = value.split(",") if key in ("chainId", "launchpadPlatform") else value
+        try:
+            predicates.append(compile_token_condition(key, condition))
+        except ValueError as exc:
+            raise QueryError(str(exc)) from exc
+
+    sort = params.get("sort") or None
+    if sort is not None and sort not in COLUMN_TYPES:
+        raise QueryError(f"Cannot sort by '{sort}'. Use one of: {', '.join(COLUMN_TYPES)}.")
+    order = params.get("order", "desc").lower()
+    if order not in ("asc", "desc"):
+        raise QueryError("'order' must be asc or desc.")
+    try:
+        offset = max(0, int(params.get("offset", 0)))
+        limit = min(max_limit, max(0, int(params.get("limit", default_limit))))
+    except ValueError as exc:
+        raise QueryError("'offset' and 'limit' must be integers.") from exc
+    return predicates, sort, order == "desc", offset, limit
+
+class _SnapshotHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        server: SnapshotServer = self.server  # type: ignore[assignment]
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/") or "/"
+        snapshot = server.hub.snapshot
+        try:
+            if path == "/tokens":
+                self._send_tokens(snapshot, dict(parse_qsl(parts.query)))
+            elif path.startswith("/tokens/"):
+                address = unquote(path[len("/tokens/") :])
+                self._send_page(snapshot, {}, snapshot.lookup(address))
+            elif path in ("/", "/health"):
+                self._send_json(
+                    200,
+                    {
+                        "version": snapshot.version,
+                        "updatedAt": snapshot.updated_at_iso,
+                        "tokens": len(snapshot),
+                        "subscribers": server.hub.subscribers,
+                    },
+                )
+            elif path == "/stream":
+                self._stream()
+            else:
+                self._send_json(404, {"error": f"Unknown path {parts.path}"})
+        except QueryError as exc:
+            self._send_json(400, {"error": str(exc)})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_tokens(self, snapshot: Snapshot, params: Dict[str, str]) -> None:
+        server: SnapshotServer = self.server  # type: ignore[assignment]
+        predicates, sort, descending, offset, limit = parse_token_query(
+            params, server.default_limit, server.max_limit
+        )
+        total, page = snapshot.query(predicates, sort, descending, offset, limit)
+        self._send_page(snapshot, {"total": total, "offset": offset}, page)
+
+    def _send_page(self, snapshot: Snapshot, meta: Dict[str, Any], positions: List[int]) -> None:
+        server: SnapshotServer = self.server  # type: ignore[assignment]
+        header = server.hub.codec.dumps(
+            {"version": snapshot.version, "updatedAt": snapshot.updated_at_iso, **meta}
+        )
+        # Splice the pre-encoded tokens into the envelope instead of
+        # re-serializing them per request.
+        encoded = snapshot.encoded
+        body = b"".join(
+            (
+                header[:-1].encode("utf-8"),
+                b',"tokens":[',
+                b",".join(encoded[position] for position in positions),
+                b"]}",
+            )
+        )
+        self._send_body(200, body)
+
+    def _send_json(self, status: int, data: Dict[str, Any]) -> None:
+        server: SnapshotServer = self.server  # type: ignore[assignment]
+        self._send_body(status, server.hub.codec.dumps(data).encode("utf-8"))
+
+    def _send_body(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self) -> None:
+        """Server-Sent Events: one `changes` event per scrape cycle."""
+        server: SnapshotServer = self.server  # type: ignore[assignment]
+        subscriber = server.hub.subscribe()
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            snapshot = server.hub.snapshot
+            self.wfile.write(f"retry: 5000\nid: {snapshot.version}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            while not subscriber.dropped:
+                try:
+                    message = subscriber.queue.get(timeout=server.keepalive)
+                except queue.Empty:
+                    message = b": keep-alive\n\n"
+                if message is None:
+                    break
+                self.wfile.write(message)
+                self.wfile.flush()
+        finally:
+            server.hub.unsubscribe(subscriber)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("Snapshot server: " + format, *args)
+
+class SnapshotServer(ThreadingHTTPServer):
+    """
+    Serves the hub's latest snapshot from a daemon thread:
+
+    - `GET /tokens?chainId=solana&minLiquidityUsd=1000&sort=volumeUsd&limit=50`
+    - `GET /tokens/<pool or token address>`
+    - `GET /health`
+    - `GET /stream` (Server-Sent Events, one `changes` event per cycle)
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        hub: SnapshotHub,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        default_limit: int = 100,
+        max_limit: int = 1000,
+        keepalive: float = 15.0,
+    ) -> None:
+        super().__init__((host, port), _SnapshotHandler)
+        self.hub = hub
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.keepalive = keepalive
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="dexscreener-serve", daemon=True
+        )
+
+    @classmethod
+    def from_config(
+        cls, config: Dict[str, Any], hub: SnapshotHub, port: Optional[int] = None
+    ) -> "SnapshotServer":
+        return cls(
+            hub,
+            host=config.get("host", "127.0.0.1"),
+            port=int(port or config.get("port", 8080)),
+            default_limit=int(config.get("defaultLimit", 100)),
+            max_limit=int(config.get("maxLimit", 1000)),
+        )
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self) -> "SnapshotServer":
+        self._thread.start()
+        logger.info("Serving the token snapshot on %s/tokens", self.base_url)
+        return self
+
+    def stop(self) -> None:
+        self.hub.close()
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from extractors.token_utils import derive_chain_id
+from models.token_model import Token
+
+logger = logging.getLogger("dexscreener.extractors.token_index")
+
+TokenKey = Tuple[str, str]
+
+def token_key(token: Token) -> Optional[TokenKey]:
+    """
+    Identity of a pair across queries: (chainId, lowerPoolAddress).
+
+    The chain comes from the pair URL since Token does not export it. Tokens
+    without a pool address cannot be identified and return None.
+    """
+    if not token.lowerPoolAddress:
+        return None
+    return (derive_chain_id(token.pairDetailUrl) or "", token.lowerPoolAddress)
+
+@dataclass
+class IndexEntry:
+    token: Token
+    seen_at: float
+    # Rank in first-seen order, which is also the iteration order.
+    position: int
+    sources: List[str] = field(default_factory=list)
+
+class TokenIndex(Mapping):
+    """
+    In-memory index of unique pairs keyed by (chainId, lowerPoolAddress).
+
+    Tokens are merged as they stream in: a duplicate replaces the stored
+    record if it is at least as fresh, and the query that produced it is
+    appended to the entry's sources. Iteration follows first-seen order, so
+    exports stay stable. `lookup` finds pairs by pool or base-token address
+    in O(1), which is what serve mode's `/tokens/<address>` uses.
+
+    As a Mapping it exposes key -> Token, which is all the snapshot diff
+    needs.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[TokenKey, IndexEntry] = {}
+        self._by_address: Dict[str, List[TokenKey]] = {}
+        self.duplicates = 0
+        self.unkeyed = 0
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token], source: Optional[str] = None) -> "TokenIndex":
+        index = cls()
+        index.add_many(tokens, source=source)
+        return index
+
+    def add(self, token: Token, source: Optional[str] = None, seen_at: Optional[float] = None) -> bool:
+        """
+        Insert or merge a token. Returns True if this is a new pair.
+        """
+        key = token_key(token)
+        if key is None:
+            self.unkeyed += 1
+            return False
+
+        seen_at = time.time() if seen_at is None else seen_at
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = IndexEntry(
+                token=token,
+                seen_at=seen_at,
+                position=len(self._entries),
+                sources=[source] if source else [],
+            )
+            for address in {key[1], (token.address or "").lower()}:
+                if address:
+                    self._by_address.setdefault(address, []).append(key)
+            return True
+
+        self.duplicates += 1
+        if seen_at >= entry.seen_at:
+            entry.token = token
+            entry.seen_at = seen_at
+        if source and source not in entry.sources:
+            entry.sources.append(source)
+        return False
+
+    def add_many(
+        self, tokens: Iterable[Token], source: Optional[str] = None, seen_at: Optional[float] = None
+    ) -> int:
+        """Merge many tokens sharing one source and timestamp; returns the number of new pairs."""
+        seen_at = time.time() if seen_at is None else seen_at
+        return sum(1 for token in tokens if self.add(token, source=source, seen_at=seen_at))
+
+    def __getitem__(self, key: TokenKey) -> Token:
+        return self._entries[key].token
+
+    def __iter__(self) -> Iterator[TokenKey]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> Iterator[IndexEntry]:
+        """Entries in first-seen order."""
+        return iter(self._entries.values())
+
+    def tokens(self) -> Iterator[Token]:
+        for entry in self._entries.values():
+            yield entry.token
+
+    def lookup(self, address: str) -> List[IndexEntry]:
+        """Entries whose pool or base-token address is `address`, in first-seen order."""
+        return [self._entries[key] for key in self._by_address.get(address.lower(), [])]
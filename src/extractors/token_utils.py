@@ -1,4 +1,4 @@
-thonfrom __future__ import annotations
+from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
@@ -7,38 +7,95 @@ from urllib.parse import urlparse
 
 logger = logging.getLogger("dexscreener.extractors.token_utils")
 
-def derive_lower_pool_address(pair_detail_url: Optional[str]) -> Optional[str]:
+# URLs DexScreener returns for pairs; these take a fast path that avoids urlparse.
+_PAIR_URL_PREFIXES = ("https://dexscreener.com/", "http://dexscreener.com/")
+_URL_SPECIAL_CHARS = ("?", "#", ";")
+
+def derive_pool_address(pair_detail_url: Optional[str]) -> Optional[str]:
     """
-    Extract the pool address from a DexScreener pair URL and normalize to lowercase.
+    Extract the pool address from a DexScreener pair URL, keeping its case
+    (base58 addresses such as Solana's are case-sensitive).
 
     Example:
-        https://dexscreener.com/solana/29jupdw7... -> "29jupdw7..."
+        https://dexscreener.com/solana/29JUPDW7... -> "29JUPDW7..."
     """
     if not pair_detail_url:
         return None
 
+    if pair_detail_url.startswith(_PAIR_URL_PREFIXES) and not any(
+        ch in pair_detail_url for ch in _URL_SPECIAL_CHARS
+    ):
+        path = pair_detail_url.split("/", 3)[3].rstrip("/")
+        if not path:
+            return None
+        return path.rsplit("/", 1)[-1]
+
     try:
         parsed = urlparse(pair_detail_url)
         segments = [seg for seg in parsed.path.split("/") if seg]
         if not segments:
             return None
-        return segments[-1].lower()
+        return segments[-1]
     except Exception as exc:
-        logger.debug("Failed to derive lower pool address from URL '%s': %s", pair_detail_url, exc)
+        logger.debug("Failed to derive pool address from URL '%s': %s", pair_detail_url, exc)
         return None
 
-def compute_age_hours_from_timestamp(created_ms: Optional[int]) -> Optional[float]:
+def derive_lower_pool_address(pair_detail_url: Optional[str]) -> Optional[str]:
+    """
+    Extract the pool address from a DexScreener pair URL and normalize to lowercase.
+
+    Example:
+        https://dexscreener.com/solana/29jupdw7... -> "29jupdw7..."
+    """
+    address = derive_pool_address(pair_detail_url)
+    return address.lower() if address else None
+
+def derive_chain_id(pair_detail_url: Optional[str]) -> Optional[str]:
+    """
+    Extract the chain id from a DexScreener pair URL.
+
+    Example:
+        https://dexscreener.com/solana/29jupdw7... -> "solana"
+    """
+    if not pair_detail_url:
+        return None
+
+    if pair_detail_url.startswith(_PAIR_URL_PREFIXES) and not any(
+        ch in pair_detail_url for ch in _URL_SPECIAL_CHARS
+    ):
+        segments = [seg for seg in pair_detail_url.split("/", 3)[3].split("/") if seg]
+    else:
+        try:
+            segments = [seg for seg in urlparse(pair_detail_url).path.split("/") if seg]
+        except Exception as exc:
+            logger.debug("Failed to derive chain id from URL '%s': %s", pair_detail_url, exc)
+            return None
+    if len(segments) < 2:
+        return None
+    return segments[-2].lower()
+
+def compute_age_hours_from_timestamp(
+    created_ms: Optional[int], now: Optional[float] = None
+) -> Optional[float]:
     """
     Convert a millisecond timestamp (UTC) into age in hours as a float.
 
-    DexScreener provides `pairCreatedAt` timestamps in milliseconds.
+    DexScreener provides `pairCreatedAt` timestamps in milliseconds. Pass
+    `now` (epoch seconds) to share one reference time across a batch and
+    skip the datetime round-trip.
     """
     if not created_ms:
         return None
+    if now is not None and type(created_ms) in (int, float):
+        return round((now - created_ms / 1000.0) / 3600.0, 2)
     try:
         created_dt = datetime.fromtimestamp(created_ms / 1000.0, tz=timezone.utc)
-        now = datetime.now(tz=timezone.utc)
-        delta = now - created_dt
+        now_dt = (
+            datetime.fromtimestamp(now, tz=timezone.utc)
+            if now is not None
+            else datetime.now(tz=timezone.utc)
+        )
+        delta = now_dt - created_dt
         return round(delta.total_seconds() / 3600.0, 2)
     except Exception as exc:
         logger.debug(
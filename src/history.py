@@ -0,0 +1,138 @@
+import argparse
+import json
+import logging
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List
+
+from settings import ROOT_DIR, SRC_DIR, configure_logging, load_settings
+from outputs.snapshot_store import SnapshotStore, StoredSnapshot
+
+logger = logging.getLogger("dexscreener.history")
+
+_RELATIVE_TIME = re.compile(r"^(\d+(?:\.\d+)?)([smhdw])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+def parse_time(value: str, now: float | None = None) -> float:
+    """
+    Parse a point in time given as a unix timestamp, an ISO-8601 string, or
+    a relative age such as `90m`, `3h` or `7d` (meaning that long ago).
+    """
+    now = time.time() if now is None else now
+    value = value.strip()
+    match = _RELATIVE_TIME.match(value)
+    if match:
+        return now - float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"Cannot parse time {value!r}; use a unix timestamp, ISO-8601 or e.g. 3h / 7d."
+        ) from exc
+
+def print_snapshots(snapshots: List[StoredSnapshot], fields: List[str] | None) -> None:
+    for snapshot in snapshots:
+        data: Any = snapshot.to_dict()
+        if fields:
+            keep = ["chainId", "lowerPoolAddress", "timestamp"] + fields
+            data = {key: data.get(key) for key in keep}
+        sys.stdout.write(json.dumps(data, ensure_ascii=False))
+        sys.stdout.write("\n")
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Query the token snapshot history recorded by the scraper. "
+        "Results are printed as JSON Lines."
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=None,
+        help="Path to the history database. Defaults to history.path from the settings file.",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default="WARNING",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Log verbosity.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    latest = commands.add_parser("latest", help="Most recent snapshot of every pool.")
+    latest.add_argument("--pool", help="Only this pool address.")
+    latest.add_argument("--chain", help="Only pools on this chain.")
+    latest.add_argument("--limit", type=int, default=None, help="Maximum rows to print.")
+
+    history = commands.add_parser("range", help="Snapshots of one pool over a time range.")
+    history.add_argument("pool", help="Pool address (lowerPoolAddress).")
+    history.add_argument("--chain", help="Chain of the pool, if the address is ambiguous.")
+    history.add_argument("--since", type=parse_time, default=None, help="Start time, e.g. 24h.")
+    history.add_argument("--until", type=parse_time, default=None, help="End time (default: now).")
+    history.add_argument("--limit", type=int, default=None, help="Maximum rows to print.")
+
+    at = commands.add_parser("at", help="Last snapshot at or before a point in time.")
+    at.add_argument("time", type=parse_time, help="Point in time, e.g. 3h or 2024-05-01T12:00.")
+    at.add_argument("--pool", help="Only this pool address.")
+    at.add_argument("--chain", help="Only pools on this chain.")
+
+    for sub in (latest, history, at):
+        sub.add_argument(
+            "--fields",
+            type=lambda value: [f.strip() for f in value.split(",") if f.strip()],
+            default=None,
+            help="Comma-separated token fields to print (default: all).",
+        )
+
+    commands.add_parser("compact", help="Apply retention and compaction now.")
+    commands.add_parser("stats", help="Show row counts and time span.")
+    return parser
+
+def run_history(args: argparse.Namespace) -> int:
+    configure_logging(args.log_level)
+    config = load_settings(SRC_DIR / "config" / "settings.example.json").get("history", {})
+    if args.db:
+        path = Path(args.db).resolve()
+    else:
+        path = (ROOT_DIR / config.get("path", "data/history.sqlite3")).resolve()
+    if not path.exists():
+        logger.error("History database %s does not exist yet.", path)
+        return 1
+
+    store = SnapshotStore(
+        path,
+        retention_days=config.get("retentionDays"),
+        compact_after_hours=config.get("compactAfterHours"),
+        compact_bucket_minutes=config.get("compactBucketMinutes", 60),
+    )
+    try:
+        if args.command == "latest":
+            print_snapshots(store.latest(args.chain, args.pool, args.limit), args.fields)
+        elif args.command == "range":
+            snapshots = store.history(args.pool, args.chain, args.since, args.until, args.limit)
+            print_snapshots(snapshots, args.fields)
+        elif args.command == "at":
+            print_snapshots(store.at(args.time, args.pool, args.chain), args.fields)
+        elif args.command == "compact":
+            removed = store.maintain()
+            print(json.dumps({"removed": removed}))
+        elif args.command == "stats":
+            print(json.dumps(store.stats()))
+    finally:
+        store.close()
+    return 0
+
+def main() -> None:
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    sys.exit(run_history(args))
+
+if __name__ == "__main__":
+    main()
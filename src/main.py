@@ -1,75 +1,13 @@
-thonimport argparse
-import json
+import argparse
 import logging
 import sys
-from pathlib import Path
-from typing import List, Dict, Any
 
-# Ensure project root and src are on sys.path so we can import models and extractors
-CURRENT_FILE = Path(__file__).resolve()
-SRC_DIR = CURRENT_FILE.parent
-ROOT_DIR = SRC_DIR.parent
-
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
-if str(SRC_DIR) not in sys.path:
-    sys.path.insert(0, str(SRC_DIR))
-
-from extractors.dexscreener_parser import DexScreenerClient  # noqa: E402
-from models.token_model import Token  # noqa: E402
-from outputs.json_exporter import export_tokens_to_json  # noqa: E402
-from outputs.csv_exporter import export_tokens_to_csv  # noqa: E402
+# Importing settings also puts the project root and src on sys.path.
+from settings import ROOT_DIR
+from outputs.formats import EXPORT_FORMATS, parse_formats
 
 logger = logging.getLogger("dexscreener.main")
 
-def load_settings(settings_path: Path) -> Dict[str, Any]:
-    if not settings_path.exists():
-        logger.warning("Settings file %s not found, using hardcoded defaults.", settings_path)
-        return {
-            "dexscreener": {
-                "baseUrl": "https://api.dexscreener.com/latest/dex",
-                "timeoutSeconds": 10,
-            },
-            "pagination": {
-                "maxPages": 1,
-                "pageSize": 50,
-            },
-            "output": {
-                "directory": "data",
-                "jsonFilename": "tokens.json",
-                "csvFilename": "tokens.csv",
-            },
-        }
-
-    with settings_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-def load_input_targets(input_path: Path) -> List[Dict[str, Any]]:
-    if not input_path.exists():
-        logger.error("Input targets file %s does not exist.", input_path)
-        raise FileNotFoundError(f"Input targets file not found: {input_path}")
-
-    with input_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    if isinstance(data, dict):
-        # Allow a single object
-        return [data]
-    if not isinstance(data, list):
-        raise ValueError("Input file must contain a list of targets or a single target object.")
-    return data
-
-def resolve_output_paths(root_dir: Path, settings: Dict[str, Any], override_output_dir: str | None):
-    output_cfg = settings.get("output", {})
-    directory = override_output_dir or output_cfg.get("directory", "data")
-    json_filename = output_cfg.get("jsonFilename", "tokens.json")
-    csv_filename = output_cfg.get("csvFilename", "tokens.csv")
-
-    out_dir = (root_dir / directory).resolve()
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    return out_dir / json_filename, out_dir / csv_filename
-
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="DexScreener Tokens Scraper - collect live token data from DexScreener."
@@ -86,11 +24,125 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=None,
         help="Directory where JSON/CSV results will be written. Overrides settings file.",
     )
+    parser.add_argument(
+        "--format",
+        action="append",
+        default=None,
+        metavar="FORMAT",
+        help=f"Output format(s) to export, comma-separated or repeated: "
+        f"{', '.join(EXPORT_FORMATS)}. Overrides output.formats in the settings file.",
+    )
     parser.add_argument(
         "--max-pages",
         type=int,
         default=None,
-        help="Optional override for maximum pages to fetch per target.",
+        help="Optional override for maximum pages (search requests, including expanded "
+        "sub-queries) to fetch per target.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of targets to fetch in parallel. Overrides settings file (default: 1, serial).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Shard targets across this many worker processes, each with its own client "
+        "and share of the rate limit. Overrides settings file; not used in watch mode.",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=None,
+        metavar="INTERVAL",
+        help="Keep running, re-scraping every INTERVAL seconds and appending only "
+        "changes to the change stream file instead of rewriting JSON/CSV.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Watch mode that also serves the latest deduplicated snapshot over HTTP "
+        "(/tokens query API, /stream change events). The interval is --watch or "
+        "serve.intervalSeconds.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Watch mode that refreshes each target on its own interval, from seconds for "
+        "volatile, high-volume or new pairs to minutes for stale ones, within the "
+        "scheduler.requestsPerMinute budget. Combine with --serve to serve the snapshot.",
+    )
+    parser.add_argument(
+        "--serve-port",
+        type=int,
+        default=None,
+        help="Port for --serve. Overrides settings file.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Cache HTTP responses on disk in this directory, even if cache.enabled is "
+        "off. Overrides settings file.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the HTTP response cache for this run.",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not record this run's tokens in the snapshot history store.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="In watch mode, serve Prometheus metrics on this port. Overrides settings file.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run with cProfile and tracemalloc; reports are written "
+        "to the output directory.",
+    )
+    parser.add_argument(
+        "--run-id",
+        type=str,
+        default=None,
+        help="Checkpoint this run under this name, even if checkpoint.enabled is off. "
+        "Checkpointed runs are otherwise named by a timestamp.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the checkpointed run --run-id (default: the latest unfinished run "
+        "over the same targets), skipping targets it already fetched.",
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not checkpoint finished targets for this run.",
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="FIXTURE",
+        help="Append every API response of this run to a replayable fixture file "
+        "(JSON Lines). Bypasses the response cache and runs in one process.",
+    )
+    fixtures.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="FIXTURE",
+        help="Answer API requests from a fixture recorded with --record instead of "
+        "the network, without rate limiting.",
     )
     parser.add_argument(
         "--log-level",
@@ -101,87 +153,20 @@ def build_arg_parser() -> argparse.ArgumentParser:
     )
     return parser
 
-def configure_logging(level: str) -> None:
-    logging.basicConfig(
-        level=getattr(logging, level.upper(), logging.INFO),
-        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
-    )
-
-def run_scraper(args: argparse.Namespace) -> int:
-    configure_logging(args.log_level)
-    logger.info("Starting DexScreener Tokens Scraper.")
-
-    settings_path = SRC_DIR / "config" / "settings.example.json"
-    settings = load_settings(settings_path)
-
-    base_url = settings.get("dexscreener", {}).get(
-        "baseUrl", "https://api.dexscreener.com/latest/dex"
-    )
-    timeout = settings.get("dexscreener", {}).get("timeoutSeconds", 10)
-    default_max_pages = settings.get("pagination", {}).get("maxPages", 1)
-    page_size = settings.get("pagination", {}).get("pageSize", 50)
-
-    input_path = Path(args.input).resolve()
-    try:
-        targets = load_input_targets(input_path)
-    except Exception as exc:
-        logger.exception("Failed to load input targets: %s", exc)
-        return 1
-
-    json_path, csv_path = resolve_output_paths(ROOT_DIR, settings, args.output_dir)
-
-    client = DexScreenerClient(base_url=base_url, timeout=timeout)
-
-    all_tokens: List[Token] = []
-
-    for idx, target in enumerate(targets, start=1):
-        query = target.get("query")
-        if not query:
-            logger.warning("Target #%d has no 'query' field, skipping: %s", idx, target)
-            continue
-
-        max_pages = args.max_pages or target.get("maxPages", default_max_pages)
-        logger.info("Fetching tokens for query '%s' (max_pages=%s)...", query, max_pages)
-
-        try:
-            tokens_for_query = client.fetch_tokens_for_query(
-                query=query,
-                max_pages=max_pages,
-                page_size=page_size,
-            )
-        except Exception as exc:
-            logger.exception("Failed to fetch tokens for query '%s': %s", query, exc)
-            continue
-
-        logger.info("Retrieved %d tokens for query '%s'.", len(tokens_for_query), query)
-        all_tokens.extend(tokens_for_query)
-
-    if not all_tokens:
-        logger.warning("No tokens were collected; nothing to export.")
-        return 0
-
-    try:
-        export_tokens_to_json(all_tokens, json_path)
-        logger.info("Exported %d tokens to JSON: %s", len(all_tokens), json_path)
-    except Exception as exc:
-        logger.exception("Failed to export JSON: %s", exc)
-        return 1
-
-    try:
-        export_tokens_to_csv(all_tokens, csv_path)
-        logger.info("Exported %d tokens to CSV: %s", len(all_tokens), csv_path)
-    except Exception as exc:
-        logger.exception("Failed to export CSV: %s", exc)
-        return 1
-
-    logger.info("Scraper completed successfully.")
-    return 0
-
 def main() -> None:
     parser = build_arg_parser()
     args = parser.parse_args()
-    exit_code = run_scraper(args)
-    sys.exit(exit_code)
+    try:
+        args.format = parse_formats(args.format) if args.format else None
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    # The scrape pipeline (requests, the API client, exporters) is only
+    # imported once the arguments are known to be valid, so --help and usage
+    # errors return without paying for it.
+    from scraper import run_scraper
+
+    sys.exit(run_scraper(args))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,167 @@
+import logging
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from extractors.alert_rules import Alert, AlertEngine, AlertRuleError, AlertSink, compile_rules
+from extractors.json_codec import JsonCodec, get_codec
+
+logger = logging.getLogger("dexscreener.outputs.alert_sinks")
+
+class StdoutAlertSink:
+    """Prints each alert as a readable line, or as JSON with `json: true`."""
+
+    def __init__(self, as_json: bool = False, codec: Optional[JsonCodec] = None) -> None:
+        self.as_json = as_json
+        self.codec = codec or get_codec()
+
+    def emit(self, alert: Alert) -> None:
+        line = self.codec.dumps(alert.to_dict()) if self.as_json else alert.text
+        print(line, file=sys.stdout, flush=True)
+
+    def close(self) -> None:
+        pass
+
+class FileAlertSink:
+    """
+    Appends alerts to a JSON Lines file, one alert per line, like the
+    change stream. The file stays open for the run and is flushed per alert
+    so it can be tailed.
+    """
+
+    def __init__(self, output_path: Path, codec: Optional[JsonCodec] = None) -> None:
+        self.output_path = Path(output_path)
+        self.codec = codec or get_codec()
+        self._file = None
+
+    def emit(self, alert: Alert) -> None:
+        if self._file is None:
+            self.output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.output_path.open("a", encoding="utf-8")
+        self._file.write(self.codec.dumps(alert.to_dict()))
+        self._file.write("\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class WebhookAlertSink:
+    """
+    POSTs each alert as JSON to a URL from a background thread, so a slow
+    endpoint never stalls the scrape. Delivery is best effort: failures are
+    logged, and alerts beyond `max_pending` queued ones are dropped.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 5.0,
+        headers: Optional[Dict[str, str]] = None,
+        max_pending: int = 1000,
+        codec: Optional[JsonCodec] = None,
+    ) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.codec = codec or get_codec()
+        self.sent = 0
+        self.failed = 0
+        self._queue: "queue.Queue[Optional[Alert]]" = queue.Queue(maxsize=max_pending)
+        self._session = requests.Session()
+        self._thread = threading.Thread(
+            target=self._run, name="dexscreener-alert-webhook", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, alert: Alert) -> None:
+        try:
+            self._queue.put_nowait(alert)
+        except queue.Full:
+            self.failed += 1
+            logger.warning("Alert webhook backlog full; dropped alert '%s'.", alert.rule)
+
+    def _run(self) -> None:
+        while True:
+            alert = self._queue.get()
+            if alert is None:
+                return
+            try:
+                response = self._session.post(
+                    self.url,
+                    data=self.codec.dumps(alert.to_dict()).encode("utf-8"),
+                    headers=self.headers,
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+                self.sent += 1
+            except requests.RequestException as exc:
+                self.failed += 1
+                logger.warning("Alert webhook %s failed: %s", self.url, exc)
+
+    def close(self) -> None:
+        """Deliver what is queued, waiting at most one request timeout per alert."""
+        pending = self._queue.qsize()
+        self._queue.put(None)
+        self._thread.join(timeout=self.timeout * (pending + 1))
+        self._session.close()
+        if self.failed:
+            logger.warning("%d alerts could not be delivered to %s.", self.failed, self.url)
+
+def build_alert_sinks(
+    configs: List[Dict[str, Any]], root_dir: Path, codec: Optional[JsonCodec] = None
+) -> List[AlertSink]:
+    """
+    Build sinks from the `alerts.sinks` settings list:
+
+        [{"type": "stdout"},
+         {"type": "file", "path": "data/alerts.jsonl"},
+         {"type": "webhook", "url": "https://...", "timeoutSeconds": 5}]
+
+    Relative file paths are resolved against `root_dir`.
+    """
+    sinks: List[AlertSink] = []
+    for config in configs or [{"type": "stdout"}]:
+        kind = str(config.get("type", "")).lower()
+        if kind == "stdout":
+            sinks.append(StdoutAlertSink(as_json=bool(config.get("json", False)), codec=codec))
+        elif kind == "file":
+            path = Path(config.get("path") or "data/alerts.jsonl")
+            sinks.append(FileAlertSink(path if path.is_absolute() else root_dir / path, codec))
+        elif kind == "webhook":
+            if not config.get("url"):
+                raise AlertRuleError("Webhook alert sinks need a 'url'.")
+            sinks.append(
+                WebhookAlertSink(
+                    config["url"],
+                    timeout=float(config.get("timeoutSeconds", 5)),
+                    headers=config.get("headers"),
+                    codec=codec,
+                )
+            )
+        else:
+            raise AlertRuleError(
+                f"Unknown alert sink type '{config.get('type')}'. Use stdout, file or webhook."
+            )
+    return sinks
+
+def build_alert_engine(
+    config: Dict[str, Any], root_dir: Path, codec: Optional[JsonCodec] = None
+) -> Optional[AlertEngine]:
+    """
+    Build the alert engine from the `alerts` settings block.
+
+    Returns None when alerts are disabled or no rules are configured.
+    Raises AlertRuleError for rules or sinks that do not compile.
+    """
+    if not config.get("enabled", False) or not config.get("rules"):
+        return None
+    rules = compile_rules(config["rules"])
+    engine = AlertEngine(rules, build_alert_sinks(config.get("sinks") or [], root_dir, codec))
+    logger.info("Alert rules active: %s", ", ".join(rule.name for rule in rules))
+    return engine
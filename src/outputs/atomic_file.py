@@ -0,0 +1,112 @@
+import logging
+import os
+import stat
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Iterable, Optional
+
+logger = logging.getLogger("dexscreener.outputs.atomic_file")
+
+def _umask() -> int:
+    # os.umask can only be read by setting it; done once, at import.
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+# Mode a plain open(path, "w") would give a new file. mkstemp creates its
+# temp files as 0600, which os.replace would carry over to the output.
+DEFAULT_FILE_MODE = 0o666 & ~_umask()
+
+def replacement_mode(path: Path) -> int:
+    """Permissions for a file about to replace `path`: the existing file's, else the default."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return DEFAULT_FILE_MODE
+
+class AtomicFileWriter(ABC):
+    """
+    Base class for exporters that stream into a temporary file and atomically
+    rename it over the destination once complete.
+
+    Readers of `output_path` therefore only ever see the previous complete
+    file or the new complete file, never a partially written one. Used as a
+    context manager, the file is committed on success and discarded if the
+    block raises.
+    """
+
+    format_name = "file"
+    newline: Optional[str] = None
+    binary: bool = False
+
+    def __init__(self, output_path: Path) -> None:
+        self.output_path = Path(output_path)
+        self.count = 0
+        self._file: Optional[IO[Any]] = None
+        self._tmp_path: Optional[Path] = None
+
+    def open(self) -> None:
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=str(self.output_path.parent),
+            prefix=f".{self.output_path.name}.",
+            suffix=".tmp",
+        )
+        self._tmp_path = Path(tmp_name)
+        if self.binary:
+            self._file = os.fdopen(fd, "wb")
+        else:
+            self._file = os.fdopen(fd, "w", encoding="utf-8", newline=self.newline)
+        self._on_open(self._file)
+
+    def _on_open(self, f: IO[Any]) -> None:
+        """Hook for writing a header once the temp file is open."""
+
+    def _on_close(self, f: IO[Any]) -> None:
+        """Hook for writing a trailer before the temp file is committed."""
+
+    @abstractmethod
+    def write(self, token: Any) -> None:
+        """Write one item to the temp file."""
+
+    def write_many(self, tokens: Iterable[Any]) -> None:
+        for token in tokens:
+            self.write(token)
+
+    def commit(self) -> None:
+        """Finish the file and atomically move it into place."""
+        if self._file is None:
+            self.open()
+        assert self._file is not None and self._tmp_path is not None
+        self._on_close(self._file)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        os.chmod(self._tmp_path, replacement_mode(self.output_path))
+        os.replace(self._tmp_path, self.output_path)
+        self._tmp_path = None
+
+    def abort(self) -> None:
+        """Discard the temp file, leaving any existing output untouched."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp_path is not None:
+            try:
+                self._tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._tmp_path = None
+
+    def __enter__(self) -> "AtomicFileWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            logger.debug("Discarding partial output %s after error: %s", self.output_path, exc)
+            self.abort()
@@ -0,0 +1,31 @@
+import logging
+from pathlib import Path
+from typing import Iterable, Optional
+
+from extractors.json_codec import JsonCodec, get_codec
+from extractors.snapshot_diff import TokenChange
+
+logger = logging.getLogger("dexscreener.outputs.change_stream")
+
+def append_changes_to_jsonl(
+    changes: Iterable[TokenChange], output_path: Path, codec: Optional[JsonCodec] = None
+) -> int:
+    """
+    Append snapshot changes to a JSON Lines file, one change per line.
+
+    The file is only ever appended to, so consumers can tail it and resume
+    from the last line they processed. Returns the number of lines written.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    codec = codec or get_codec()
+
+    written = 0
+    with output_path.open("a", encoding="utf-8") as f:
+        for change in changes:
+            f.write(codec.dumps(change.to_dict()))
+            f.write("\n")
+            written += 1
+        f.flush()
+
+    logger.debug("Appended %d changes to %s", written, output_path)
+    return written
@@ -1,31 +1,49 @@
-thonimport csv
+import csv
 import logging
 from pathlib import Path
-from typing import Iterable, List
+from typing import IO, Iterable
 
-from models.token_model import Token
+from models.token_model import EXPORT_FIELDS, Token
+from outputs.atomic_file import AtomicFileWriter
 
 logger = logging.getLogger("dexscreener.outputs.csv_exporter")
 
+class CsvTokenWriter(AtomicFileWriter):
+    """
+    Stream Token models into a CSV file row by row.
+
+    Column names match the JSON field names defined in Token.to_dict().
+    """
+
+    format_name = "CSV"
+    newline = ""
+
+    def _on_open(self, f: IO[str]) -> None:
+        self._writer = csv.DictWriter(f, fieldnames=list(EXPORT_FIELDS))
+        self._writer.writeheader()
+
+    def write(self, token: Token) -> None:
+        self._writer.writerow(token.to_dict())
+        self.count += 1
+
 def export_tokens_to_csv(tokens: Iterable[Token], output_path: Path) -> None:
     """
     Serialize a collection of Token models to a CSV file.
 
     Column names match the JSON field names defined in Token.to_dict().
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    tokens_list: List[Token] = list(tokens)
-
-    if not tokens_list:
+    writer = CsvTokenWriter(output_path)
+    writer.open()
+    try:
+        writer.write_many(tokens)
+    except BaseException:
+        writer.abort()
+        raise
+
+    if not writer.count:
+        writer.abort()
         logger.warning("No tokens provided for CSV export. Skipping file creation.")
         return
 
-    fieldnames = list(tokens_list[0].to_dict().keys())
-
-    with output_path.open("w", encoding="utf-8", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for token in tokens_list:
-            writer.writerow(token.to_dict())
-
-    logger.debug("Wrote CSV file with %d tokens to %s", len(tokens_list), output_path)
\ No newline at end of file
+    writer.commit()
+    logger.debug("Wrote CSV file with %d tokens to %s", writer.count, output_path)
@@ -0,0 +1,54 @@
+import importlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Output format -> (module, writer class). Writer modules are imported only
+# when their format is selected, so e.g. a CSV-only run never loads the JSON
+# writer or the pyarrow glue.
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "json": ("outputs.json_exporter", "JsonTokenWriter"),
+    "csv": ("outputs.csv_exporter", "CsvTokenWriter"),
+    "parquet": ("outputs.parquet_exporter", "ParquetTokenWriter"),
+    "arrow": ("outputs.parquet_exporter", "ArrowTokenWriter"),
+}
+
+def parse_formats(values: Union[str, Iterable[str]]) -> List[str]:
+    """
+    Normalize format names given as a comma-separated string or a list of
+    them, e.g. `"json,csv"` or `["json,csv", "parquet"]`, keeping their order
+    and dropping repeats.
+    """
+    if isinstance(values, str):
+        values = [values]
+    formats: List[str] = []
+    for value in values:
+        for name in str(value).split(","):
+            name = name.strip().lower()
+            if not name:
+                continue
+            if name not in EXPORT_FORMATS:
+                raise ValueError(
+                    f"Unknown output format '{name}'. Use one of: {', '.join(EXPORT_FORMATS)}."
+                )
+            if name not in formats:
+                formats.append(name)
+    return formats
+
+def selected_formats(output_cfg: Dict[str, Any], override: Optional[List[str]] = None) -> List[str]:
+    """
+    Formats to export: `override` (from --format), else `output.formats`,
+    else JSON and CSV plus whichever columnar filenames are configured.
+    """
+    if override:
+        return parse_formats(override)
+    if output_cfg.get("formats"):
+        return parse_formats(output_cfg["formats"])
+    formats = ["json", "csv"]
+    if output_cfg.get("parquetFilename"):
+        formats.append("parquet")
+    if output_cfg.get("arrowFilename"):
+        formats.append("arrow")
+    return formats
+
+def writer_class(name: str) -> Any:
+    module, attr = EXPORT_FORMATS[name]
+    return getattr(importlib.import_module(module), attr)
@@ -1,22 +1,66 @@
-thonimport json
 import logging
 from pathlib import Path
-from typing import Iterable, List
+from typing import IO, Iterable, Optional
 
+from extractors.json_codec import JsonCodec, get_codec
 from models.token_model import Token
+from outputs.atomic_file import AtomicFileWriter
 
 logger = logging.getLogger("dexscreener.outputs.json_exporter")
 
-def export_tokens_to_json(tokens: Iterable[Token], output_path: Path) -> None:
+class JsonTokenWriter(AtomicFileWriter):
     """
-    Serialize a collection of Token models to a JSON file using the field names
-    described in the project README.
+    Stream Token models into a JSON file one at a time.
+
+    By default the output is a JSON array laid out like
+    `json.dump(..., indent=2)` (byte-for-byte with the stdlib `codec`);
+    with `lines=True` it is JSON Lines instead. Only the token currently
+    being written is held in memory.
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    serializable: List[dict] = [t.to_dict() for t in tokens]
+    format_name = "JSON"
+
+    def __init__(
+        self, output_path: Path, lines: bool = False, codec: Optional[JsonCodec] = None
+    ) -> None:
+        super().__init__(output_path)
+        self.lines = lines
+        self.codec = codec or get_codec()
+
+    def _on_open(self, f: IO[str]) -> None:
+        if not self.lines:
+            f.write("[")
+
+    def write(self, token: Token) -> None:
+        assert self._file is not None, "writer is not open"
+        data = token.to_dict()
+        if self.lines:
+            self._file.write(self.codec.dumps(data))
+            self._file.write("\n")
+        else:
+            body = self.codec.dumps_indented(data).replace("\n", "\n  ")
+            self._file.write(",\n  " if self.count else "\n  ")
+            self._file.write(body)
+        self.count += 1
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(serializable, f, indent=2, ensure_ascii=False)
+    def _on_close(self, f: IO[str]) -> None:
+        if not self.lines:
+            f.write("\n]" if self.count else "]")
+
+def export_tokens_to_json(
+    tokens: Iterable[Token],
+    output_path: Path,
+    lines: bool = False,
+    codec: Optional[JsonCodec] = None,
+) -> None:
+    """
+    Serialize a collection of Token models to a JSON file using the field names
+    described in the project README.
+
+    `tokens` may be any iterable, including a generator; it is consumed once
+    and streamed to disk rather than materialized.
+    """
+    with JsonTokenWriter(output_path, lines=lines, codec=codec) as writer:
+        writer.write_many(tokens)
 
-    logger.debug("Wrote JSON file with %d tokens to %s", len(serializable), output_path)
\ No newline at end of file
+    logger.debug("Wrote JSON file with %d tokens to %s", writer.count, output_path)
@@ -0,0 +1,125 @@
+import logging
+from abc import abstractmethod
+from pathlib import Path
+from typing import IO, Any
+
+from models.token_batch import COLUMN_TYPES, TokenBatch
+from models.token_model import Token
+from outputs.atomic_file import AtomicFileWriter
+
+logger = logging.getLogger("dexscreener.outputs.parquet_exporter")
+
+DEFAULT_ROW_GROUP_SIZE = 65_536
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            "Parquet/Arrow export requires the optional 'pyarrow' package "
+            "(pip install pyarrow)."
+        ) from exc
+    return pyarrow
+
+def token_schema() -> Any:
+    """Arrow schema for exported Token fields, derived from Token's annotations."""
+    pa = _require_pyarrow()
+    arrow_types = {str: pa.string(), int: pa.int64(), float: pa.float64()}
+    return pa.schema([(name, arrow_types[py_type]) for name, py_type in COLUMN_TYPES.items()])
+
+def batch_to_record_batch(batch: TokenBatch, schema: Any = None) -> Any:
+    pa = _require_pyarrow()
+    schema = schema or token_schema()
+    # from_pandas: a NaN in a float column is stored as null, like the JSON export.
+    arrays = [pa.array(batch.columns[f.name], type=f.type, from_pandas=True) for f in schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+class _ColumnarTokenWriter(AtomicFileWriter):
+    """
+    Shared buffering for columnar writers: tokens accumulate in a TokenBatch
+    and are flushed as one record batch every `row_group_size` rows.
+    """
+
+    binary = True
+
+    def __init__(self, output_path: Path, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> None:
+        super().__init__(output_path)
+        self.row_group_size = max(1, int(row_group_size))
+        self.schema = token_schema()
+        self._batch = TokenBatch()
+
+    def write(self, token: Token) -> None:
+        self._batch.append_token(token)
+        self.count += 1
+        if len(self._batch) >= self.row_group_size:
+            self.flush()
+
+    def write_batch(self, batch: TokenBatch) -> None:
+        """Write an already-columnar batch (e.g. built from pair payloads)."""
+        self.flush()
+        if len(batch):
+            self._write_record_batch(batch_to_record_batch(batch, self.schema))
+            self.count += len(batch)
+
+    def flush(self) -> None:
+        if len(self._batch):
+            self._write_record_batch(batch_to_record_batch(self._batch, self.schema))
+            self._batch.clear()
+
+    @abstractmethod
+    def _write_record_batch(self, record_batch: Any) -> None:
+        """Append one Arrow RecordBatch to the open file."""
+
+class ParquetTokenWriter(_ColumnarTokenWriter):
+    """Stream tokens into a compressed Parquet file, one row group per flush."""
+
+    format_name = "Parquet"
+
+    def __init__(
+        self,
+        output_path: Path,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "zstd",
+    ) -> None:
+        super().__init__(output_path, row_group_size=row_group_size)
+        self.compression = compression
+
+    def _on_open(self, f: IO[Any]) -> None:
+        import pyarrow.parquet as pq
+
+        self._writer = pq.ParquetWriter(f, self.schema, compression=self.compression)
+
+    def _write_record_batch(self, record_batch: Any) -> None:
+        self._writer.write_batch(record_batch)
+
+    def _on_close(self, f: IO[Any]) -> None:
+        self.flush()
+        self._writer.close()
+
+class ArrowTokenWriter(_ColumnarTokenWriter):
+    """Stream tokens into an Arrow IPC (Feather v2) file."""
+
+    format_name = "Arrow IPC"
+
+    def _on_open(self, f: IO[Any]) -> None:
+        pa = _require_pyarrow()
+        self._writer = pa.ipc.new_file(f, self.schema)
+
+    def _write_record_batch(self, record_batch: Any) -> None:
+        self._writer.write_batch(record_batch)
+
+    def _on_close(self, f: IO[Any]) -> None:
+        self.flush()
+        self._writer.close()
+
+def export_batch_to_parquet(batch: TokenBatch, output_path: Path, compression: str = "zstd") -> None:
+    """Write a columnar TokenBatch to a Parquet file."""
+    with ParquetTokenWriter(output_path, compression=compression) as writer:
+        writer.write_batch(batch)
+    logger.debug("Wrote Parquet file with %d tokens to %s", writer.count, output_path)
+
+def export_batch_to_arrow(batch: TokenBatch, output_path: Path) -> None:
+    """Write a columnar TokenBatch to an Arrow IPC file."""
+    with ArrowTokenWriter(output_path) as writer:
+        writer.write_batch(batch)
+    logger.debug("Wrote Arrow IPC file with %d tokens to %s", writer.count, output_path)
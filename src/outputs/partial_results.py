@@ -0,0 +1,97 @@
+import heapq
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from extractors.async_client import FetchJob, FetchResult
+from extractors.dexscreener_parser import DexScreenerError
+from extractors.json_codec import JsonCodec, get_codec
+from extractors.query_planner import CoverageReport
+from models.token_model import Token
+from outputs.atomic_file import AtomicFileWriter
+
+logger = logging.getLogger("dexscreener.outputs.partial_results")
+
+def result_to_record(position: int, result: FetchResult) -> Dict[str, Any]:
+    """One partial-file line: the target's position, outcome, coverage and tokens."""
+    return {
+        "position": position,
+        "query": result.job.query,
+        "error": str(result.error) if result.error is not None else None,
+        "coverage": result.coverage.to_dict() if result.coverage is not None else None,
+        "tokens": [token.to_dict() for token in result.tokens],
+    }
+
+def result_from_record(
+    record: Dict[str, Any], jobs: Sequence[FetchJob]
+) -> Tuple[int, FetchResult]:
+    position = record["position"]
+    job = jobs[position]
+    if record.get("error") is not None:
+        return position, FetchResult(job=job, error=DexScreenerError(record["error"]))
+    coverage = record.get("coverage")
+    return position, FetchResult(
+        job=job,
+        tokens=[Token.from_dict(data) for data in record["tokens"]],
+        coverage=CoverageReport.from_dict(coverage) if coverage else None,
+    )
+
+class PartialResultWriter(AtomicFileWriter):
+    """
+    Stream one worker's FetchResults to a JSON Lines partial file.
+
+    Each line holds one target: its `position` in the full job list, the
+    outcome, the coverage report and the exported token fields. Lines are
+    written in job order, which is what lets the merge step stream.
+    """
+
+    format_name = "partial results"
+
+    def __init__(self, output_path: Path, codec: Optional[JsonCodec] = None) -> None:
+        super().__init__(output_path)
+        self.codec = codec or get_codec()
+
+    def write(self, item: Tuple[int, FetchResult]) -> None:
+        assert self._file is not None, "writer is not open"
+        self._file.write(self.codec.dumps(result_to_record(*item)))
+        self._file.write("\n")
+        self.count += 1
+
+def iter_partial_results(
+    path: Path, jobs: Sequence[FetchJob], codec: Optional[JsonCodec] = None
+) -> Iterator[Tuple[int, FetchResult]]:
+    """Read a partial file back as (position, FetchResult) pairs."""
+    codec = codec or get_codec()
+    with path.open("rb") as f:
+        for line in f:
+            yield result_from_record(codec.loads(line), jobs)
+
+def merge_partial_results(
+    paths: Iterable[Path], jobs: Sequence[FetchJob], codec: Optional[JsonCodec] = None
+) -> Iterator[FetchResult]:
+    """
+    K-way merge of partial files into one stream in job order.
+
+    Every partial is already sorted by position, so only one line per
+    worker is held in memory, and the output order is the same as a
+    single-process run regardless of which worker finished first.
+    """
+    streams: List[Iterator[Tuple[int, FetchResult]]] = [
+        iter_partial_results(path, jobs, codec) for path in paths
+    ]
+    expected = 0
+    for position, result in heapq.merge(*streams, key=lambda item: item[0]):
+        if position != expected:
+            logger.warning("Partial results skip from target %d to %d.", expected, position)
+        expected = position + 1
+        yield result
+
+def write_partial_results(
+    results: Iterable[Tuple[int, FetchResult]],
+    output_path: Path,
+    codec: Optional[JsonCodec] = None,
+) -> int:
+    """Write (position, FetchResult) pairs to `output_path`; returns the count."""
+    with PartialResultWriter(output_path, codec) as writer:
+        writer.write_many(results)
+    return writer.count
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from extractors.async_client import FetchJob, FetchResult
+from extractors.json_codec import JsonCodec, get_codec
+from outputs.partial_results import result_from_record, result_to_record
+
+logger = logging.getLogger("dexscreener.outputs.run_checkpoint")
+
+STATE_FILENAME = "state.json"
+
+class CheckpointError(RuntimeError):
+    """Raised when a checkpointed run cannot be started or resumed."""
+
+def jobs_fingerprint(jobs: Sequence[FetchJob]) -> str:
+    """Hash of the resolved target list; a run can only resume the same targets."""
+    payload = json.dumps(
+        [[job.spec, job.max_pages, job.page_size] for job in jobs], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def append_checkpoint_results(
+    results: Iterable[Tuple[int, FetchResult]],
+    output_path: Path,
+    codec: Optional[JsonCodec] = None,
+) -> Iterator[Tuple[int, FetchResult, int]]:
+    """
+    Append (position, FetchResult) pairs to a checkpoint file, flushing
+    after every target, and yield each with the byte offset of its line.
+
+    Unlike the atomic partial writer, lines are on disk as soon as their
+    target completes, so a killed run keeps everything finished before it.
+    A line torn by the kill is skipped when the file is read back.
+    """
+    codec = codec or get_codec()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("ab") as f:
+        for position, result in results:
+            offset = f.tell()
+            f.write(codec.dumps(result_to_record(position, result)).encode("utf-8"))
+            f.write(b"\n")
+            f.flush()
+            yield position, result, offset
+
+class RunCheckpoint:
+    """
+    Per-target checkpoint of a one-shot run, kept in `<root>/<run_id>/`.
+
+    `state.json` records the run ID, the fingerprint of its target list and
+    how often it was attempted. Each attempt (and each worker process)
+    appends finished targets to its own `results-<attempt>-<label>.jsonl`,
+    in the partial-results line format. Opening a checkpoint scans these
+    files once and keeps only the (file, offset) of each target's latest
+    line. Targets that succeeded are skipped on resume, and failed ones are
+    fetched again. `iter_results` reads the checkpointed targets back one
+    at a time, in job order, when the exports are assembled.
+    """
+
+    def __init__(
+        self, directory: Path, jobs: Sequence[FetchJob], codec: Optional[JsonCodec] = None
+    ) -> None:
+        self.directory = Path(directory)
+        self.jobs = jobs
+        self.codec = codec or get_codec()
+        self.state: Dict[str, Any] = {}
+        self._latest: Dict[int, Tuple[Path, int]] = {}
+        self._done: Set[int] = set()
+
+    @property
+    def run_id(self) -> str:
+        return self.directory.name
+
+    @classmethod
+    def start(
+        cls,
+        root: Path,
+        jobs: Sequence[FetchJob],
+        run_id: Optional[str] = None,
+        resume: bool = False,
+        codec: Optional[JsonCodec] = None,
+    ) -> "RunCheckpoint":
+        """
+        Begin a new checkpointed run, or with `resume` continue `run_id`
+        (by default the latest unfinished run over the same targets).
+        """
+        root = Path(root)
+        fingerprint = jobs_fingerprint(jobs)
+        if resume:
+            run_id = run_id or latest_run_id(root, fingerprint)
+            if run_id is None:
+                raise CheckpointError(f"No unfinished run over these targets in {root} to resume.")
+            checkpoint = cls(root / run_id, jobs, codec)
+            checkpoint.state = checkpoint._load_state()
+            if checkpoint.state.get("fingerprint") != fingerprint:
+                raise CheckpointError(
+                    f"Run '{run_id}' was started with a different target list; "
+                    "start a new run instead of resuming it."
+                )
+            checkpoint.scan()
+            logger.info(
+                "Resuming run '%s': %d of %d targets already done.",
+                run_id,
+                checkpoint.done,
+                len(jobs),
+            )
+        else:
+            run_id = run_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{fingerprint[:8]}"
+            checkpoint = cls(root / run_id, jobs, codec)
+            if (checkpoint.directory / STATE_FILENAME).exists():
+                raise CheckpointError(
+                    f"Run '{run_id}' already exists in {root}; pass --resume to continue it."
+                )
+            checkpoint.state = {
+                "runId": run_id,
+                "createdAt": datetime.now(tz=timezone.utc).isoformat(),
+                "fingerprint": fingerprint,
+                "targets": len(jobs),
+                "attempts": 0,
+                "completed": False,
+            }
+        checkpoint.state["attempts"] = int(checkpoint.state.get("attempts", 0)) + 1
+        checkpoint._save_state()
+        return checkpoint
+
+    def _load_state(self) -> Dict[str, Any]:
+        path = self.directory / STATE_FILENAME
+        if not path.exists():
+            raise CheckpointError(
+                f"No checkpointed run '{self.run_id}' in {self.directory.parent}."
+            )
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / STATE_FILENAME
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        tmp_path.replace(path)
+
+    def scan(self) -> None:
+        """(Re)build the target index from the checkpoint files on disk."""
+        self._latest.clear()
+        self._done.clear()
+        for path in sorted(self.directory.glob("results-*.jsonl")):
+            offset = 0
+            with path.open("rb") as f:
+                for line in f:
+                    try:
+                        record = self.codec.loads(line)
+                        position = int(record["position"])
+                    except (ValueError, KeyError, TypeError):
+                        logger.warning("Skipping an unreadable checkpoint line in %s.", path)
+                    else:
+                        if 0 <= position < len(self.jobs):
+                            self._latest[position] = (path, offset)
+                            if record.get("error") is None:
+                                self._done.add(position)
+                            else:
+                                self._done.discard(position)
+                    offset += len(line)
+
+    @property
+    def done(self) -> int:
+        return len(self._done)
+
+    def pending(self) -> List[int]:
+        """Positions of the targets still to fetch, in job order."""
+        return [position for position in range(len(self.jobs)) if position not in self._done]
+
+    def results_path(self, label: str = "main") -> Path:
+        return self.directory / f"results-{self.state['attempts']:03d}-{label}.jsonl"
+
+    def record(
+        self, results: Iterable[Tuple[int, FetchResult]], label: str = "main"
+    ) -> Iterator[Tuple[int, FetchResult]]:
+        """Checkpoint (position, FetchResult) pairs as they pass through."""
+        path = self.results_path(label)
+        for position, result, offset in append_checkpoint_results(results, path, self.codec):
+            self._latest[position] = (path, offset)
+            if result.ok:
+                self._done.add(position)
+            yield position, result
+
+    def read(self, position: int) -> Optional[FetchResult]:
+        location = self._latest.get(position)
+        if location is None:
+            return None
+        path, offset = location
+        with path.open("rb") as f:
+            f.seek(offset)
+            return result_from_record(self.codec.loads(f.readline()), self.jobs)[1]
+
+    def iter_results(
+        self, fresh: Optional[Iterable[Tuple[int, FetchResult]]] = None
+    ) -> Iterator[FetchResult]:
+        """
+        Every target's result in job order. Targets fetched in this attempt
+        come from `fresh` (ascending positions, e.g. `record(...)`) as they
+        complete, and the others are read back from the checkpoint files.
+        """
+        fresh_iter = iter(fresh) if fresh is not None else iter(())
+        upcoming = next(fresh_iter, None)
+        for position in range(len(self.jobs)):
+            if upcoming is not None and upcoming[0] == position:
+                yield upcoming[1]
+                upcoming = next(fresh_iter, None)
+                continue
+            result = self.read(position)
+            if result is None:
+                logger.warning("Target %d has no checkpointed result; skipping it.", position)
+                continue
+            yield result
+
+    def complete(self, keep: bool = False) -> None:
+        """Mark the run finished; its files are removed unless `keep`."""
+        if not keep:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            return
+        self.state["completed"] = True
+        self._save_state()
+
+def latest_run_id(root: Path, fingerprint: Optional[str] = None) -> Optional[str]:
+    """Most recently started unfinished run in `root`, optionally over the same targets."""
+    candidates = []
+    for state_path in Path(root).glob(f"*/{STATE_FILENAME}"):
+        try:
+            with state_path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if state.get("completed") or (fingerprint and state.get("fingerprint") != fingerprint):
+            continue
+        candidates.append((state.get("createdAt", ""), state_path.parent.name))
+    return max(candidates)[1] if candidates else None
+
+def build_run_checkpoint(
+    config: Dict[str, Any],
+    root_dir: Path,
+    jobs: Sequence[FetchJob],
+    run_id: Optional[str] = None,
+    resume: bool = False,
+    disabled: bool = False,
+    codec: Optional[JsonCodec] = None,
+) -> Optional[RunCheckpoint]:
+    """
+    Start (or resume) a checkpoint from the `checkpoint` settings block.
+
+    Checkpointing is off unless `checkpoint.enabled` is set or a `run_id`
+    is given. Returns None when it is off or `disabled`, unless `resume`
+    asks for it.
+    """
+    enabled = config.get("enabled", False) or run_id is not None
+    if not resume and (disabled or not enabled):
+        return None
+    root = (root_dir / config.get("directory", "data/checkpoints")).resolve()
+    return RunCheckpoint.start(root, jobs, run_id=run_id, resume=resume, codec=codec)
@@ -0,0 +1,486 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from extractors.token_index import TokenKey, token_key
+from models.token_batch import COLUMN_TYPES
+from models.token_model import Token
+
+logger = logging.getLogger("dexscreener.outputs.snapshot_store")
+
+# Descriptive fields change rarely and are stored once per pool; numeric
+# fields are stored on every snapshot row.
+POOL_FIELDS: Tuple[str, ...] = tuple(
+    name for name, kind in COLUMN_TYPES.items() if kind is str and name != "lowerPoolAddress"
+)
+SNAPSHOT_FIELDS: Tuple[str, ...] = tuple(
+    name for name, kind in COLUMN_TYPES.items() if kind is not str
+)
+
+_SQL_TYPES = {str: "TEXT", int: "INTEGER", float: "REAL"}
+
+# SQLite's default limit on bound parameters is 999 on older builds.
+_SELECT_CHUNK = 500
+
+def _latest_join(bound: str = "") -> str:
+    """
+    Join each pool to its newest snapshot (optionally under `bound`). The
+    query is driven by `pools`, so both the MAX and the row fetch are probes
+    of the (pool_id, ts) primary key; a GROUP BY or window over `snapshots`
+    would scan every retained row instead.
+    """
+    return (
+        "s.pool_id = p.id AND s.ts = "
+        f"(SELECT MAX(ts) FROM snapshots WHERE pool_id = p.id {bound})"
+    )
+
+@dataclass
+class StoredSnapshot:
+    """One pool's Token as recorded at `timestamp` (unix seconds)."""
+
+    chain_id: str
+    timestamp: int
+    token: Token
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"chainId": self.chain_id, "timestamp": self.timestamp}
+        data.update(self.token.to_dict())
+        return data
+
+class SnapshotStore:
+    """
+    Append-mostly history of Token snapshots in a single SQLite file.
+
+    Pools are interned in a `pools` table holding their descriptive fields,
+    which are only rewritten when they change. Snapshot rows live in a
+    WITHOUT ROWID table clustered on (pool_id, ts), so a pool's time range
+    is one contiguous B-tree scan and its latest (or as-of) snapshot is a
+    single primary-key probe rather than a GROUP BY over the whole history.
+
+    Maintenance is incremental: rows older than `retention_days` are
+    deleted, and rows older than `compact_after_hours` are thinned to the
+    last snapshot per pool per `compact_bucket_minutes`. Only the range
+    added since the previous compaction is scanned.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        retention_days: Optional[float] = None,
+        compact_after_hours: Optional[float] = None,
+        compact_bucket_minutes: float = 60,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_seconds = int(retention_days * 86400) if retention_days else None
+        self.compact_after_seconds = (
+            int(compact_after_hours * 3600) if compact_after_hours else None
+        )
+        self.compact_bucket_seconds = max(1, int(compact_bucket_minutes * 60))
+        self._lock = threading.Lock()
+        # Pool id and last written descriptive fields, per pool seen by this process.
+        self._pools: Dict[TokenKey, Tuple[int, Tuple[Any, ...]]] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        conn = self._conn
+        # auto_vacuum only takes effect if set before the first table exists.
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Inserts touch one leaf page per pool; a larger page cache keeps
+        # them in memory between batches.
+        conn.execute("PRAGMA cache_size=-65536")
+        pool_columns = "".join(f",\n                {name} TEXT" for name in POOL_FIELDS)
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS pools (
+                id INTEGER PRIMARY KEY,
+                chain_id TEXT NOT NULL,
+                pool_address TEXT NOT NULL{pool_columns},
+                UNIQUE (chain_id, pool_address)
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS pools_address ON pools (pool_address)")
+        snapshot_columns = "".join(
+            f",\n                {name} {_SQL_TYPES[COLUMN_TYPES[name]]}" for name in SNAPSHOT_FIELDS
+        )
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                pool_id INTEGER NOT NULL,
+                ts INTEGER NOT NULL{snapshot_columns},
+                PRIMARY KEY (pool_id, ts)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS snapshots_ts ON snapshots (ts)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        self._add_missing_columns("pools", {name: "TEXT" for name in POOL_FIELDS})
+        self._add_missing_columns(
+            "snapshots", {name: _SQL_TYPES[COLUMN_TYPES[name]] for name in SNAPSHOT_FIELDS}
+        )
+        conn.commit()
+
+    def _add_missing_columns(self, table: str, columns: Dict[str, str]) -> None:
+        """Add Token fields introduced after the database was created; old rows read NULL."""
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        for name, sql_type in columns.items():
+            if name not in existing:
+                logger.info("Adding column %s.%s to history database %s.", table, name, self.path)
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+
+    def _pool_ids_for(self, keys: Sequence[TokenKey]) -> Dict[TokenKey, int]:
+        ids: Dict[TokenKey, int] = {}
+        for start in range(0, len(keys), _SELECT_CHUNK):
+            chunk = keys[start : start + _SELECT_CHUNK]
+            wanted = set(chunk)
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT id, chain_id, pool_address FROM pools WHERE pool_address IN ({placeholders})",
+                [address for _, address in chunk],
+            )
+            for pool_id, chain_id, address in rows:
+                if (chain_id, address) in wanted:
+                    ids[(chain_id, address)] = pool_id
+        return ids
+
+    def record(self, tokens: Iterable[Token], timestamp: Optional[float] = None) -> int:
+        """
+        Store one snapshot of `tokens`, taken at `timestamp`, in a single
+        transaction. Tokens without a pool address are skipped; a pool seen
+        twice in the batch keeps its last record. Returns the rows written.
+        """
+        return len(self.record_pools(tokens, timestamp))
+
+    def record_pools(
+        self, tokens: Iterable[Token], timestamp: Optional[float] = None
+    ) -> List[int]:
+        """Like `record`, returning the ids of the pools written."""
+        ts = int(time.time() if timestamp is None else timestamp)
+        by_key: Dict[TokenKey, Token] = {}
+        skipped = 0
+        for token in tokens:
+            key = token_key(token)
+            if key is None:
+                skipped += 1
+                continue
+            by_key[key] = token
+        if skipped:
+            logger.debug("Skipped %d tokens without a pool address.", skipped)
+        if not by_key:
+            return []
+
+        pool_sql = (
+            f"INSERT INTO pools (chain_id, pool_address, {', '.join(POOL_FIELDS)}) "
+            f"VALUES ({', '.join('?' * (2 + len(POOL_FIELDS)))}) "
+            "ON CONFLICT (chain_id, pool_address) DO UPDATE SET "
+            + ", ".join(f"{name} = excluded.{name}" for name in POOL_FIELDS)
+        )
+        snapshot_sql = (
+            f"INSERT OR REPLACE INTO snapshots (pool_id, ts, {', '.join(SNAPSHOT_FIELDS)}) "
+            f"VALUES ({', '.join('?' * (2 + len(SNAPSHOT_FIELDS)))})"
+        )
+
+        with self._lock, self._conn:
+            pools = self._pools
+            changed: Dict[TokenKey, Tuple[Any, ...]] = {}
+            for key, token in by_key.items():
+                static = tuple(getattr(token, name) for name in POOL_FIELDS)
+                cached = pools.get(key)
+                if cached is None or cached[1] != static:
+                    changed[key] = static
+            if changed:
+                self._conn.executemany(
+                    pool_sql, (key + static for key, static in changed.items())
+                )
+                for key, pool_id in self._pool_ids_for(list(changed)).items():
+                    pools[key] = (pool_id, changed[key])
+
+            self._conn.executemany(
+                snapshot_sql,
+                (
+                    (pools[key][0], ts, *(getattr(token, name) for name in SNAPSHOT_FIELDS))
+                    for key, token in by_key.items()
+                ),
+            )
+
+        logger.debug("Recorded %d pool snapshots at %d in %s.", len(by_key), ts, self.path)
+        return [pools[key][0] for key in by_key]
+
+    def _select(
+        self,
+        where: str,
+        params: Sequence[Any],
+        order: str,
+        limit: Optional[int],
+        join: str = "s.pool_id = p.id",
+    ) -> List[StoredSnapshot]:
+        pool_columns = ", ".join(f"p.{name}" for name in POOL_FIELDS)
+        snapshot_columns = ", ".join(f"s.{name}" for name in SNAPSHOT_FIELDS)
+        sql = (
+            f"SELECT p.chain_id, p.pool_address, s.ts, {pool_columns}, {snapshot_columns} "
+            f"FROM pools p JOIN snapshots s ON {join} "
+            f"WHERE {where} ORDER BY {order}"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        names = ("lowerPoolAddress",) + POOL_FIELDS + SNAPSHOT_FIELDS
+        with self._lock:
+            rows = self._conn.execute(sql, list(params)).fetchall()
+        return [
+            StoredSnapshot(
+                chain_id=row[0],
+                timestamp=row[2],
+                token=Token(**dict(zip(names, row[1:2] + row[3:]))),
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _pool_filter(
+        pool_address: Optional[str], chain_id: Optional[str]
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if pool_address:
+            clauses.append("p.pool_address = ?")
+            params.append(pool_address.lower())
+        if chain_id:
+            clauses.append("p.chain_id = ?")
+            params.append(chain_id)
+        return clauses, params
+
+    def latest(
+        self,
+        chain_id: Optional[str] = None,
+        pool_address: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[StoredSnapshot]:
+        """Most recent snapshot of every pool (optionally one chain or pool)."""
+        clauses, params = self._pool_filter(pool_address, chain_id)
+        where = " AND ".join(clauses) or "1"
+        return self._select(where, params, "p.id", limit, join=_latest_join())
+
+    def history(
+        self,
+        pool_address: str,
+        chain_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[StoredSnapshot]:
+        """Snapshots of one pool with `since <= ts <= until`, oldest first."""
+        clauses, params = self._pool_filter(pool_address, chain_id)
+        if since is not None:
+            clauses.append("s.ts >= ?")
+            params.append(int(since))
+        if until is not None:
+            clauses.append("s.ts <= ?")
+            params.append(int(until))
+        return self._select(" AND ".join(clauses), params, "p.id, s.ts", limit)
+
+    def at(
+        self,
+        timestamp: float,
+        pool_address: Optional[str] = None,
+        chain_id: Optional[str] = None,
+    ) -> List[StoredSnapshot]:
+        """The last snapshot at or before `timestamp` for each matching pool."""
+        clauses, params = self._pool_filter(pool_address, chain_id)
+        where = " AND ".join(clauses) or "1"
+        # The as-of bound is part of the join, so it binds before the filters.
+        params.insert(0, int(timestamp))
+        return self._select(where, params, "p.id", None, join=_latest_join("AND ts <= ?"))
+
+    def discard(self, timestamp: float, pool_ids: Iterable[int]) -> int:
+        """
+        Delete the snapshots of `pool_ids` taken at `timestamp`, e.g. the
+        batches a run wrote before it was aborted. Other pools recorded in
+        the same second, by another run or process, are left alone.
+        """
+        ts = int(timestamp)
+        ids = list(pool_ids)
+        removed = 0
+        with self._lock, self._conn:
+            for start in range(0, len(ids), _SELECT_CHUNK):
+                chunk = ids[start : start + _SELECT_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                removed += self._conn.execute(
+                    f"DELETE FROM snapshots WHERE ts = ? AND pool_id IN ({placeholders})",
+                    [ts, *chunk],
+                ).rowcount
+        if removed:
+            logger.info("Discarded %d snapshots taken at %d.", removed, int(timestamp))
+        return removed
+
+    def _get_meta(self, key: str) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key: str, value: int) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        """Delete snapshots (and pools) older than the retention window."""
+        if self.retention_seconds is None:
+            return 0
+        cutoff = int(time.time() if now is None else now) - self.retention_seconds
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM snapshots WHERE ts < ?", (cutoff,)).rowcount
+            pools = self._conn.execute(
+                "DELETE FROM pools WHERE NOT EXISTS "
+                "(SELECT 1 FROM snapshots WHERE pool_id = pools.id)"
+            ).rowcount
+            if pools:
+                self._pools.clear()
+        if deleted:
+            logger.info("Retention removed %d snapshots and %d pools.", deleted, pools)
+        return deleted
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        Keep only the last snapshot per pool per bucket for rows older than
+        `compact_after_hours`. Each call only scans buckets completed since
+        the previous one.
+        """
+        if self.compact_after_seconds is None:
+            return 0
+        bucket = self.compact_bucket_seconds
+        now = int(time.time() if now is None else now)
+        cutoff = (now - self.compact_after_seconds) // bucket * bucket
+        with self._lock, self._conn:
+            start = self._get_meta("compacted_until")
+            if start is None:
+                row = self._conn.execute("SELECT MIN(ts) FROM snapshots").fetchone()
+                if row[0] is None:
+                    return 0
+                start = row[0] // bucket * bucket
+            if cutoff <= start:
+                return 0
+            # A row is redundant if a later row of the same pool falls in
+            # its bucket; each check is a primary-key range probe.
+            removed = self._conn.execute(
+                """
+                DELETE FROM snapshots
+                WHERE ts >= :start AND ts < :cutoff
+                  AND EXISTS (
+                      SELECT 1 FROM snapshots AS later
+                      WHERE later.pool_id = snapshots.pool_id
+                        AND later.ts > snapshots.ts
+                        AND later.ts < (snapshots.ts / :bucket + 1) * :bucket
+                  )
+                """,
+                {"start": start, "cutoff": cutoff, "bucket": bucket},
+            ).rowcount
+            self._set_meta("compacted_until", cutoff)
+        if removed:
+            logger.info("Compaction thinned %d snapshots older than %d.", removed, cutoff)
+        return removed
+
+    def maintain(self, now: Optional[float] = None) -> int:
+        """Apply retention and compaction, then return freed pages to the OS."""
+        removed = self.apply_retention(now) + self.compact(now)
+        if removed:
+            with self._lock:
+                self._conn.execute("PRAGMA incremental_vacuum")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (pools,) = self._conn.execute("SELECT COUNT(*) FROM pools").fetchone()
+            rows, oldest, newest = self._conn.execute(
+                "SELECT COUNT(*), MIN(ts), MAX(ts) FROM snapshots"
+            ).fetchone()
+        return {
+            "path": str(self.path),
+            "pools": pools,
+            "snapshots": rows,
+            "oldest": oldest,
+            "newest": newest,
+            "sizeBytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class SnapshotStoreWriter:
+    """
+    Exporter-shaped adapter so a run's tokens are recorded alongside the
+    file outputs. Tokens are written in batches of at most `batch_size`
+    while targets stream in, all stamped with the time the writer was
+    opened, so memory stays bounded however large the run is. Only the ids
+    of the pools already written are kept, so an aborted run can discard
+    exactly its own rows.
+    """
+
+    format_name = "history store"
+
+    def __init__(self, store: SnapshotStore, batch_size: int = 5000) -> None:
+        self.store = store
+        self.output_path = store.path
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._tokens: List[Token] = []
+        self._timestamp: Optional[int] = None
+        self._written: Set[int] = set()
+
+    def open(self) -> None:
+        self.count = 0
+        self._tokens = []
+        self._timestamp = int(time.time())
+        self._written = set()
+
+    def _flush(self) -> None:
+        if self._tokens:
+            written = self.store.record_pools(self._tokens, self._timestamp)
+            self._written.update(written)
+            self.count = len(self._written)
+            self._tokens = []
+
+    def write(self, token: Token) -> None:
+        self._tokens.append(token)
+        if len(self._tokens) >= self.batch_size:
+            self._flush()
+
+    def write_many(self, tokens: Iterable[Token]) -> None:
+        for token in tokens:
+            self.write(token)
+
+    def commit(self) -> None:
+        self._flush()
+        self.store.maintain()
+
+    def abort(self) -> None:
+        self._tokens = []
+        if self._written and self._timestamp is not None:
+            self.store.discard(self._timestamp, self._written)
+        self._written = set()
+        self.count = 0
+
+def build_snapshot_store(
+    config: Dict[str, Any], root_dir: Path, disabled: bool = False
+) -> Optional[SnapshotStore]:
+    """
+    Build the snapshot store from the `history` settings block.
+
+    Returns None when history is disabled in settings or via `disabled`.
+    """
+    if disabled or not config.get("enabled", False):
+        return None
+    return SnapshotStore(
+        path=(root_dir / config.get("path", "data/history.sqlite3")).resolve(),
+        retention_days=config.get("retentionDays"),
+        compact_after_hours=config.get("compactAfterHours"),
+        compact_bucket_minutes=config.get("compactBucketMinutes", 60),
+    )
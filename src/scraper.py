@@ -0,0 +1,872 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import json
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Dict, Any, Set, Tuple
+
+from settings import ROOT_DIR, SRC_DIR, configure_logging, load_settings, resolve_output_paths
+from extractors.dexscreener_parser import DexScreenerClient
+from extractors.json_codec import codec_from_settings
+from extractors.pair_filters import FilterSpecError, compile_pipeline
+from extractors.query_planner import ExpansionConfig
+from extractors.response_cache import build_response_cache
+from extractors.run_metrics import (
+    STAGE_EXPORT,
+    MetricsServer,
+    RunSummary,
+    StageTimers,
+    TargetSummary,
+    profile_run,
+    render_prometheus,
+    write_run_summary,
+)
+from extractors.snapshot_diff import diff_snapshots
+from extractors.token_index import TokenIndex, TokenKey, token_key
+from extractors.address_lookup import LOOKUP_PAIRS, LOOKUP_TOKENS
+from extractors.async_client import (
+    FetchJob,
+    FetchResult,
+    build_pooled_session,
+    iter_fetch_results,
+    tokens_from_lookup,
+)
+from models.token_model import Token
+from outputs.atomic_file import AtomicFileWriter
+from outputs.change_stream import append_changes_to_jsonl
+from outputs.formats import selected_formats, writer_class
+from outputs.partial_results import merge_partial_results, write_partial_results
+from outputs.run_checkpoint import (
+    CheckpointError,
+    RunCheckpoint,
+    append_checkpoint_results,
+    build_run_checkpoint,
+)
+from outputs.snapshot_store import (
+    SnapshotStore,
+    SnapshotStoreWriter,
+    build_snapshot_store,
+)
+
+# Only needed by optional modes (replay/record, launchpad enrichment, alerts,
+# serve, worker processes); imported where those modes start.
+if TYPE_CHECKING:
+    import requests
+
+    from extractors.adaptive_scheduler import AdaptiveScheduler
+    from extractors.alert_rules import AlertEngine
+    from extractors.launchpad_enricher import LaunchpadEnricher
+    from extractors.snapshot_server import SnapshotHub
+
+logger = logging.getLogger("dexscreener.scraper")
+
+def load_input_targets(input_path: Path) -> List[Dict[str, Any]]:
+    if not input_path.exists():
+        logger.error("Input targets file %s does not exist.", input_path)
+        raise FileNotFoundError(f"Input targets file not found: {input_path}")
+
+    with input_path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        # Allow a single object
+        return [data]
+    if not isinstance(data, list):
+        raise ValueError("Input file must contain a list of targets or a single target object.")
+    return data
+
+def build_fetch_jobs(
+    targets: List[Dict[str, Any]],
+    max_pages_override: int | None,
+    default_max_pages: int,
+    page_size: int,
+    pagination: Dict[str, Any] | None = None,
+) -> List[FetchJob]:
+    pagination = pagination or {}
+    jobs: List[FetchJob] = []
+    for idx, target in enumerate(targets, start=1):
+        try:
+            pipeline = compile_pipeline(target)
+        except FilterSpecError as exc:
+            logger.error("Target #%d has invalid filters, skipping: %s", idx, exc)
+            continue
+
+        if "pairAddresses" in target or "tokenAddresses" in target:
+            job = build_lookup_job(idx, target)
+            if job is not None:
+                job.pipeline = pipeline
+                job.spec = target
+                jobs.append(job)
+            continue
+
+        query = target.get("query")
+        if not query:
+            logger.warning("Target #%d has no 'query' field, skipping: %s", idx, target)
+            continue
+
+        max_pages = max_pages_override or target.get("maxPages", default_max_pages)
+        jobs.append(
+            FetchJob(
+                query=query,
+                max_pages=max_pages,
+                page_size=page_size,
+                pipeline=pipeline,
+                expansion=ExpansionConfig.from_config(pagination, target),
+                spec=target,
+            )
+        )
+    return jobs
+
+def build_lookup_job(idx: int, target: Dict[str, Any]) -> FetchJob | None:
+    """
+    Build a lookup job from an address-list target:
+
+        {"chainId": "solana", "pairAddresses": ["...", ...]}
+        {"tokenAddresses": ["...", ...], "chainId": "solana"}  (chainId optional)
+    """
+    chain_id = target.get("chainId")
+    if "pairAddresses" in target:
+        kind, addresses = LOOKUP_PAIRS, target.get("pairAddresses")
+        if not chain_id:
+            logger.warning("Target #%d lists pairAddresses without 'chainId', skipping.", idx)
+            return None
+    else:
+        kind, addresses = LOOKUP_TOKENS, target.get("tokenAddresses")
+
+    if isinstance(addresses, str):
+        addresses = addresses.split(",")
+    addresses = [str(a).strip() for a in addresses or [] if str(a).strip()]
+    if not addresses:
+        logger.warning("Target #%d has an empty address list, skipping: %s", idx, target)
+        return None
+
+    label = target.get("query") or f"{kind}:{chain_id or '*'} ({len(addresses)} addresses)"
+    return FetchJob(query=label, kind=kind, chain_id=chain_id, addresses=tuple(addresses))
+
+def iter_serial(client: DexScreenerClient, jobs: List[FetchJob]) -> Iterator[FetchResult]:
+    # All address lookups are resolved together on first use so duplicate
+    # addresses across targets cost a single request.
+    lookups = None
+
+    for job in jobs:
+        if job.is_lookup:
+            if lookups is None:
+                lookups = client.lookup_addresses(
+                    [j.lookup_request() for j in jobs if j.is_lookup]
+                )
+            try:
+                tokens_for_lookup = tokens_from_lookup(client, lookups, job)
+            except Exception as exc:
+                logger.error("Failed to look up addresses for '%s': %s", job.query, exc)
+                yield FetchResult(job=job, error=exc)
+                continue
+            yield FetchResult(job=job, tokens=tokens_for_lookup)
+            continue
+
+        logger.info("Fetching tokens for query '%s' (max_pages=%s)...", job.query, job.max_pages)
+
+        try:
+            tokens_for_query, coverage = client.fetch_query(
+                query=job.query,
+                max_pages=job.max_pages,
+                page_size=job.page_size,
+                pipeline=job.pipeline,
+                expansion=job.expansion,
+            )
+        except Exception as exc:
+            logger.exception("Failed to fetch tokens for query '%s': %s", job.query, exc)
+            yield FetchResult(job=job, error=exc)
+            continue
+
+        yield FetchResult(job=job, tokens=tokens_for_query, coverage=coverage)
+
+def iter_targets(
+    client: DexScreenerClient, concurrency: int, jobs: List[FetchJob]
+) -> Iterator[FetchResult]:
+    """Yield one FetchResult per job, in job order, as each target completes."""
+    if concurrency > 1:
+        logger.info("Fetching %d targets with concurrency=%d.", len(jobs), concurrency)
+        return iter_fetch_results(jobs, client=client, concurrency=concurrency)
+    return iter_serial(client, jobs)
+
+def fetch_targets(
+    client: DexScreenerClient, concurrency: int, jobs: List[FetchJob]
+) -> List[FetchResult]:
+    return list(iter_targets(client, concurrency, jobs))
+
+def build_session(
+    settings: Dict[str, Any],
+    concurrency: int,
+    replay: str | None = None,
+    record: str | None = None,
+) -> requests.Session | None:
+    """
+    The HTTP session for a client: a pooled one for concurrent fetching,
+    a ReplaySession answering from a recorded fixture, or a
+    RecordingSession appending every live response to one.
+    """
+    config = settings.get("dexscreener", {})
+    base_url = config.get("baseUrl", "https://api.dexscreener.com/latest/dex")
+    if replay or record:
+        from extractors.replay import Fixture, RecordingSession, ReplaySession
+    if replay:
+        return ReplaySession(Fixture.load(Path(replay)), base_url)
+    session = build_pooled_session(concurrency) if concurrency > 1 else None
+    if record:
+        return RecordingSession(Path(record), base_url, session=session)
+    return session
+
+def build_client(
+    settings: Dict[str, Any],
+    concurrency: int,
+    cache_dir: str | None = None,
+    no_cache: bool = False,
+    replay: str | None = None,
+    record: str | None = None,
+) -> Tuple[DexScreenerClient, Any]:
+    """
+    Build the client (and its response cache, which the caller closes).
+
+    Recording and replaying bypass the response cache, so every request
+    reaches the network or the fixture respectively. Replayed requests are
+    not rate limited either.
+    """
+    session = build_session(settings, concurrency, replay=replay, record=record)
+    if replay:
+        settings = copy.deepcopy(settings)
+        settings.setdefault("dexscreener", {})["rateLimit"] = {}
+    cache = build_response_cache(
+        settings.get("cache", {}),
+        ROOT_DIR,
+        directory_override=cache_dir,
+        disabled=no_cache or bool(replay or record),
+    )
+    return DexScreenerClient.from_settings(settings, session=session, cache=cache), cache
+
+def shard_jobs(jobs: List[FetchJob], workers: int) -> List[List[int]]:
+    """
+    Split job positions across `workers` shards.
+
+    Search jobs are dealt round-robin so every shard gets a similar mix.
+    Lookup jobs all go to the first shard, so addresses shared between
+    targets are still coalesced into a single request.
+    """
+    shards: List[List[int]] = [[] for _ in range(max(1, workers))]
+    searches = 0
+    for position, job in enumerate(jobs):
+        if job.is_lookup:
+            shards[0].append(position)
+            continue
+        shards[searches % len(shards)].append(position)
+        searches += 1
+    for shard in shards:
+        shard.sort()
+    return [shard for shard in shards if shard]
+
+def share_rate_limit(settings: Dict[str, Any], workers: int) -> Dict[str, Any]:
+    """Copy of `settings` with the request budget split evenly across workers."""
+    shared = copy.deepcopy(settings)
+    rate_limit = shared.setdefault("dexscreener", {}).get("rateLimit") or {}
+    if rate_limit.get("requestsPerMinute"):
+        rate_limit["requestsPerMinute"] = rate_limit["requestsPerMinute"] / workers
+        rate_limit["burst"] = max(1, int(rate_limit.get("burst", 1)) // workers)
+    return shared
+
+def scrape_shard(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Worker process entry point: rebuild this shard's jobs from their input
+    targets, scrape them with a private client and stream the results to a
+    partial file, or append them to a checkpoint file as each completes.
+    Returns the path and the worker's metrics.
+    """
+    configure_logging(task["log_level"])
+    settings = task["settings"]
+    pagination = settings.get("pagination", {})
+    jobs = build_fetch_jobs(
+        task["specs"],
+        task["max_pages"],
+        pagination.get("maxPages", 1),
+        pagination.get("pageSize", 50),
+        pagination,
+    )
+    client, cache = build_client(
+        settings,
+        task["concurrency"],
+        task["cache_dir"],
+        task["no_cache"],
+        replay=task["replay"],
+    )
+    try:
+        results = zip(task["positions"], iter_targets(client, task["concurrency"], jobs))
+        if task.get("checkpoint"):
+            written = sum(
+                1 for _ in append_checkpoint_results(results, Path(task["path"]), client.codec)
+            )
+        else:
+            written = write_partial_results(results, Path(task["path"]), codec=client.codec)
+    finally:
+        if cache is not None:
+            cache.close()
+    logger.info("Worker finished %d targets into %s.", written, task["path"])
+    return {
+        "path": task["path"],
+        "counters": client.metrics.as_dict(),
+        "stages": client.metrics.stages.snapshot(),
+    }
+
+def run_sharded(
+    settings: Dict[str, Any],
+    args: argparse.Namespace,
+    jobs: List[FetchJob],
+    workers: int,
+    concurrency: int,
+    work_dir: Path,
+    client: DexScreenerClient,
+    checkpoint: RunCheckpoint | None = None,
+) -> Iterator[FetchResult]:
+    """
+    Scrape `jobs` in `workers` processes and return their merged results.
+
+    Each worker gets its own client and an equal share of the rate limit,
+    and writes a partial file. The partials are merged back in job order,
+    so everything downstream (dedup, exporters, history) sees exactly what
+    a single-process run would. Worker metrics are folded into `client`.
+
+    With a `checkpoint`, only its pending targets are scraped. Each worker
+    appends to its own checkpoint file, and the results are read back from
+    the checkpoint.
+    """
+    pending = checkpoint.pending() if checkpoint is not None else list(range(len(jobs)))
+    shards = [
+        [pending[index] for index in shard]
+        for shard in shard_jobs([jobs[position] for position in pending], workers)
+    ]
+    worker_settings = share_rate_limit(settings, len(shards))
+    tasks = [
+        {
+            "settings": worker_settings,
+            "specs": [jobs[position].spec for position in positions],
+            "positions": positions,
+            "path": str(
+                checkpoint.results_path(f"worker-{number}")
+                if checkpoint is not None
+                else work_dir / f"worker-{number}.jsonl"
+            ),
+            "checkpoint": checkpoint is not None,
+            "max_pages": args.max_pages,
+            "concurrency": concurrency,
+            "cache_dir": args.cache_dir,
+            "no_cache": args.no_cache,
+            "replay": args.replay,
+            "log_level": args.log_level,
+        }
+        for number, positions in enumerate(shards)
+    ]
+    logger.info("Scraping %d targets with %d worker processes.", len(pending), len(tasks))
+
+    outcomes = []
+    if tasks:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=len(tasks)) as pool:
+            outcomes = list(pool.map(scrape_shard, tasks))
+
+    for outcome in outcomes:
+        for name, value in outcome["counters"].items():
+            client.metrics.add(name, value)
+        client.metrics.stages.merge(outcome["stages"])
+    if checkpoint is not None:
+        checkpoint.scan()
+        return checkpoint.iter_results()
+    return merge_partial_results([Path(o["path"]) for o in outcomes], jobs, codec=client.codec)
+
+def build_writers(
+    settings: Dict[str, Any],
+    json_path: Path,
+    csv_path: Path,
+    history: SnapshotStore | None = None,
+    formats: List[str] | None = None,
+) -> List[AtomicFileWriter]:
+    """
+    One writer per selected output format (see outputs.formats), plus the
+    history store. Only the selected formats' modules are imported.
+    """
+    output_cfg = settings.get("output", {})
+    writers: List[AtomicFileWriter] = []
+    for name in selected_formats(output_cfg, formats):
+        writer_cls = writer_class(name)
+        if name == "json":
+            writers.append(
+                writer_cls(
+                    json_path,
+                    lines=output_cfg.get("jsonLines", False),
+                    codec=codec_from_settings(settings),
+                )
+            )
+        elif name == "csv":
+            writers.append(writer_cls(csv_path))
+        else:
+            # Columnar outputs need the optional pyarrow package.
+            filename = output_cfg.get(f"{name}Filename") or f"tokens.{name}"
+            writers.append(writer_cls(json_path.parent / filename))
+    if history is not None:
+        writers.append(SnapshotStoreWriter(history))
+    return writers
+
+def export_streaming(
+    results: Iterator[FetchResult],
+    writers: List[AtomicFileWriter],
+    deduplicate: bool = False,
+    timers: StageTimers | None = None,
+) -> int:
+    """
+    Hand each target's tokens to every writer as soon as it completes.
+
+    With `deduplicate`, a pair (chainId, lowerPoolAddress) returned by
+    several targets is written once, as first seen. Only the keys are kept,
+    so memory stays flat however many tokens stream through. Tokens without
+    a pool address cannot be matched and are always written.
+
+    Writers stream into temp files that are renamed into place at the end;
+    if no tokens were collected, existing outputs are left untouched.
+    Time spent inside the writers is recorded as the "export" stage of
+    `timers`. Returns the number of tokens exported.
+    """
+    timed = timers.time if timers is not None else (lambda stage: contextlib.nullcontext())
+    seen: Set[TokenKey] = set()
+    duplicates = unkeyed = 0
+    exported = 0
+    try:
+        for writer in writers:
+            writer.open()
+        for result in results:
+            if not result.ok:
+                continue
+            logger.info("Retrieved %d tokens for query '%s'.", len(result.tokens), result.job.query)
+            tokens = result.tokens
+            if deduplicate:
+                tokens = []
+                for token in result.tokens:
+                    key = token_key(token)
+                    if key is None:
+                        unkeyed += 1
+                    elif key in seen:
+                        duplicates += 1
+                        continue
+                    else:
+                        seen.add(key)
+                    tokens.append(token)
+            with timed(STAGE_EXPORT):
+                for writer in writers:
+                    writer.write_many(tokens)
+            exported += len(tokens)
+
+        if duplicates:
+            logger.info(
+                "Skipped %d duplicate pairs across targets; %d unique pairs exported.",
+                duplicates,
+                len(seen),
+            )
+        if unkeyed:
+            logger.info(
+                "Exported %d tokens without a pool address as-is (they cannot be de-duplicated).",
+                unkeyed,
+            )
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+
+    if not exported:
+        for writer in writers:
+            writer.abort()
+        return 0
+
+    with timed(STAGE_EXPORT):
+        for writer in writers:
+            writer.commit()
+    return exported
+
+def run_watch(
+    client: DexScreenerClient,
+    jobs: List[FetchJob],
+    concurrency: int,
+    interval: float,
+    changes_path: Path,
+    max_cycles: int | None = None,
+    history: SnapshotStore | None = None,
+    summary: RunSummary | None = None,
+    enricher: LaunchpadEnricher | None = None,
+    alerts: AlertEngine | None = None,
+    hub: SnapshotHub | None = None,
+    scheduler: AdaptiveScheduler | None = None,
+) -> int:
+    """
+    Scrape every `interval` seconds and append only the differences between
+    consecutive snapshots to `changes_path`. With a `history` store, the
+    tokens of every successfully refreshed target are recorded there as
+    well; with an `enricher`, launchpad tokens get their launchpad metrics
+    attached; with `alerts`, every freshly fetched token is run through the
+    alert rules; with a `hub`, the snapshot and changes are published to it
+    for the serve mode's HTTP API whenever a cycle changed something.
+
+    With a `scheduler`, `interval` is ignored: each cycle refreshes only the
+    targets the scheduler says are due, and the snapshot keeps every other
+    target's tokens from its latest refresh.
+
+    The first cycle reports every pool as added. If a target fails, its
+    tokens from the previous cycle are carried forward so a transient error
+    is not reported as a mass removal.
+
+    A `summary` is updated after every cycle, e.g. for the metrics endpoint.
+    """
+    summary = summary or RunSummary()
+    previous = TokenIndex()
+    last_tokens_by_job: Dict[int, List[Token]] = {}
+    fetched_at_by_job: Dict[int, float] = {}
+    summaries_by_job: Dict[int, TargetSummary] = {}
+    cycle = 0
+
+    if scheduler is None:
+        logger.info("Watch mode: refreshing %d targets every %.1fs.", len(jobs), interval)
+    else:
+        logger.info("Watch mode: refreshing %d targets on an adaptive schedule.", len(jobs))
+    try:
+        while True:
+            started = time.monotonic()
+            if scheduler is not None:
+                positions = scheduler.due()
+                if not positions:
+                    time.sleep(scheduler.config.tick_seconds)
+                    continue
+            else:
+                positions = list(range(len(jobs)))
+            cycle += 1
+
+            fetched = iter_targets(client, concurrency, [jobs[idx] for idx in positions])
+            if enricher is not None:
+                fetched = enricher.enrich_results(fetched)
+            results = list(zip(positions, fetched))
+            fetched_at = time.time()
+            if scheduler is not None:
+                scheduler.observe_many(results)
+
+            refreshed: List[Token] = []
+            for idx, result in results:
+                if result.ok:
+                    last_tokens_by_job[idx] = result.tokens
+                    fetched_at_by_job[idx] = fetched_at
+                    refreshed.extend(result.tokens)
+                elif idx in last_tokens_by_job:
+                    logger.warning(
+                        "Keeping previous snapshot for query '%s' after fetch failure.",
+                        result.job.query,
+                    )
+                summaries_by_job[idx] = summary.summarize_result(result)
+            # Targets that were not refreshed (or failed) are carried forward
+            # from their latest successful fetch.
+            if any(result.ok for _, result in results):
+                current = TokenIndex()
+                for idx, job in enumerate(jobs):
+                    if idx in last_tokens_by_job:
+                        current.add_many(
+                            last_tokens_by_job[idx],
+                            source=job.query,
+                            seen_at=fetched_at_by_job[idx],
+                        )
+            else:
+                current = previous
+
+            if alerts is not None:
+                now = time.time()
+                for _, result in results:
+                    if result.ok:
+                        alerts.evaluate_many(result.tokens, now)
+                alerts.prune(now)
+                summary.alerts_fired = alerts.fired
+
+            changes = diff_snapshots(previous, current)
+            written = append_changes_to_jsonl(changes, changes_path, codec=client.codec)
+            logger.info(
+                "Watch cycle %d: %d of %d targets refreshed, %d pools tracked, "
+                "%d changes appended to %s.",
+                cycle,
+                len(results),
+                len(jobs),
+                len(current),
+                written,
+                changes_path,
+            )
+            previous = current
+            # Unchanged cycles leave the served snapshot as it is, and only
+            # freshly fetched tokens go to the history, so carried-forward
+            # pools are not re-stamped as if they had just been seen.
+            if hub is not None and changes:
+                hub.publish(current, changes)
+
+            if history is not None and refreshed:
+                history.record(refreshed, fetched_at)
+                history.maintain()
+
+            summary.targets = [summaries_by_job[idx] for idx in sorted(summaries_by_job)]
+            summary.cycles = cycle
+            summary.pools_tracked = len(current)
+            summary.changes_written += written
+            summary.last_cycle_seconds = time.monotonic() - started
+
+            if max_cycles is not None and cycle >= max_cycles:
+                break
+            if scheduler is not None:
+                time.sleep(max(scheduler.config.tick_seconds, scheduler.seconds_until_due()))
+            else:
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        logger.info("Watch mode interrupted, stopping.")
+
+    return 0
+
+def run_scraper(args: argparse.Namespace) -> int:
+    configure_logging(args.log_level)
+    logger.info("Starting DexScreener Tokens Scraper.")
+
+    settings_path = SRC_DIR / "config" / "settings.example.json"
+    settings = load_settings(settings_path)
+
+    concurrency = args.concurrency or settings.get("dexscreener", {}).get("concurrency", 1)
+    pagination = settings.get("pagination", {})
+    default_max_pages = pagination.get("maxPages", 1)
+    page_size = pagination.get("pageSize", 50)
+
+    input_path = Path(args.input).resolve()
+    try:
+        targets = load_input_targets(input_path)
+    except Exception as exc:
+        logger.exception("Failed to load input targets: %s", exc)
+        return 1
+
+    json_path, csv_path = resolve_output_paths(ROOT_DIR, settings, args.output_dir)
+
+    jobs = build_fetch_jobs(targets, args.max_pages, default_max_pages, page_size, pagination)
+    alerts = None
+    alerts_cfg = settings.get("alerts", {})
+    if alerts_cfg.get("enabled", False):
+        from extractors.alert_rules import AlertRuleError
+        from outputs.alert_sinks import build_alert_engine
+
+        try:
+            alerts = build_alert_engine(alerts_cfg, ROOT_DIR, codec=codec_from_settings(settings))
+        except AlertRuleError as exc:
+            logger.error("Invalid alert settings: %s", exc)
+            return 1
+
+    client, cache = build_client(
+        settings,
+        concurrency,
+        args.cache_dir,
+        args.no_cache,
+        replay=args.replay,
+        record=args.record,
+    )
+    history = build_snapshot_store(
+        settings.get("history", {}), ROOT_DIR, disabled=args.no_history
+    )
+
+    enricher = None
+    launchpad_cfg = settings.get("launchpad", {})
+    if launchpad_cfg.get("enabled", False):
+        if args.replay and not client.session.fixture.has_path("pairs/"):
+            logger.info(
+                "Fixture %s has no recorded /pairs lookups; skipping launchpad enrichment.",
+                args.replay,
+            )
+        else:
+            from extractors.launchpad_enricher import LaunchpadEnricher
+
+            enricher = LaunchpadEnricher.from_config(launchpad_cfg, client)
+    output_cfg = settings.get("output", {})
+    summary = RunSummary()
+    summary_filename = output_cfg.get("summaryFilename", "run_summary.json")
+    profiler = profile_run(json_path.parent) if args.profile else contextlib.nullcontext()
+
+    def finish() -> None:
+        if alerts is not None:
+            summary.alerts_fired = alerts.fired
+            alerts.close()
+        counters = client.metrics.as_dict()
+        logger.info("Request metrics: %s", counters)
+        if enricher is not None:
+            counters["launchpad"] = enricher.client.metrics.as_dict()
+            logger.info("Launchpad lookup metrics: %s", counters["launchpad"])
+        if summary_filename:
+            summary_path = json_path.parent / summary_filename
+            write_run_summary(
+                summary.to_dict(counters, client.metrics.stages.as_dict()), summary_path
+            )
+            logger.info("Run summary written to %s", summary_path)
+        if cache is not None:
+            cache.close()
+        if history is not None:
+            history.close()
+        if enricher is not None:
+            enricher.close()
+        if args.record:
+            client.session.close()
+
+    if args.watch or args.serve or args.adaptive:
+        if (args.workers or settings.get("dexscreener", {}).get("workers", 1)) > 1:
+            logger.warning("--workers is ignored in watch mode; scraping in one process.")
+        changes_path = json_path.parent / output_cfg.get("changesFilename", "changes.jsonl")
+        serve_cfg = settings.get("serve", {})
+        interval = args.watch or serve_cfg.get("intervalSeconds", 30)
+        hub = snapshot_server = None
+        if args.serve:
+            from extractors.snapshot_server import SnapshotHub, SnapshotServer
+
+            hub = SnapshotHub(codec=client.codec)
+            snapshot_server = SnapshotServer.from_config(
+                serve_cfg, hub, port=args.serve_port
+            ).start()
+        scheduler = None
+        scheduler_cfg = settings.get("scheduler", {})
+        if args.adaptive or scheduler_cfg.get("enabled", False):
+            from extractors.adaptive_scheduler import build_scheduler
+
+            rate_cfg = settings.get("dexscreener", {}).get("rateLimit", {})
+            try:
+                scheduler = build_scheduler(
+                    scheduler_cfg,
+                    jobs,
+                    rate_limit_per_minute=rate_cfg.get("requestsPerMinute"),
+                    enabled=args.adaptive,
+                )
+            except ValueError as exc:
+                logger.error("Invalid scheduler settings: %s", exc)
+                finish()
+                return 1
+        if cache is not None:
+            # A cached body older than the refresh interval would hide the
+            # very updates the watch loop is refreshing for.
+            cache.cap_ttls(scheduler.config.min_interval if scheduler is not None else interval)
+        metrics_cfg = settings.get("metrics", {})
+        metrics_port = args.metrics_port or metrics_cfg.get("port")
+        metrics_server = None
+        if metrics_port:
+            metrics_server = MetricsServer(
+                metrics_cfg.get("host", "127.0.0.1"),
+                int(metrics_port),
+                lambda: render_prometheus(
+                    client.metrics.as_dict(), client.metrics.stages.snapshot(), summary.gauges()
+                ),
+            ).start()
+        try:
+            with profiler:
+                return run_watch(
+                    client,
+                    jobs,
+                    concurrency,
+                    interval,
+                    changes_path,
+                    history=history,
+                    summary=summary,
+                    enricher=enricher,
+                    alerts=alerts,
+                    hub=hub,
+                    scheduler=scheduler,
+                )
+        finally:
+            if snapshot_server is not None:
+                snapshot_server.stop()
+            if metrics_server is not None:
+                metrics_server.stop()
+            finish()
+
+    workers = args.workers or settings.get("dexscreener", {}).get("workers", 1)
+    if workers > 1 and args.record:
+        logger.warning("--workers is ignored while recording; scraping in one process.")
+        workers = 1
+    checkpoint_cfg = settings.get("checkpoint", {})
+    try:
+        checkpoint = build_run_checkpoint(
+            checkpoint_cfg,
+            ROOT_DIR,
+            jobs,
+            run_id=args.run_id,
+            resume=args.resume,
+            disabled=args.no_checkpoint,
+            codec=client.codec,
+        )
+    except CheckpointError as exc:
+        logger.error("%s", exc)
+        finish()
+        return 1
+    if checkpoint is not None and not args.resume:
+        logger.info("Checkpointing this run as '%s'.", checkpoint.run_id)
+
+    work_dir = None
+    try:
+        with profiler:
+            if workers > 1:
+                work_dir = Path(tempfile.mkdtemp(prefix=".partials-", dir=str(json_path.parent)))
+                results = run_sharded(
+                    settings, args, jobs, workers, concurrency, work_dir, client, checkpoint
+                )
+            elif checkpoint is not None:
+                pending = checkpoint.pending()
+                fetched = zip(
+                    pending, iter_targets(client, concurrency, [jobs[p] for p in pending])
+                )
+                results = checkpoint.iter_results(checkpoint.record(fetched))
+            else:
+                results = iter_targets(client, concurrency, jobs)
+            if enricher is not None:
+                results = enricher.enrich_results(results)
+            if alerts is not None:
+                results = alerts.observe_results(results)
+            writers = build_writers(
+                settings, json_path, csv_path, history=history, formats=args.format
+            )
+            exported = export_streaming(
+                summary.observe_results(results),
+                writers,
+                deduplicate=output_cfg.get("deduplicate", True),
+                timers=client.metrics.stages,
+            )
+        summary.exported = exported
+        if checkpoint is not None:
+            failed = len(checkpoint.pending())
+            if failed:
+                logger.warning(
+                    "%d targets failed; retry only those with --resume --run-id %s",
+                    failed,
+                    checkpoint.run_id,
+                )
+            else:
+                checkpoint.complete(keep=checkpoint_cfg.get("keepCompleted", False))
+    except Exception as exc:
+        logger.exception("Failed to export tokens: %s", exc)
+        if checkpoint is not None:
+            logger.error(
+                "Finished targets are checkpointed; continue with --resume --run-id %s",
+                checkpoint.run_id,
+            )
+        return 1
+    finally:
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        finish()
+
+    if not exported:
+        logger.warning("No tokens were collected; nothing to export.")
+        return 0
+
+    for writer in writers:
+        logger.info("Exported %d tokens to %s: %s", writer.count, writer.format_name, writer.output_path)
+
+    logger.info("Scraper completed successfully.")
+    return 0
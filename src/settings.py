@@ -0,0 +1,146 @@
+import importlib.util
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+SRC_DIR = Path(__file__).resolve().parent
+ROOT_DIR = SRC_DIR.parent
+
+# Installed with `pip install -e .`, models and extractors are importable and
+# the dexscreener-scraper / dexscreener-history commands need nothing more.
+# Run straight from a checkout (`python src/main.py`), only src/ is on
+# sys.path, so add the project root for models.
+for _path, _package in ((ROOT_DIR, "models"), (SRC_DIR, "extractors")):
+    if importlib.util.find_spec(_package) is None and str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+logger = logging.getLogger("dexscreener.settings")
+
+def load_settings(settings_path: Path) -> Dict[str, Any]:
+    if not settings_path.exists():
+        logger.warning("Settings file %s not found, using hardcoded defaults.", settings_path)
+        return {
+            "dexscreener": {
+                "baseUrl": "https://api.dexscreener.com/latest/dex",
+                "timeoutSeconds": 10,
+                "concurrency": 1,
+                "workers": 1,
+                "rateLimit": {
+                    "requestsPerMinute": 300,
+                    "burst": 10,
+                },
+                "retry": {
+                    "maxRetries": 3,
+                    "backoffBaseSeconds": 0.5,
+                    "backoffMaxSeconds": 30,
+                },
+                "rawRetention": {
+                    "policy": "none",
+                    "keys": ["chainId", "dexId", "pairAddress", "url", "labels"],
+                },
+            },
+            "cache": {
+                "enabled": False,
+                "directory": ".cache",
+                "defaultTtlSeconds": 30,
+                "ttlSeconds": {
+                    "search": 30,
+                },
+                "maxSizeMb": 256,
+            },
+            "pagination": {
+                "maxPages": 1,
+                "pageSize": 50,
+                "expansionTerms": [],
+                "expandFromResults": True,
+                "stopAfterEmptyPages": 2,
+            },
+            "output": {
+                "directory": "data",
+                "jsonFilename": "tokens.json",
+                "csvFilename": "tokens.csv",
+                "changesFilename": "changes.jsonl",
+                "jsonLines": False,
+                "deduplicate": True,
+                "parquetFilename": None,
+                "arrowFilename": None,
+                "summaryFilename": "run_summary.json",
+                "formats": None,
+            },
+            "metrics": {
+                "host": "127.0.0.1",
+                "port": None,
+            },
+            "json": {
+                "backend": "auto",
+            },
+            "launchpad": {
+                "enabled": False,
+                "concurrency": 4,
+                "timeoutSeconds": 10,
+                "cacheTtlSeconds": 300,
+                "cacheMaxPools": 10000,
+                "rateLimit": {
+                    "requestsPerMinute": 60,
+                    "burst": 5,
+                },
+            },
+            "serve": {
+                "host": "127.0.0.1",
+                "port": 8080,
+                "intervalSeconds": 30,
+                "defaultLimit": 100,
+                "maxLimit": 1000,
+            },
+            "scheduler": {
+                "enabled": False,
+                "requestsPerMinute": 240,
+                "minIntervalSeconds": 5,
+                "maxIntervalSeconds": 300,
+                "tickSeconds": 1,
+                "volatility5mPercent": 2,
+                "volatility1hPercent": 10,
+                "hotVolumeUsd": 100000,
+                "newPairHours": 6,
+                "newPairHeat": 20,
+            },
+            "checkpoint": {
+                "enabled": False,
+                "directory": "data/checkpoints",
+                "keepCompleted": False,
+            },
+            "alerts": {
+                "enabled": False,
+                "rules": [],
+                "sinks": [{"type": "stdout"}],
+            },
+            "history": {
+                "enabled": False,
+                "path": "data/history.sqlite3",
+                "retentionDays": 30,
+                "compactAfterHours": 24,
+                "compactBucketMinutes": 60,
+            },
+        }
+
+    with settings_path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+def resolve_output_paths(root_dir: Path, settings: Dict[str, Any], override_output_dir: str | None):
+    output_cfg = settings.get("output", {})
+    directory = override_output_dir or output_cfg.get("directory", "data")
+    json_filename = output_cfg.get("jsonFilename", "tokens.json")
+    csv_filename = output_cfg.get("csvFilename", "tokens.csv")
+
+    out_dir = (root_dir / directory).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    return out_dir / json_filename, out_dir / csv_filename
+
+def configure_logging(level: str) -> None:
+    logging.basicConfig(
+        level=getattr(logging, level.upper(), logging.INFO),
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    )
@@ -0,0 +1,108 @@
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+for path in (ROOT_DIR, ROOT_DIR / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from extractors.replay import Fixture, FixtureRecord, ReplayServer  # noqa: E402
+
+PAGE_SIZE = 30
+CHAINS = ("solana", "ethereum", "base")
+DEXES = ("raydium", "uniswap", "pumpfun")
+
+def make_pair(i: int, rng: random.Random, now_ms: int) -> Dict[str, Any]:
+    """A /search pair payload shaped like the live API's."""
+    chain = CHAINS[i % len(CHAINS)]
+    pair_address = f"Pool{i:08d}{rng.getrandbits(32):08x}"
+    return {
+        "chainId": chain,
+        "dexId": DEXES[i % len(DEXES)],
+        "url": f"https://dexscreener.com/{chain}/{pair_address.lower()}",
+        "pairAddress": pair_address,
+        "baseToken": {"address": f"Tok{i:08d}", "name": f"Token {i}", "symbol": f"T{i}"},
+        "quoteToken": {"address": "So11111111111111111111111111111111111111112", "symbol": "SOL"},
+        "priceUsd": f"{rng.random() * 10:.8f}",
+        "txns": {"h24": {"buys": rng.randint(0, 5000), "sells": rng.randint(0, 5000)}},
+        "volume": {"h24": rng.random() * 1e6},
+        "priceChange": {
+            "m5": rng.uniform(-10, 10),
+            "h1": rng.uniform(-30, 30),
+            "h6": rng.uniform(-50, 50),
+            "h24": rng.uniform(-90, 90),
+        },
+        "liquidity": {"usd": rng.random() * 1e6},
+        "fdv": rng.random() * 1e8,
+        "pairCreatedAt": now_ms - rng.randint(0, 90 * 24 * 3600 * 1000),
+        "info": {"imageUrl": f"https://dd.dexscreener.com/ds-data/tokens/{chain}/{i}.png"},
+    }
+
+def make_pairs(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    now_ms = int(time.time() * 1000)
+    return [make_pair(i, rng, now_ms) for i in range(count)]
+
+def search_record(
+    query: str, pairs: List[Dict[str, Any]], status: int = 200, **headers: str
+) -> FixtureRecord:
+    return FixtureRecord(
+        path="search",
+        params={"q": query},
+        status=status,
+        headers={"Content-Type": "application/json", **headers},
+        body=json.dumps({"schemaVersion": "1.0.0", "pairs": pairs}),
+    )
+
+def synthetic_fixture(queries: int, seed: int = 1) -> Fixture:
+    """One recorded /search page of PAGE_SIZE pairs per query `q-001`, `q-002`, ..."""
+    pairs = make_pairs(queries * PAGE_SIZE, seed)
+    fixture = Fixture()
+    for n in range(queries):
+        page = pairs[n * PAGE_SIZE : (n + 1) * PAGE_SIZE]
+        fixture.add(search_record(f"q-{n + 1:03d}", page))
+    return fixture
+
+@pytest.fixture
+def replay_server():
+    """Start a ReplayServer for a Fixture; stopped when the test ends."""
+    servers: List[ReplayServer] = []
+
+    def start(fixture: Fixture) -> ReplayServer:
+        server = ReplayServer(fixture).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+@pytest.fixture
+def override_settings(monkeypatch):
+    """
+    Patch the settings run_scraper loads. `override_settings("launchpad",
+    enabled=True)` updates that section; later calls win.
+    """
+    import scraper
+
+    load_settings = scraper.load_settings
+    overrides: Dict[str, Dict[str, Any]] = {}
+
+    def load(path: Path) -> Dict[str, Any]:
+        settings = load_settings(path)
+        for section, values in overrides.items():
+            settings.setdefault(section, {}).update(values)
+        return settings
+
+    monkeypatch.setattr(scraper, "load_settings", load)
+
+    def override(section: str, **values: Any) -> None:
+        overrides.setdefault(section, {}).update(values)
+
+    return override
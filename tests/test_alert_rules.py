@@ -0,0 +1,178 @@
+import pytest
+
+from extractors.alert_rules import (
+    AlertEngine,
+    AlertRuleError,
+    RollingExtreme,
+    compile_rule,
+    compile_rules,
+    compile_token_condition,
+)
+from models.token_model import Token
+
+def make_token(chain="solana", launchpad=None, volume=None, liquidity=None, pool="pool1"):
+    return Token(
+        pairDetailUrl=f"https://dexscreener.com/{chain}/{pool}",
+        lowerPoolAddress=pool,
+        launchpadPlatform=launchpad,
+        volumeUsd=volume,
+        liquidityUsd=liquidity,
+    )
+
+@pytest.mark.parametrize("value", [5, 1.5, True, {"solana": 1}, ["solana", 5], [None]])
+def test_membership_condition_rejects_non_strings(value):
+    with pytest.raises(AlertRuleError, match="string or a list of strings"):
+        compile_token_condition("chainId", value)
+
+def test_bad_membership_value_in_a_rule_is_a_rule_error():
+    with pytest.raises(AlertRuleError, match="Rule 'r'"):
+        compile_rule({"name": "r", "when": {"chainId": 5}})
+    with pytest.raises(AlertRuleError, match="cooldownMinutes"):
+        compile_rule({"name": "r", "when": {"chainId": "solana"}, "cooldownMinutes": "soon"})
+
+def test_membership_condition_matches_case_insensitively():
+    single = compile_token_condition("chainId", "Solana")
+    several = compile_token_condition("launchpadPlatform", ["moonshot", "PUMP.FUN"])
+
+    assert single(make_token())
+    assert not single(make_token(chain="base"))
+    assert several(make_token(launchpad="pump.fun"))
+    assert not several(make_token())
+
+def test_rule_combines_static_conditions():
+    rule = compile_rule({"name": "r", "when": {"chainId": ["solana"], "minVolumeUsd": 1000}})
+
+    assert rule.fields == ("volumeUsd",)
+    assert all(p(make_token(volume=5000.0)) for p in rule.predicates)
+    assert not all(p(make_token(volume=10.0)) for p in rule.predicates)
+
+class RecordingSink:
+    def __init__(self):
+        self.alerts = []
+
+    def emit(self, alert):
+        self.alerts.append(alert)
+
+    def close(self):
+        pass
+
+def engine_for(*specs):
+    sink = RecordingSink()
+    return AlertEngine(compile_rules(specs), [sink]), sink
+
+def feed(engine, samples):
+    """Evaluate (seconds, pool, liquidity, volume) samples; returns when each alert fired."""
+    fired = []
+    for ts, pool, liquidity, volume in samples:
+        token = make_token(pool=pool, liquidity=liquidity, volume=volume)
+        fired.extend((ts, alert.rule, pool) for alert in engine.evaluate(token, now=ts))
+    return fired
+
+def test_rolling_extreme_reports_the_window_extreme_before_each_sample():
+    high = RollingExtreme(window=60, is_max=True)
+    low = RollingExtreme(window=60, is_max=False)
+
+    assert [high.push(ts, v) for ts, v in [(0, 5), (10, 9), (20, 7), (70, 1), (75, 2)]] == [
+        None, 5, 9, 9, 7,
+    ]
+    assert [low.push(ts, v) for ts, v in [(0, 5), (10, 9), (20, 3), (70, 4)]] == [None, 5, 5, 3]
+
+def test_drop_fires_against_the_window_high_only_inside_the_window():
+    engine, sink = engine_for(
+        {
+            "name": "drain",
+            "when": {"dropLiquidityUsd": {"percent": 50, "withinMinutes": 5}},
+            "cooldownMinutes": 0,
+        }
+    )
+
+    fired = feed(
+        engine,
+        [
+            (0, "a", 1000.0, None),
+            (60, "a", 800.0, None),
+            (120, "a", 450.0, None),
+            # The 1000 high left the window at 300s; 800 is the reference now.
+            (330, "a", 390.0, None),
+            (400, "b", 1000.0, None),
+            (800, "b", 400.0, None),
+        ],
+    )
+
+    assert fired == [(120, "drain", "a"), (330, "drain", "a")]
+    assert [alert.values for alert in sink.alerts] == [
+        {"liquidityUsd": 450.0, "liquidityUsdWindowRef": 1000.0},
+        {"liquidityUsd": 390.0, "liquidityUsdWindowRef": 800.0},
+    ]
+    assert engine.fired == 2
+
+def test_rise_needs_every_condition_of_the_rule():
+    engine, _ = engine_for(
+        {
+            "name": "pump",
+            "when": {
+                "riseVolumeUsd": {"percent": 100, "withinMinutes": 1},
+                "minLiquidityUsd": 500,
+            },
+            "cooldownMinutes": 0,
+        }
+    )
+
+    fired = feed(
+        engine,
+        [
+            (0, "a", 100.0, 200.0),
+            (10, "a", 100.0, 100.0),
+            (20, "a", 100.0, 250.0),
+            (30, "a", 600.0, 250.0),
+            (40, "a", 600.0, None),
+        ],
+    )
+
+    # At 20s the volume doubled from the low but liquidity was under 500.
+    assert fired == [(30, "pump", "a")]
+
+def test_cooldown_suppresses_repeats_per_pool_and_rule():
+    engine, _ = engine_for(
+        {"name": "big", "when": {"minVolumeUsd": 1000}, "cooldownMinutes": 10},
+        {"name": "huge", "when": {"minVolumeUsd": 5000}, "cooldownMinutes": 1},
+    )
+
+    fired = feed(
+        engine,
+        [
+            (0, "a", None, 5000.0),
+            (30, "b", None, 2000.0),
+            (59, "a", None, 5000.0),
+            (60, "a", None, 5000.0),
+            (599, "a", None, 2000.0),
+            (600, "a", None, 2000.0),
+        ],
+    )
+
+    assert fired == [
+        (0, "big", "a"),
+        (0, "huge", "a"),
+        (30, "big", "b"),
+        (60, "huge", "a"),
+        (600, "big", "a"),
+    ]
+
+def test_prune_drops_pools_not_seen_within_the_window_or_cooldown():
+    engine, _ = engine_for(
+        {
+            "name": "drain",
+            "when": {"dropLiquidityUsd": {"percent": 50, "withinMinutes": 5}},
+            "cooldownMinutes": 10,
+        }
+    )
+    feed(engine, [(0, "a", 1000.0, None), (100, "a", 400.0, None), (500, "b", 1000.0, None)])
+
+    assert len(engine) == 2
+    assert engine.prune(now=700) == 0
+    assert engine.prune(now=701) == 1
+    assert len(engine) == 1
+    # The expired cooldown went with it, and a returning pool starts a fresh window.
+    assert feed(engine, [(710, "a", 400.0, None), (720, "a", 100.0, None)]) == [
+        (720, "drain", "a")
+    ]
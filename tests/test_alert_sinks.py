@@ -0,0 +1,140 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from extractors.alert_rules import Alert, AlertRuleError
+from models.token_model import Token
+from outputs.alert_sinks import (
+    FileAlertSink,
+    WebhookAlertSink,
+    build_alert_engine,
+    build_alert_sinks,
+)
+
+def make_alert(rule="r", volume=5000.0):
+    token = Token(
+        tokenSymbol="AAA",
+        volumeUsd=volume,
+        pairDetailUrl="https://dexscreener.com/solana/pool1",
+        lowerPoolAddress="pool1",
+    )
+    return Alert(rule, 0.0, "solana", token, {"volumeUsd": volume})
+
+class WebhookReceiver(ThreadingHTTPServer):
+    """Collects POSTed alert bodies; answers with `status` once `release` is set."""
+
+    daemon_threads = True
+
+    def __init__(self, status=200):
+        super().__init__(("127.0.0.1", 0), _ReceiverHandler)
+        self.status = status
+        self.received = []
+        self.headers = []
+        self.release = threading.Event()
+        self.release.set()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+class _ReceiverHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append(json.loads(body))
+        self.server.headers.append(dict(self.headers))
+        self.server.release.wait(timeout=5)
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def receiver():
+    servers = []
+
+    def start(status=200):
+        server = WebhookReceiver(status)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def test_file_sink_appends_one_json_line_per_alert(tmp_path):
+    path = tmp_path / "nested" / "alerts.jsonl"
+    sink = FileAlertSink(path)
+
+    sink.emit(make_alert("first"))
+    # Flushed per alert, so the line is readable while the sink is open.
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    sink.close()
+    sink.emit(make_alert("second"))
+    sink.close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["rule"] for line in lines] == ["first", "second"]
+    assert lines[0]["lowerPoolAddress"] == "pool1"
+    assert lines[0]["timestamp"] == "1970-01-01T00:00:00+00:00"
+    assert lines[0]["text"] == (
+        "[first] AAA on solana (https://dexscreener.com/solana/pool1): volumeUsd=5000.0"
+    )
+
+def test_webhook_sink_posts_every_alert_before_close(receiver):
+    server = receiver()
+    sink = WebhookAlertSink(server.url, timeout=2, headers={"X-Token": "secret"})
+
+    for n in range(3):
+        sink.emit(make_alert(f"r{n}"))
+    sink.close()
+
+    assert sink.sent == 3 and sink.failed == 0
+    assert [body["rule"] for body in server.received] == ["r0", "r1", "r2"]
+    assert server.headers[0]["X-Token"] == "secret"
+    assert server.headers[0]["Content-Type"] == "application/json"
+
+def test_webhook_sink_counts_failed_and_dropped_deliveries(receiver):
+    server = receiver(status=500)
+    server.release.clear()
+    sink = WebhookAlertSink(server.url, timeout=2, max_pending=1)
+
+    # The first alert holds the delivery thread, so the second fills the queue.
+    sink.emit(make_alert("sending"))
+    while not server.received:
+        time.sleep(0.01)
+    sink.emit(make_alert("queued"))
+    sink.emit(make_alert("dropped"))
+    server.release.set()
+    sink.close()
+
+    assert sink.sent == 0
+    assert sink.failed == 3
+    assert [body["rule"] for body in server.received] == ["sending", "queued"]
+
+def test_sinks_and_engine_are_built_from_settings(tmp_path):
+    sinks = build_alert_sinks([{"type": "file", "path": "out/alerts.jsonl"}], tmp_path)
+    assert sinks[0].output_path == tmp_path / "out" / "alerts.jsonl"
+    with pytest.raises(AlertRuleError, match="need a 'url'"):
+        build_alert_sinks([{"type": "webhook"}], tmp_path)
+    with pytest.raises(AlertRuleError, match="Unknown alert sink type 'sms'"):
+        build_alert_sinks([{"type": "sms"}], tmp_path)
+
+    config = {
+        "enabled": True,
+        "rules": [{"name": "big", "when": {"minVolumeUsd": 1000}}],
+        "sinks": [{"type": "file", "path": "alerts.jsonl"}],
+    }
+    assert build_alert_engine({**config, "enabled": False}, tmp_path) is None
+    engine = build_alert_engine(config, tmp_path)
+    engine.evaluate(make_alert().token, now=0.0)
+    engine.close()
+
+    (line,) = (tmp_path / "alerts.jsonl").read_text(encoding="utf-8").splitlines()
+    assert json.loads(line)["rule"] == "big"
@@ -0,0 +1,76 @@
+import pytest
+
+from conftest import make_pairs, search_record, synthetic_fixture
+from extractors.async_client import FetchJob, build_pooled_session, iter_fetch_results
+from extractors.dexscreener_parser import DexScreenerClient
+from extractors.rate_limiter import RetryPolicy
+from extractors.replay import Fixture
+from scraper import iter_serial
+
+def make_client(server, concurrency=1, max_retries=0):
+    return DexScreenerClient(
+        base_url=server.base_url,
+        session=build_pooled_session(concurrency) if concurrency > 1 else None,
+        retry_policy=RetryPolicy(max_retries=max_retries, backoff_base=0.0),
+    )
+
+def exported(results):
+    # `age` is measured against each fetch's own clock, so it is compared
+    # separately with a tolerance.
+    return [
+        [{k: v for k, v in token.to_dict().items() if k != "age"} for token in result.tokens]
+        for result in results
+    ]
+
+def test_concurrent_matches_serial(replay_server):
+    server = replay_server(synthetic_fixture(12))
+    jobs = [FetchJob(query=f"q-{n:03d}") for n in range(1, 13)]
+
+    serial = list(iter_serial(make_client(server), jobs))
+    concurrent = list(iter_fetch_results(jobs, client=make_client(server, 4), concurrency=4))
+
+    assert [r.job.query for r in concurrent] == [job.query for job in jobs]
+    assert all(r.ok for r in serial + concurrent)
+    assert sum(len(r.tokens) for r in serial) == 12 * 30
+    assert exported(concurrent) == exported(serial)
+    for left, right in zip(serial, concurrent):
+        for a, b in zip(left.tokens, right.tokens):
+            assert a.age == pytest.approx(b.age, abs=0.01)
+
+def test_failing_target_is_isolated(replay_server):
+    fixture = synthetic_fixture(3)
+    fixture.add(search_record("broken", [], status=500))
+    server = replay_server(fixture)
+    jobs = [FetchJob(query=q) for q in ("q-001", "broken", "q-002", "q-003")]
+
+    results = list(iter_fetch_results(jobs, client=make_client(server, 4), concurrency=4))
+
+    assert [len(r.tokens) for r in results] == [30, 0, 30, 30]
+    assert [r.ok for r in results] == [True, False, True, True]
+
+def test_429_is_retried_after_retry_after(replay_server):
+    fixture = Fixture()
+    fixture.add(search_record("hot", [], status=429, **{"Retry-After": "0"}))
+    fixture.add(search_record("hot", make_pairs(5)))
+    server = replay_server(fixture)
+    client = make_client(server, max_retries=2)
+
+    results = list(iter_serial(client, [FetchJob(query="hot")]))
+
+    assert len(results[0].tokens) == 5
+    assert client.metrics.retries == 1
+    assert client.metrics.failures == 0
+
+def test_429_gives_up_after_max_retries(replay_server):
+    fixture = Fixture()
+    for _ in range(3):
+        fixture.add(search_record("hot", [], status=429, **{"Retry-After": "0"}))
+    fixture.add(search_record("hot", make_pairs(5)))
+    server = replay_server(fixture)
+    client = make_client(server, max_retries=1)
+
+    results = list(iter_serial(client, [FetchJob(query="hot")]))
+
+    assert results[0].tokens == []
+    assert not results[0].ok
+    assert client.metrics.retries == 1
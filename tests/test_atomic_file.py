@@ -0,0 +1,44 @@
+import os
+import stat
+
+import pytest
+
+from models.token_model import Token
+from outputs.atomic_file import DEFAULT_FILE_MODE, AtomicFileWriter
+from outputs.csv_exporter import CsvTokenWriter
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+def test_new_export_gets_umask_mode(tmp_path):
+    with CsvTokenWriter(tmp_path / "tokens.csv") as writer:
+        writer.write(Token(tokenName="A"))
+
+    assert mode(tmp_path / "tokens.csv") == DEFAULT_FILE_MODE
+
+def test_replaced_export_keeps_its_mode(tmp_path):
+    path = tmp_path / "tokens.csv"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+
+    with CsvTokenWriter(path) as writer:
+        writer.write(Token(tokenName="A"))
+
+    assert mode(path) == 0o640
+    assert "A" in path.read_text()
+
+def test_failed_export_leaves_previous_file(tmp_path):
+    path = tmp_path / "tokens.csv"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with CsvTokenWriter(path) as writer:
+            writer.write(Token(tokenName="A"))
+            raise RuntimeError("boom")
+
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["tokens.csv"]
+
+def test_writer_base_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        AtomicFileWriter(tmp_path / "out")
@@ -0,0 +1,54 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT_DIR
+from outputs.formats import parse_formats, selected_formats
+from settings import SRC_DIR, load_settings
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+
+def test_parse_formats_accepts_a_string_or_a_list():
+    assert parse_formats("json, CSV") == ["json", "csv"]
+    assert parse_formats(["json,csv", "parquet", "json"]) == ["json", "csv", "parquet"]
+    with pytest.raises(ValueError, match="Unknown output format 'xml'"):
+        parse_formats("json,xml")
+
+def test_formats_setting_may_be_a_comma_separated_string():
+    assert selected_formats({"formats": "csv,arrow"}) == ["csv", "arrow"]
+    assert selected_formats({"formats": "csv"}, override=["json"]) == ["json"]
+    assert selected_formats({"parquetFilename": "t.parquet"}) == ["json", "csv", "parquet"]
+
+def test_pipeline_does_not_import_the_cli():
+    probe = (
+        "import sys; sys.path.insert(0, 'src'); import scraper, history; "
+        "print('main' in sys.modules)"
+    )
+
+    assert run_python("-c", probe).stdout.strip() == "False"
+    assert "--replay" in run_python("src/main.py", "--help").stdout
+
+def test_console_scripts_point_at_the_cli_mains():
+    tomllib = pytest.importorskip("tomllib")
+    with (ROOT_DIR / "pyproject.toml").open("rb") as f:
+        scripts = tomllib.load(f)["project"]["scripts"]
+
+    assert sorted(scripts) == ["dexscreener-history", "dexscreener-scraper"]
+    for target in scripts.values():
+        module, _, name = target.partition(":")
+        assert callable(getattr(importlib.import_module(module), name))
+
+def test_features_that_write_state_or_add_requests_are_opt_in(tmp_path):
+    example = load_settings(SRC_DIR / "config" / "settings.example.json")
+    defaults = load_settings(tmp_path / "missing.json")
+
+    for settings in (example, defaults):
+        assert {
+            section: settings[section]["enabled"]
+            for section in ("cache", "history", "checkpoint", "launchpad")
+        } == {"cache": False, "history": False, "checkpoint": False, "launchpad": False}
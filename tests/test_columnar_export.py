@@ -0,0 +1,72 @@
+import json
+import math
+
+import pytest
+
+from conftest import make_pairs
+from models.token_batch import TokenBatch
+from models.token_model import EXPORT_FIELDS, Token
+from outputs.json_exporter import JsonTokenWriter
+from outputs.parquet_exporter import ArrowTokenWriter, ParquetTokenWriter
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+NOW = 1_700_000_000.0
+
+def edge_pairs():
+    pairs = make_pairs(3, seed=7)
+    # Missing sections, non-numeric and non-finite numbers.
+    pairs[0]["priceUsd"] = "NaN"
+    pairs[0]["liquidity"] = {"usd": "Infinity"}
+    del pairs[1]["volume"]
+    pairs[1]["fdv"] = "not a number"
+    pairs[2]["baseToken"] = {"address": "Tok-x"}
+    pairs[2]["txns"] = None
+    return make_pairs(200) + pairs
+
+def read_json(path):
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+def assert_rows_equal(expected, actual):
+    assert len(actual) == len(expected)
+    for want, got in zip(expected, actual):
+        assert list(got) == list(EXPORT_FIELDS)
+        for name in EXPORT_FIELDS:
+            a, b = want[name], got[name]
+            assert not (isinstance(b, float) and math.isnan(b)), name
+            assert a == b, (name, a, b)
+
+@pytest.mark.parametrize("writer_class", [ParquetTokenWriter, ArrowTokenWriter])
+def test_columnar_values_match_json(tmp_path, writer_class):
+    pairs = edge_pairs()
+    batch = TokenBatch.from_pair_payloads(pairs, now=NOW)
+    tokens = Token.from_pair_payloads(pairs, now=NOW)
+    assert list(batch.rows()) == [token.to_dict() for token in tokens]
+
+    with JsonTokenWriter(tmp_path / "tokens.json") as writer:
+        writer.write_many(tokens)
+    with writer_class(tmp_path / "tokens.bin") as writer:
+        writer.write_batch(batch)
+
+    if writer_class is ParquetTokenWriter:
+        table = pq.read_table(tmp_path / "tokens.bin")
+    else:
+        table = pa.ipc.open_file(pa.memory_map(str(tmp_path / "tokens.bin"))).read_all()
+    assert_rows_equal(read_json(tmp_path / "tokens.json"), table.to_pylist())
+
+    edge = table.to_pylist()[-3:]
+    assert edge[0]["priceUsd"] is None and edge[0]["liquidityUsd"] is None
+    assert edge[1]["volumeUsd"] is None and edge[1]["marketCapUsd"] is None
+    assert edge[2]["tokenName"] is None and edge[2]["transactionCount"] is None
+
+def test_nan_in_tokens_is_written_as_null(tmp_path):
+    tokens = [Token(tokenName="A", priceUsd=float("nan"), volumeUsd=1.5)]
+
+    with ParquetTokenWriter(tmp_path / "tokens.parquet", row_group_size=1) as writer:
+        writer.write_many(tokens)
+
+    row = pq.read_table(tmp_path / "tokens.parquet").to_pylist()[0]
+    assert row["priceUsd"] is None
+    assert row["volumeUsd"] == 1.5
@@ -0,0 +1,61 @@
+import json
+
+from extractors.async_client import FetchJob, FetchResult
+from models.token_model import Token
+from outputs.json_exporter import JsonTokenWriter
+from scraper import export_streaming
+
+def token(pool, name, chain="solana"):
+    url = f"https://dexscreener.com/{chain}/{pool}" if pool else None
+    return Token(tokenName=name, pairDetailUrl=url, lowerPoolAddress=pool)
+
+def result(query, *tokens):
+    return FetchResult(job=FetchJob(query=query), tokens=list(tokens))
+
+def export(tmp_path, results, deduplicate):
+    path = tmp_path / "tokens.json"
+    exported = export_streaming(
+        iter(results), [JsonTokenWriter(path)], deduplicate=deduplicate
+    )
+    with path.open(encoding="utf-8") as f:
+        return exported, [row["tokenName"] for row in json.load(f)]
+
+def test_duplicates_are_written_once_in_first_seen_order(tmp_path):
+    results = [
+        result("a", token("p1", "one"), token("p2", "two")),
+        result("b", token("p2", "two again"), token("p1", "one", chain="base"), token("p3", "three")),
+    ]
+
+    exported, names = export(tmp_path, results, deduplicate=True)
+
+    assert names == ["one", "two", "one", "three"]
+    assert exported == 4
+
+def test_tokens_without_pool_address_are_kept(tmp_path):
+    results = [
+        result("a", token(None, "no pool"), token("p1", "one")),
+        result("b", token(None, "no pool"), token("p1", "dup")),
+    ]
+
+    exported, names = export(tmp_path, results, deduplicate=True)
+
+    assert names == ["no pool", "one", "no pool"]
+    assert exported == 3
+
+def test_without_deduplicate_everything_is_written(tmp_path):
+    results = [result("a", token("p1", "one")), result("b", token("p1", "dup"))]
+
+    assert export(tmp_path, results, deduplicate=False) == (2, ["one", "dup"])
+
+def test_nothing_exported_keeps_previous_file(tmp_path):
+    path = tmp_path / "tokens.json"
+    path.write_text("previous")
+
+    exported = export_streaming(
+        iter([FetchResult(job=FetchJob(query="x"), error=RuntimeError("down"))]),
+        [JsonTokenWriter(path)],
+        deduplicate=True,
+    )
+
+    assert exported == 0
+    assert path.read_text() == "previous"
@@ -0,0 +1,70 @@
+import json
+import logging
+import sys
+
+import pytest
+
+from conftest import make_pairs
+from extractors import json_codec
+from extractors.json_codec import BACKENDS, JsonCodec, codec_from_settings, get_codec
+from models.token_model import Token
+
+def load_or_skip(backend):
+    codec = json_codec._load_backend(backend)
+    if codec is None:
+        pytest.skip(f"{backend.name} is not installed")
+    return codec
+
+@pytest.fixture
+def records():
+    tokens = [Token.from_pair_payload(pair).to_dict() for pair in make_pairs(20, seed=3)]
+    return tokens + [{"tokenName": "Ünïcode ✓", "priceUsd": 1e-05, "volumeUsd": None}]
+
+@pytest.fixture
+def fresh_codecs(monkeypatch):
+    """Forget codecs get_codec has already picked, so fallbacks are resolved again."""
+    monkeypatch.setattr(json_codec, "_codecs", {})
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda backend: backend.name)
+def test_every_backend_round_trips_the_same_records(backend, records):
+    codec = load_or_skip(backend)
+    stdlib = JsonCodec()
+
+    for record in records:
+        assert codec.loads(codec.dumps(record)) == record
+        assert codec.loads(codec.dumps(record).encode("utf-8")) == record
+        assert stdlib.loads(codec.dumps(record)) == record
+        assert codec.loads(stdlib.dumps(record)) == record
+    indented = codec.dumps_indented(records)
+    assert indented.startswith("[\n  {")
+    assert codec.loads(memoryview(indented.encode("utf-8"))) == records
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda backend: backend.name)
+def test_every_backend_reports_malformed_input_and_encodes_what_it_refuses(backend):
+    codec = load_or_skip(backend)
+
+    with pytest.raises(ValueError):
+        codec.loads(b'{"pairs": [')
+    # Non-string keys and big ints fall back to the stdlib encoder.
+    assert codec.dumps({1: 2**70}) == json.dumps({1: 2**70})
+
+def test_missing_backend_falls_back_to_the_stdlib(monkeypatch, fresh_codecs, caplog):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    with caplog.at_level(logging.WARNING, logger="dexscreener.extractors.json_codec"):
+        codec = get_codec("orjson")
+
+    assert type(codec) is JsonCodec
+    assert "'orjson' is not installed" in caplog.text
+    assert type(get_codec("auto")) is JsonCodec
+    assert get_codec("stdlib") is get_codec("json")
+
+def test_auto_picks_the_fastest_installed_backend(monkeypatch, fresh_codecs):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    expected = json_codec._load_backend(json_codec.MsgspecCodec) or JsonCodec()
+
+    assert codec_from_settings({}).name == expected.name
+    assert codec_from_settings({"json": {"backend": "AUTO"}}) is codec_from_settings({})
+    with pytest.raises(ValueError, match="Unknown JSON backend 'ujson'"):
+        get_codec("ujson")
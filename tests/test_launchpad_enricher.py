@@ -0,0 +1,86 @@
+import json
+import logging
+
+from conftest import make_pairs, search_record
+from extractors.dexscreener_parser import DexScreenerClient
+from extractors.launchpad_enricher import LaunchpadEnricher
+from extractors.rate_limiter import build_rate_limiter
+from extractors.replay import Fixture, FixtureRecord, ReplaySession
+from main import build_arg_parser
+from models.token_model import Token
+from scraper import run_scraper
+
+BASE_URL = "https://api.dexscreener.com/latest/dex"
+
+def moonshot_pair(n):
+    return {
+        "chainId": "solana",
+        "dexId": "moonshot",
+        "url": f"https://dexscreener.com/solana/pool{n}",
+        "pairAddress": f"pool{n}",
+        "moonshot": {"progress": 10.0 * n, "status": "active"},
+    }
+
+def pairs_record(n):
+    return FixtureRecord(
+        path=f"pairs/solana/pool{n}",
+        headers={"Content-Type": "application/json"},
+        body=json.dumps({"pairs": [moonshot_pair(n)]}),
+    )
+
+def test_lookups_use_a_client_of_their_own():
+    core = DexScreenerClient(rate_limiter=build_rate_limiter({"requestsPerMinute": 300}))
+    core.cache = object()
+
+    enricher = LaunchpadEnricher.from_config(
+        {"enabled": True, "rateLimit": {"requestsPerMinute": 30, "burst": 2}}, core
+    )
+
+    assert enricher.client is not core
+    assert enricher.client.session is core.session
+    assert enricher.client.rate_limiter is not core.rate_limiter
+    assert enricher.client.cache is None
+    assert enricher.client.metrics is not core.metrics
+
+def test_cache_keeps_at_most_cache_size_pools():
+    fixture = Fixture(pairs_record(n) for n in range(5))
+    client = DexScreenerClient(base_url=BASE_URL, session=ReplaySession(fixture, BASE_URL))
+    enricher = LaunchpadEnricher(client, cache_size=3)
+    tokens = [Token.from_pair_payload(moonshot_pair(n)) for n in range(5)]
+
+    for token in tokens:
+        enricher.enrich([token])
+    enricher.close()
+
+    assert list(enricher._cache) == [("solana", f"pool{n}") for n in (2, 3, 4)]
+    assert [t.launchpadProgress for t in tokens] == [0.0, 10.0, 20.0, 30.0, 40.0]
+    assert client.metrics.launchpads_enriched == 5
+
+def test_pumpswap_pairs_are_not_launchpad_pairs():
+    pair = dict(moonshot_pair(1), dexId="pumpswap")
+
+    assert Token.from_pair_payload(pair).launchpadPlatform is None
+    assert Token.from_pair_payload(dict(pair, dexId="pumpfun")).launchpadPlatform == "pump.fun"
+
+def test_replay_without_lookups_skips_enrichment(override_settings, tmp_path, caplog):
+    override_settings("launchpad", enabled=True)
+    fixture = Fixture([search_record("q", make_pairs(3) + [moonshot_pair(1)])])
+    fixture.save(tmp_path / "fixture.jsonl")
+    (tmp_path / "inputs.json").write_text(json.dumps([{"query": "q"}]), encoding="utf-8")
+    args = build_arg_parser().parse_args(
+        [
+            "--input", str(tmp_path / "inputs.json"),
+            "--output-dir", str(tmp_path / "out"),
+            "--replay", str(tmp_path / "fixture.jsonl"),
+            "--no-history",
+            "--no-checkpoint",
+        ]
+    )
+
+    with caplog.at_level(logging.INFO):
+        assert run_scraper(args) == 0
+
+    assert not [r for r in caplog.records if r.levelno >= logging.WARNING]
+    assert "skipping launchpad enrichment" in caplog.text
+    exported = json.loads((tmp_path / "out" / "tokens.json").read_text(encoding="utf-8"))
+    assert [t["launchpadPlatform"] for t in exported] == [None, None, "pump.fun", "moonshot"]
@@ -0,0 +1,113 @@
+import pytest
+
+from conftest import make_pairs
+from extractors.dexscreener_parser import DexScreenerClient
+from extractors.pair_filters import FilterSpecError, compile_pipeline
+from models.token_model import Token
+
+NOW = 1_700_000_000.0
+
+def tokens(pairs):
+    return Token.from_pair_payloads(pairs, now=NOW)
+
+@pytest.mark.parametrize("value", [5, None, {"solana": True}, ["solana", 3]])
+def test_membership_filter_rejects_non_strings(value):
+    with pytest.raises(FilterSpecError, match="chainId"):
+        compile_pipeline({"query": "x", "filters": {"chainId": value}})
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        {"filters": {"minFoo": 1}},
+        {"filters": {"minVolumeUsd": "lots"}},
+        {"filters": ["minVolumeUsd"]},
+        {"sortBy": "tokenName"},
+        {"sortOrder": "sideways", "limit": 3},
+        {"limit": -1},
+    ],
+)
+def test_invalid_specs_raise_filter_spec_error(target):
+    with pytest.raises(FilterSpecError):
+        compile_pipeline({"query": "x", **target})
+
+def test_filters_match_the_exported_token_values():
+    pairs = make_pairs(300)
+    pipeline = compile_pipeline(
+        {
+            "query": "x",
+            "filters": {"chainId": ["solana", "BASE"], "minVolumeUsd": 250000, "maxAge": 1000},
+        }
+    )
+
+    kept = tokens(pipeline.apply(pairs, NOW))
+
+    expected = [
+        token
+        for token, pair in zip(tokens(pairs), pairs)
+        if pair["chainId"] in ("solana", "base")
+        and token.volumeUsd >= 250000
+        and token.age <= 1000
+    ]
+    assert [t.to_dict() for t in kept] == [t.to_dict() for t in expected]
+
+def test_top_n_ranks_missing_values_last():
+    pairs = make_pairs(50)
+    del pairs[3]["liquidity"]
+    pipeline = compile_pipeline({"query": "x", "sortBy": "liquidityUsd", "sortOrder": "asc"})
+
+    ranked = tokens(pipeline.apply(pairs, NOW))
+
+    values = [t.liquidityUsd for t in ranked]
+    assert values[-1] is None
+    assert values[:-1] == sorted(values[:-1])
+
+    top = compile_pipeline({"query": "x", "sortBy": "liquidityUsd", "limit": 5})
+    assert [t.liquidityUsd for t in tokens(top.apply(pairs, NOW))] == sorted(
+        values[:-1], reverse=True
+    )[:5]
+
+@pytest.fixture
+def extract_calls(monkeypatch):
+    """Count extract_pair_values calls made by the pipeline and the Token build."""
+    import extractors.pair_filters as pair_filters
+    import models.token_model as token_model
+
+    calls = []
+    original = token_model.extract_pair_values
+
+    def counting(pair, now=None):
+        calls.append(pair["pairAddress"])
+        return original(pair, now)
+
+    monkeypatch.setattr(pair_filters, "extract_pair_values", counting)
+    monkeypatch.setattr(token_model, "extract_pair_values", counting)
+    return calls
+
+def test_membership_only_filters_do_not_map_pairs(extract_calls):
+    pairs = make_pairs(30)
+    pipeline = compile_pipeline({"query": "x", "filters": {"dexId": "raydium"}, "limit": 4})
+
+    rows = pipeline.select(pairs, NOW)
+
+    assert [pair["dexId"] for pair, _ in rows] == ["raydium"] * 4
+    assert all(values is None for _, values in rows)
+    assert extract_calls == []
+
+def test_kept_pairs_are_mapped_once(extract_calls):
+    pairs = make_pairs(60)
+    client = DexScreenerClient()
+    pipeline = compile_pipeline(
+        {
+            "query": "x",
+            "filters": {"chainId": "solana", "minVolumeUsd": 100000},
+            "sortBy": "volumeUsd",
+            "limit": 5,
+        }
+    )
+
+    kept = client.tokens_from_pairs("x", pairs, pipeline=pipeline, now=NOW)
+
+    solana = [pair["pairAddress"] for pair in pairs if pair["chainId"] == "solana"]
+    assert extract_calls == solana
+    assert [t.to_dict() for t in kept] == [t.to_dict() for t in tokens(pipeline.apply(pairs, NOW))]
+    assert len(kept) == 5
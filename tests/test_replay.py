@@ -0,0 +1,120 @@
+import csv
+import json
+
+from conftest import make_pairs, search_record, synthetic_fixture
+from extractors.async_client import FetchJob
+from extractors.dexscreener_parser import DexScreenerClient
+from extractors.replay import Fixture, RecordingSession, ReplaySession
+from main import build_arg_parser
+from models.token_model import EXPORT_FIELDS, Token
+from scraper import iter_serial, run_scraper
+
+BASE_URL = "https://api.dexscreener.com/latest/dex"
+
+def without_age(rows):
+    return [{k: v for k, v in row.items() if k != "age"} for row in rows]
+
+def test_fixture_round_trips_and_replays_in_order(tmp_path):
+    fixture = Fixture()
+    fixture.add(search_record("q", make_pairs(2)))
+    fixture.add(search_record("q", make_pairs(3)))
+    fixture.add(search_record("other", [], status=500))
+    fixture.save(tmp_path / "fixture.jsonl")
+
+    loaded = Fixture.load(tmp_path / "fixture.jsonl")
+
+    assert [r.to_dict() for r in loaded] == [r.to_dict() for r in fixture]
+    assert loaded.search_queries() == ["q", "other"]
+    served = [loaded.response_for("search", {"q": "q"}) for _ in range(3)]
+    assert [len(json.loads(r.body)["pairs"]) for r in served] == [2, 3, 3]
+    assert loaded.response_for("search", {"q": "missing"}) is None
+
+def test_recorded_run_replays_to_the_same_tokens(replay_server, tmp_path):
+    server = replay_server(synthetic_fixture(3))
+    jobs = [FetchJob(query=q) for q in ("q-001", "q-002", "q-003")]
+    session = RecordingSession(tmp_path / "recorded.jsonl", server.base_url)
+    live = list(iter_serial(DexScreenerClient(base_url=server.base_url, session=session), jobs))
+    session.close()
+
+    replay = ReplaySession(Fixture.load(tmp_path / "recorded.jsonl"), BASE_URL)
+    replayed = list(iter_serial(DexScreenerClient(base_url=BASE_URL, session=replay), jobs))
+
+    assert session.recorded == 3
+    assert replay.misses == 0
+    assert [without_age(t.to_dict() for t in r.tokens) for r in replayed] == [
+        without_age(t.to_dict() for t in r.tokens) for r in live
+    ]
+
+def test_replayed_scrape_exports_every_recorded_pair(tmp_path):
+    fixture = synthetic_fixture(4)
+    fixture.save(tmp_path / "fixture.jsonl")
+    (tmp_path / "inputs.json").write_text(
+        json.dumps([{"query": q} for q in fixture.search_queries()]), encoding="utf-8"
+    )
+    expected = without_age(
+        Token.from_pair_payload(pair).to_dict()
+        for record in fixture
+        for pair in json.loads(record.body)["pairs"]
+    )
+    args = build_arg_parser().parse_args(
+        [
+            "--input", str(tmp_path / "inputs.json"),
+            "--output-dir", str(tmp_path / "out"),
+            "--replay", str(tmp_path / "fixture.jsonl"),
+            "--format", "json,csv",
+            "--no-history",
+            "--no-checkpoint",
+            "--log-level", "WARNING",
+        ]
+    )
+
+    assert run_scraper(args) == 0
+
+    exported = json.loads((tmp_path / "out" / "tokens.json").read_text(encoding="utf-8"))
+    assert len(exported) == 4 * 30
+    assert without_age(exported) == expected
+    with (tmp_path / "out" / "tokens.csv").open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == list(EXPORT_FIELDS)
+    assert [row["lowerPoolAddress"] for row in rows] == [
+        row["lowerPoolAddress"] for row in expected
+    ]
+
+def test_sharded_run_exports_the_same_bytes_as_a_single_process(
+    replay_server, override_settings, tmp_path
+):
+    pairs = make_pairs(150, seed=5)
+    for pair in pairs:
+        # Ages depend on the wall clock, which would differ between the two runs.
+        del pair["pairCreatedAt"]
+    fixture = Fixture()
+    for n in range(5):
+        fixture.add(search_record(f"q-{n + 1:03d}", pairs[n * 30 : (n + 1) * 30]))
+    # Pools repeated by a target in the other shard must dedup in job order.
+    fixture.add(search_record("q-006", pairs[10:40] + pairs[100:110]))
+    server = replay_server(fixture)
+    queries = ["q-001", "q-002", "missing", "q-003", "q-006", "q-004", "q-005"]
+    (tmp_path / "inputs.json").write_text(
+        json.dumps([{"query": q} for q in queries]), encoding="utf-8"
+    )
+
+    override_settings("dexscreener", baseUrl=server.base_url)
+
+    def export(workers):
+        out = tmp_path / f"workers-{workers}"
+        args = build_arg_parser().parse_args(
+            [
+                "--input", str(tmp_path / "inputs.json"),
+                "--output-dir", str(out),
+                "--workers", str(workers),
+                "--format", "json,csv",
+                "--log-level", "ERROR",
+            ]
+        )
+        assert run_scraper(args) == 0
+        return (out / "tokens.json").read_bytes(), (out / "tokens.csv").read_bytes()
+
+    single, sharded = export(1), export(2)
+
+    assert sharded == single
+    assert len(json.loads(single[0])) == 150
@@ -0,0 +1,177 @@
+import json
+
+import pytest
+
+import scraper
+from conftest import make_pairs, search_record
+from extractors.async_client import FetchJob, FetchResult
+from extractors.dexscreener_parser import DexScreenerError
+from extractors.replay import Fixture
+from extractors.response_cache import ResponseCache
+from main import build_arg_parser
+from models.token_model import Token
+from outputs.run_checkpoint import CheckpointError, RunCheckpoint, latest_run_id
+
+JOBS = [FetchJob(query=f"q-{n}", spec={"query": f"q-{n}"}) for n in range(4)]
+
+def ok(position, symbol=None):
+    token = Token(tokenSymbol=symbol or f"T{position}", lowerPoolAddress=f"pool{position}")
+    return position, FetchResult(job=JOBS[position], tokens=[token])
+
+def failed(position):
+    return position, FetchResult(job=JOBS[position], error=DexScreenerError("HTTP 404"))
+
+def symbols(results):
+    return [
+        result.tokens[0].tokenSymbol if result.ok else f"error: {result.error}"
+        for result in results
+    ]
+
+def test_resume_skips_finished_targets_and_refetches_failed_ones(tmp_path):
+    first = RunCheckpoint.start(tmp_path, JOBS, run_id="run")
+    assert first.pending() == [0, 1, 2, 3]
+    list(first.record([ok(0), failed(1), ok(2)]))
+    assert (first.done, first.pending()) == (2, [1, 3])
+
+    resumed = RunCheckpoint.start(tmp_path, JOBS, resume=True)
+
+    assert resumed.run_id == "run"
+    assert resumed.state["attempts"] == 2
+    assert resumed.pending() == [1, 3]
+    list(resumed.record([ok(1), ok(3)]))
+    assert resumed.pending() == []
+    assert sorted(p.name for p in resumed.directory.glob("results-*.jsonl")) == [
+        "results-001-main.jsonl",
+        "results-002-main.jsonl",
+    ]
+
+def test_a_retry_that_fails_again_stays_pending_and_a_later_success_wins(tmp_path):
+    checkpoint = RunCheckpoint.start(tmp_path, JOBS, run_id="run")
+    list(checkpoint.record([ok(0, "old"), failed(1)]))
+    list(RunCheckpoint.start(tmp_path, JOBS, resume=True).record([failed(1), ok(0, "new")]))
+
+    resumed = RunCheckpoint.start(tmp_path, JOBS, resume=True)
+
+    assert resumed.pending() == [1, 2, 3]
+    assert resumed.read(0).tokens[0].tokenSymbol == "new"
+    assert str(resumed.read(1).error) == "HTTP 404"
+
+def test_scan_skips_a_line_torn_by_a_kill(tmp_path, caplog):
+    checkpoint = RunCheckpoint.start(tmp_path, JOBS, run_id="run")
+    list(checkpoint.record([ok(0), ok(1)]))
+    with checkpoint.results_path().open("ab") as f:
+        f.write(b'{"position": 2, "query": "q-2", "err')
+
+    resumed = RunCheckpoint.start(tmp_path, JOBS, resume=True)
+
+    assert resumed.pending() == [2, 3]
+    assert "unreadable checkpoint line" in caplog.text
+    assert symbols(resumed.iter_results()) == ["T0", "T1"]
+
+def test_iter_results_merges_fresh_and_checkpointed_targets_in_job_order(tmp_path):
+    checkpoint = RunCheckpoint.start(tmp_path, JOBS, run_id="run")
+    list(checkpoint.record([ok(0), failed(1), ok(3)], label="worker-1"))
+    list(checkpoint.record([ok(2)], label="worker-0"))
+    resumed = RunCheckpoint.start(tmp_path, JOBS, resume=True)
+
+    fresh = resumed.record([ok(1, "retried")])
+
+    assert symbols(resumed.iter_results(fresh)) == ["T0", "retried", "T2", "T3"]
+    # The retried target is now read back from this attempt's file.
+    assert symbols(resumed.iter_results()) == ["T0", "retried", "T2", "T3"]
+
+def test_resuming_different_targets_is_an_error(tmp_path):
+    RunCheckpoint.start(tmp_path, JOBS, run_id="run")
+    other_jobs = JOBS[:3]
+
+    with pytest.raises(CheckpointError, match="different target list"):
+        RunCheckpoint.start(tmp_path, other_jobs, run_id="run", resume=True)
+    with pytest.raises(CheckpointError, match="No unfinished run"):
+        RunCheckpoint.start(tmp_path, other_jobs, resume=True)
+    with pytest.raises(CheckpointError, match="already exists"):
+        RunCheckpoint.start(tmp_path, JOBS, run_id="run")
+    with pytest.raises(CheckpointError, match="No checkpointed run 'gone'"):
+        RunCheckpoint.start(tmp_path, JOBS, run_id="gone", resume=True)
+
+def test_completed_runs_are_not_resumed(tmp_path):
+    RunCheckpoint.start(tmp_path, JOBS, run_id="kept").complete(keep=True)
+    RunCheckpoint.start(tmp_path, JOBS, run_id="removed").complete()
+
+    assert latest_run_id(tmp_path) is None
+    assert not (tmp_path / "removed").exists()
+
+def test_killed_run_resumes_to_the_same_export_as_a_clean_run(
+    replay_server, override_settings, monkeypatch, tmp_path
+):
+    pairs = make_pairs(120, seed=7)
+    for pair in pairs:
+        # Ages depend on the wall clock, which moves between the runs.
+        del pair["pairCreatedAt"]
+    queries = ["q-001", "q-002", "q-003", "q-004"]
+    pages = {query: pairs[n * 30 : (n + 1) * 30] for n, query in enumerate(queries)}
+
+    def fixture(flaky=()):
+        fixture = Fixture()
+        for query in queries:
+            if query in flaky:
+                fixture.add(search_record(query, [], status=404))
+            fixture.add(search_record(query, pages[query]))
+        return fixture
+
+    clean_server = replay_server(fixture())
+    killed_fixture = fixture(flaky=("q-002",))
+    killed_server = replay_server(killed_fixture)
+    (tmp_path / "inputs.json").write_text(
+        json.dumps([{"query": q} for q in queries]), encoding="utf-8"
+    )
+
+    override_settings("checkpoint", directory=str(tmp_path / "checkpoints"))
+
+    def run(server, output, *extra):
+        override_settings("dexscreener", baseUrl=server.base_url)
+        args = build_arg_parser().parse_args(
+            [
+                "--input", str(tmp_path / "inputs.json"),
+                "--output-dir", str(tmp_path / output),
+                "--log-level", "ERROR",
+                *extra,
+            ]
+        )
+        return scraper.run_scraper(args)
+
+    assert run(clean_server, "clean") == 0
+
+    # --run-id turns checkpointing on. Kill the run once three targets (one
+    # of them failed) are checkpointed, partway through writing the fourth.
+    export_streaming = scraper.export_streaming
+
+    def killed(results, writers, **kwargs):
+        for taken, _ in enumerate(results, 1):
+            if taken == 3:
+                (path,) = (tmp_path / "checkpoints" / "run").glob("results-*.jsonl")
+                with path.open("ab") as f:
+                    f.write(b'{"position": 3, "query": "q-004", "tok')
+                raise KeyboardInterrupt
+
+    monkeypatch.setattr(scraper, "export_streaming", killed)
+    with pytest.raises(KeyboardInterrupt):
+        run(killed_server, "resumed", "--run-id", "run")
+    assert not (tmp_path / "resumed" / "tokens.json").exists()
+
+    monkeypatch.setattr(scraper, "export_streaming", export_streaming)
+    assert run(killed_server, "resumed", "--resume", "--run-id", "run") == 0
+
+    served = {
+        query: killed_fixture._served[ResponseCache.make_key("search", {"q": query})]
+        for query in queries
+    }
+    # Finished targets are not fetched again; the failed and the torn one are.
+    assert served == {"q-001": 1, "q-002": 2, "q-003": 1, "q-004": 1}
+    assert (tmp_path / "resumed" / "tokens.json").read_bytes() == (
+        tmp_path / "clean" / "tokens.json"
+    ).read_bytes()
+    assert (tmp_path / "resumed" / "tokens.csv").read_bytes() == (
+        tmp_path / "clean" / "tokens.csv"
+    ).read_bytes()
+    # A completed run's checkpoint is removed.
+    assert not (tmp_path / "checkpoints" / "run").exists()
@@ -0,0 +1,93 @@
+import json
+import os
+import stat
+
+from extractors.run_metrics import (
+    STAGE_PARSE,
+    STAGE_REQUEST,
+    RunSummary,
+    StageStats,
+    StageTimers,
+    TargetSummary,
+    render_prometheus,
+    write_run_summary,
+)
+
+def test_stage_timers_merge_worker_stats_and_snapshot_copies():
+    timers = StageTimers()
+    timers.observe(STAGE_REQUEST, 0.5)
+    timers.observe(STAGE_REQUEST, 0.25)
+    with timers.time(STAGE_PARSE):
+        pass
+
+    timers.merge({STAGE_REQUEST: StageStats(2, 2.0, 1.5), "export": StageStats(1, 0.1, 0.1)})
+    snapshot = timers.snapshot()
+    snapshot[STAGE_REQUEST].add(10.0)
+
+    stages = timers.as_dict()
+    assert stages[STAGE_REQUEST] == {
+        "count": 4,
+        "totalSeconds": 2.75,
+        "maxSeconds": 1.5,
+        "meanSeconds": 0.6875,
+    }
+    assert stages[STAGE_PARSE]["count"] == 1
+    assert stages["export"]["meanSeconds"] == 0.1
+    assert StageStats().as_dict()["meanSeconds"] == 0.0
+
+def test_render_prometheus_golden_output():
+    text = render_prometheus(
+        {"requests": 12, "retries": 1},
+        {"request": StageStats(2, 0.75, 0.5), "decode": StageStats(3, 0.0123456789, 0.01)},
+        {"tokens_exported": 60, "last_cycle_seconds": 1.25},
+    )
+
+    assert text == (
+        "# TYPE dexscreener_requests_total counter\n"
+        "dexscreener_requests_total 12\n"
+        "# TYPE dexscreener_retries_total counter\n"
+        "dexscreener_retries_total 1\n"
+        "# TYPE dexscreener_tokens_exported gauge\n"
+        "dexscreener_tokens_exported 60\n"
+        "# TYPE dexscreener_last_cycle_seconds gauge\n"
+        "dexscreener_last_cycle_seconds 1.25\n"
+        "# TYPE dexscreener_stage_seconds summary\n"
+        'dexscreener_stage_seconds_sum{stage="decode"} 0.012346\n'
+        'dexscreener_stage_seconds_count{stage="decode"} 3\n'
+        'dexscreener_stage_seconds_sum{stage="request"} 0.750000\n'
+        'dexscreener_stage_seconds_count{stage="request"} 2\n'
+        "# TYPE dexscreener_stage_max_seconds gauge\n"
+        'dexscreener_stage_max_seconds{stage="decode"} 0.010000\n'
+        'dexscreener_stage_max_seconds{stage="request"} 0.500000\n'
+    )
+    assert render_prometheus({}, {}, {}, prefix="x") == "\n"
+
+def test_run_summary_round_trips_through_the_written_file(tmp_path):
+    summary = RunSummary(started_at=0.0, exported=60, alerts_fired=2)
+    summary.targets = [
+        TargetSummary(query="q-001", ok=True, tokens=60, coverage={"pages": 1}),
+        TargetSummary(query="q-002", ok=False, tokens=0, error="HTTP 404"),
+    ]
+    stages = {STAGE_PARSE: StageStats(1, 0.5, 0.5).as_dict()}
+    path = tmp_path / "out" / "run_summary.json"
+    path.parent.mkdir()
+    path.write_text("{}", encoding="utf-8")
+    os.chmod(path, 0o640)
+
+    write_run_summary(summary.to_dict({"requests": 2, "tokens_built": 60}, stages), path)
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["startedAt"] == "1970-01-01T00:00:00+00:00"
+    assert data["tokensExported"] == 60
+    assert data["alertsFired"] == 2
+    assert data["parseTokensPerSecond"] == 120.0
+    assert data["tokensPerSecond"] > 0
+    assert data["counters"] == {"requests": 2, "tokens_built": 60}
+    assert data["stages"] == stages
+    assert data["targets"] == [
+        {"query": "q-001", "ok": True, "tokens": 60, "error": None, "coverage": {"pages": 1}},
+        {"query": "q-002", "ok": False, "tokens": 0, "error": "HTTP 404", "coverage": None},
+    ]
+    # The replacement keeps the old file's permissions and leaves no temp files behind.
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert [p.name for p in path.parent.iterdir()] == ["run_summary.json"]
@@ -0,0 +1,141 @@
+import json
+import time
+
+import pytest
+import requests
+
+from extractors.snapshot_diff import TokenChange
+from extractors.snapshot_server import SnapshotHub, SnapshotServer
+from extractors.token_index import TokenIndex
+from models.token_model import Token
+
+def make_token(pool, chain="solana", volume=None, liquidity=None, address=None):
+    return Token(
+        tokenSymbol=pool.upper(),
+        volumeUsd=volume,
+        liquidityUsd=liquidity,
+        address=address,
+        pairDetailUrl=f"https://dexscreener.com/{chain}/{pool}",
+        lowerPoolAddress=pool,
+    )
+
+def make_index():
+    index = TokenIndex()
+    index.add(make_token("p1", volume=500.0, liquidity=2000.0, address="TokA"), source="sol")
+    index.add(make_token("p2", chain="base", volume=900.0, liquidity=50.0), source="base")
+    index.add(make_token("p3", volume=100.0, liquidity=5000.0, address="toka"), source="sol")
+    index.add(make_token("p4", volume=None, liquidity=3000.0), source="sol")
+    index.add(make_token("p1", volume=500.0, liquidity=2000.0, address="TokA"), source="raydium")
+    return index
+
+@pytest.fixture
+def served():
+    hub = SnapshotHub()
+    server = SnapshotServer(hub, port=0, default_limit=2, max_limit=3, keepalive=0.05).start()
+    hub.publish(make_index())
+    yield hub, server
+    server.stop()
+
+def get(server, path, status=200):
+    response = requests.get(server.base_url + path, timeout=5)
+    assert response.status_code == status, response.text
+    return response.json()
+
+def pools(body):
+    return [token["lowerPoolAddress"] for token in body["tokens"]]
+
+def test_tokens_are_filtered_sorted_and_paginated(served):
+    _, server = served
+
+    everything = get(server, "/tokens?limit=10")
+    assert (everything["version"], everything["total"]) == (1, 4)
+    assert pools(everything) == ["p1", "p2", "p3"]
+    assert pools(get(server, "/tokens")) == ["p1", "p2"]
+    assert pools(get(server, "/tokens?offset=3")) == ["p4"]
+
+    by_volume = get(server, "/tokens?sort=volumeUsd&limit=3")
+    assert pools(by_volume) == ["p2", "p1", "p3"]
+    assert pools(get(server, "/tokens?sort=volumeUsd&order=asc&offset=2&limit=2")) == ["p2", "p4"]
+
+    solana = get(server, "/tokens?chainId=solana,base&minLiquidityUsd=2500&sort=liquidityUsd")
+    assert solana["total"] == 2
+    assert pools(solana) == ["p3", "p4"]
+    assert get(server, "/tokens?chainId=base&offset=5")["tokens"] == []
+
+def test_token_lookup_by_pool_or_token_address(served):
+    _, server = served
+
+    (pool,) = get(server, "/tokens/P1")["tokens"]
+    assert pool["sources"] == ["sol", "raydium"]
+    assert pools(get(server, "/tokens/toka")) == ["p1", "p3"]
+    assert get(server, "/tokens/unknown")["tokens"] == []
+
+@pytest.mark.parametrize(
+    "query, message",
+    [
+        ("sort=raw", "Cannot sort by 'raw'"),
+        ("order=up", "'order' must be asc or desc"),
+        ("limit=ten", "must be integers"),
+        ("minVolumeUsd=lots", "needs a numeric value"),
+        ("colour=red", "Unknown condition 'colour'"),
+    ],
+)
+def test_bad_queries_are_400s(served, query, message):
+    _, server = served
+
+    assert message in get(server, f"/tokens?{query}", status=400)["error"]
+
+def test_unknown_paths_are_404s_and_health_reports_the_snapshot(served):
+    hub, server = served
+
+    assert get(server, "/nope", status=404) == {"error": "Unknown path /nope"}
+    health = get(server, "/health")
+    assert (health["version"], health["tokens"], health["subscribers"]) == (1, 4, 0)
+
+    hub.publish(TokenIndex.from_tokens([make_token("p9")]))
+    assert get(server, "/")["version"] == 2
+    assert pools(get(server, "/tokens")) == ["p9"]
+
+def test_hub_fans_events_out_and_drops_subscribers_that_fall_behind():
+    hub = SnapshotHub(max_pending=2)
+    fast, slow = hub.subscribe(), hub.subscribe()
+    change = TokenChange("added", "p1", "2026-01-01T00:00:00+00:00")
+
+    hub.publish(make_index(), [change])
+    message = fast.queue.get_nowait().decode("utf-8")
+    assert message.startswith("id: 1\nevent: changes\ndata: ")
+    event = json.loads(message.split("data: ", 1)[1])
+    assert (event["version"], event["tokens"], event["changes"]) == (1, 4, [change.to_dict()])
+
+    hub.publish(make_index())
+    assert not slow.dropped and hub.subscribers == 2
+    hub.publish(make_index())
+
+    assert slow.dropped and not fast.dropped
+    assert hub.subscribers == 1
+    fast.queue.get_nowait()
+    hub.close()
+    assert [fast.queue.get_nowait() for _ in range(2)][-1] is None
+
+def test_stream_sends_one_event_per_publish(served):
+    hub, server = served
+
+    with requests.get(server.base_url + "/stream", stream=True, timeout=5) as response:
+        assert response.headers["Content-Type"] == "text/event-stream"
+        lines = response.iter_lines(chunk_size=1, decode_unicode=True)
+        assert next(lines) == "retry: 5000"
+        assert next(lines) == "id: 1"
+        hub.publish(make_index(), [TokenChange("removed", "p9", "2026-01-01T00:00:00+00:00")])
+
+        # Keep-alive comments arrive between events but are not events.
+        events = (line for line in lines if line.startswith(("id:", "data:")))
+        assert next(events) == "id: 2"
+        data = json.loads(next(events)[len("data: ") :])
+        assert (data["version"], data["changes"][0]["type"]) == (2, "removed")
+        assert hub.subscribers == 1
+
+    # The handler notices the closed connection at its next keep-alive.
+    deadline = time.monotonic() + 5
+    while hub.subscribers and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert hub.subscribers == 0
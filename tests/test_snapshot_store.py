@@ -0,0 +1,95 @@
+from models.token_model import Token
+from outputs.snapshot_store import SnapshotStore, SnapshotStoreWriter
+
+def make_token(n, price, chain="solana"):
+    return Token(
+        tokenSymbol=f"T{n}",
+        priceUsd=price,
+        pairDetailUrl=f"https://dexscreener.com/{chain}/pool{n}",
+        lowerPoolAddress=f"pool{n}",
+    )
+
+def test_latest_and_at_pick_the_newest_row_per_pool(tmp_path):
+    store = SnapshotStore(tmp_path / "history.sqlite3")
+    store.record([make_token(n, 1.0) for n in range(3)], timestamp=100)
+    store.record([make_token(n, 2.0) for n in range(2)], timestamp=200)
+    store.record([make_token(0, 3.0)], timestamp=300)
+
+    latest = {s.token.lowerPoolAddress: (s.timestamp, s.token.priceUsd) for s in store.latest()}
+    assert latest == {"pool0": (300, 3.0), "pool1": (200, 2.0), "pool2": (100, 1.0)}
+
+    as_of = {s.token.lowerPoolAddress: s.timestamp for s in store.at(250)}
+    assert as_of == {"pool0": 200, "pool1": 200, "pool2": 100}
+    assert [s.timestamp for s in store.at(250, pool_address="POOL1")] == [200]
+    assert store.at(50) == []
+    assert [s.chain_id for s in store.latest(chain_id="solana", limit=1)] == ["solana"]
+    assert store.latest(chain_id="base") == []
+
+def test_writer_flushes_in_batches_under_one_timestamp(tmp_path):
+    store = SnapshotStore(tmp_path / "history.sqlite3")
+    writer = SnapshotStoreWriter(store, batch_size=4)
+
+    writer.open()
+    writer.write_many(make_token(n, float(n)) for n in range(10))
+    assert len(writer._tokens) == 2
+    assert store.stats()["snapshots"] == 8
+    writer.commit()
+
+    assert writer.count == 10
+    assert {s.timestamp for s in store.latest()} == {writer._timestamp}
+    assert len(store.latest()) == 10
+
+def test_writer_abort_discards_flushed_batches(tmp_path):
+    store = SnapshotStore(tmp_path / "history.sqlite3")
+    store.record([make_token(0, 1.0)], timestamp=100)
+    writer = SnapshotStoreWriter(store, batch_size=2)
+
+    writer.open()
+    writer.write_many(make_token(n, 2.0) for n in range(5))
+    writer.abort()
+
+    assert [(s.timestamp, s.token.priceUsd) for s in store.latest()] == [(100, 1.0)]
+
+def test_abort_leaves_rows_other_writers_recorded_in_the_same_second(tmp_path):
+    store = SnapshotStore(tmp_path / "history.sqlite3")
+    writer = SnapshotStoreWriter(store, batch_size=2)
+
+    writer.open()
+    store.record([make_token(99, 9.0)], timestamp=writer._timestamp)
+    writer.write_many(make_token(n, 2.0) for n in range(5))
+    writer.abort()
+
+    assert [s.token.lowerPoolAddress for s in store.latest()] == ["pool99"]
+
+def test_retention_drops_old_rows_and_orphaned_pools(tmp_path):
+    day = 86400
+    store = SnapshotStore(tmp_path / "history.sqlite3", retention_days=1)
+    store.record([make_token(0, 1.0), make_token(1, 1.0)], timestamp=10 * day)
+    store.record([make_token(0, 2.0)], timestamp=12 * day)
+
+    assert store.maintain(now=12 * day + 60) == 2
+
+    assert [(s.token.lowerPoolAddress, s.timestamp) for s in store.latest()] == [
+        ("pool0", 12 * day)
+    ]
+    assert store.stats()["pools"] == 1
+    # A pool dropped by retention is interned again when it comes back.
+    store.record([make_token(1, 3.0)], timestamp=12 * day + 30)
+    assert len(store.latest()) == 2
+
+def test_compaction_keeps_the_last_row_per_pool_and_bucket(tmp_path):
+    hour = 3600
+    store = SnapshotStore(
+        tmp_path / "history.sqlite3", compact_after_hours=1, compact_bucket_minutes=60
+    )
+    for ts in (0, 600, 1200, hour + 100, hour + 200):
+        store.record([make_token(0, float(ts)), make_token(1, float(ts))], timestamp=ts)
+
+    # Only the first bucket is older than an hour at 2h + 1s.
+    assert store.compact(now=2 * hour + 1) == 4
+    assert [s.timestamp for s in store.history("pool0")] == [1200, hour + 100, hour + 200]
+    # Compaction is incremental: the same bucket is not scanned again.
+    assert store.compact(now=2 * hour + 1) == 0
+
+    assert store.compact(now=3 * hour) == 2
+    assert [s.timestamp for s in store.history("pool1")] == [1200, hour + 200]
@@ -0,0 +1,37 @@
+from extractors.token_index import TokenIndex
+from models.token_model import Token
+
+def token(pool, name, chain="solana", address=None):
+    return Token(
+        tokenName=name,
+        address=address,
+        pairDetailUrl=f"https://dexscreener.com/{chain}/{pool}",
+        lowerPoolAddress=pool,
+    )
+
+def test_duplicates_keep_the_freshest_record_and_every_source():
+    index = TokenIndex()
+    index.add(token("p1", "old"), source="solana", seen_at=10)
+    index.add(token("p2", "two"), source="solana", seen_at=10)
+    index.add(token("p1", "new"), source="solana/raydium", seen_at=20)
+    index.add(token("p1", "stale"), source="raydium", seen_at=5)
+
+    assert [t.tokenName for t in index.tokens()] == ["new", "two"]
+    (entry,) = index.lookup("P1")
+    assert entry.sources == ["solana", "solana/raydium", "raydium"]
+    assert entry.seen_at == 20
+    assert index.duplicates == 2
+
+def test_lookup_by_pool_or_token_address_across_chains():
+    index = TokenIndex.from_tokens(
+        [
+            token("p1", "sol", address="TokA"),
+            token("p1", "base", chain="base"),
+            token("p2", "other", address="toka"),
+        ]
+    )
+
+    assert [e.token.tokenName for e in index.lookup("p1")] == ["sol", "base"]
+    assert [e.token.tokenName for e in index.lookup("TOKA")] == ["sol", "other"]
+    assert [e.position for e in index.lookup("toka")] == [0, 2]
+    assert index.lookup("missing") == []
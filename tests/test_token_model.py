@@ -0,0 +1,159 @@
+import math
+import random
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+import pytest
+
+from extractors.token_utils import safe_get_nested
+from models.token_batch import TokenBatch
+from models.token_model import EXPORT_FIELDS, Token
+
+NOW = 1_700_000_000.0
+
+def reference_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+def reference_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def reference_mapping(pair):
+    """The original safe_get_nested/urlparse/datetime mapping, kept as the oracle."""
+    base_token = pair.get("baseToken") or {}
+    url = pair.get("url")
+    if not url and pair.get("chainId") and pair.get("pairAddress"):
+        url = f"https://dexscreener.com/{pair['chainId']}/{pair['pairAddress']}"
+    segments = [seg for seg in urlparse(url).path.split("/") if seg] if url else []
+    created_ms = pair.get("pairCreatedAt")
+    age = None
+    if created_ms:
+        created = datetime.fromtimestamp(created_ms / 1000.0, tz=timezone.utc)
+        delta = datetime.fromtimestamp(NOW, tz=timezone.utc) - created
+        age = round(delta.total_seconds() / 3600.0, 2)
+    buys = reference_int(safe_get_nested(pair, "txns", "h24", "buys", default=0))
+    sells = reference_int(safe_get_nested(pair, "txns", "h24", "sells", default=0))
+    return {
+        "tokenName": base_token.get("name"),
+        "tokenSymbol": base_token.get("symbol"),
+        "priceUsd": reference_float(pair.get("priceUsd")),
+        "age": age,
+        "transactionCount": ((buys or 0) + (sells or 0)) or None,
+        "volumeUsd": reference_float(safe_get_nested(pair, "volume", "h24")),
+        "makerCount": reference_int(
+            safe_get_nested(pair, "makers", "h24") or pair.get("makerCount")
+        ),
+        "priceChange5m": reference_float(safe_get_nested(pair, "priceChange", "m5")),
+        "priceChange1h": reference_float(safe_get_nested(pair, "priceChange", "h1")),
+        "priceChange6h": reference_float(safe_get_nested(pair, "priceChange", "h6")),
+        "priceChange24h": reference_float(safe_get_nested(pair, "priceChange", "h24")),
+        "liquidityUsd": reference_float(safe_get_nested(pair, "liquidity", "usd")),
+        "marketCapUsd": reference_float(pair.get("fdv")),
+        "boost": reference_float(pair.get("boostScore") or pair.get("boost")),
+        "pairDetailUrl": url,
+        "address": base_token.get("address"),
+        "lowerPoolAddress": segments[-1].lower() if segments else None,
+        "tokenImageUrl": safe_get_nested(pair, "info", "imageUrl")
+        or safe_get_nested(pair, "baseToken", "imageUrl")
+        or None,
+    }
+
+def maybe(rng, value):
+    """`value`, or one of the shapes the API (or a broken proxy) sends instead."""
+    return rng.choice([value, value, value, None, "", "n/a", "NaN", str(value), [], {}])
+
+def random_pair(rng):
+    chain = rng.choice(["solana", "ethereum", "base", None])
+    address = "".join(rng.choice("abcdefABCDEF0123456789") for _ in range(12))
+    pair = {
+        "chainId": chain,
+        "pairAddress": maybe(rng, address),
+        "url": rng.choice(
+            [
+                f"https://dexscreener.com/{chain}/{address.lower()}",
+                f"https://dexscreener.com/{chain}/{address}/",
+                f"https://dexscreener.com/{chain}/{address}?embed=1",
+                f"http://dexscreener.com/{chain}/{address}#top",
+                f"https://example.com/pairs/{address}",
+                "https://dexscreener.com/",
+                None,
+                "",
+            ]
+        ),
+        "baseToken": rng.choice(
+            [
+                {"name": "Token", "symbol": "TKN", "address": address},
+                {"imageUrl": "https://img.example/b.png"},
+                None,
+            ]
+        ),
+        "priceUsd": maybe(rng, rng.random() * 10),
+        "txns": rng.choice(
+            [
+                {"h24": {"buys": maybe(rng, rng.randint(0, 9)), "sells": rng.randint(0, 9)}},
+                {"h24": None},
+                {"m5": {"buys": 1}},
+                "bad",
+                None,
+            ]
+        ),
+        "volume": rng.choice([{"h24": maybe(rng, rng.random() * 1e6)}, None, 5]),
+        "priceChange": rng.choice(
+            [
+                {k: maybe(rng, rng.uniform(-50, 50)) for k in ("m5", "h1", "h6", "h24")},
+                {"h1": 3},
+                None,
+            ]
+        ),
+        "liquidity": rng.choice([{"usd": maybe(rng, rng.random() * 1e6)}, None, []]),
+        "fdv": maybe(rng, rng.random() * 1e8),
+        "makers": rng.choice([{"h24": maybe(rng, rng.randint(0, 500))}, None]),
+        "makerCount": rng.choice([None, 7, "8"]),
+        "pairCreatedAt": rng.choice(
+            [int(NOW * 1000) - rng.randint(0, 10**10), None, 0]
+        ),
+        "boostScore": rng.choice([None, 0, 12.5, "3"]),
+        "boost": rng.choice([None, 4]),
+        "info": rng.choice([{"imageUrl": "https://img.example/i.png"}, {}, None]),
+    }
+    for key in list(pair):
+        if rng.random() < 0.1:
+            del pair[key]
+    return pair
+
+def assert_matches_reference(token, pair):
+    got = token.to_dict()
+    want = reference_mapping(pair)
+    assert got.pop("age") == pytest.approx(want.pop("age"), abs=0.011)
+    for name, value in want.items():
+        assert got[name] == value, (name, pair)
+
+def test_fast_mapping_matches_reference_on_random_payloads():
+    rng = random.Random(20240607)
+    pairs = [random_pair(rng) for _ in range(5000)]
+
+    for pair in pairs:
+        assert_matches_reference(Token.from_pair_payload(pair, now=NOW), pair)
+
+def test_batch_paths_agree_with_single_pair_path():
+    rng = random.Random(7)
+    pairs = [random_pair(rng) for _ in range(500)]
+
+    single = [Token.from_pair_payload(pair, now=NOW).to_dict() for pair in pairs]
+    assert [t.to_dict() for t in Token.from_pair_payloads(pairs, now=NOW)] == single
+    assert list(TokenBatch.from_pair_payloads(pairs, now=NOW).rows()) == single
+
+def test_to_dict_round_trips_and_omits_raw():
+    pair = random_pair(random.Random(1))
+    token = Token.from_pair_payload(pair, now=NOW)
+
+    data = token.to_dict()
+
+    assert list(data) == list(EXPORT_FIELDS)
+    assert Token.from_dict(data).to_dict() == data
@@ -0,0 +1,79 @@
+from collections import deque
+
+from conftest import make_pairs, search_record, synthetic_fixture
+from extractors.adaptive_scheduler import SchedulerConfig
+from extractors.async_client import FetchJob
+from extractors.dexscreener_parser import DexScreenerClient
+from extractors.response_cache import SQLiteResponseCache
+from scraper import run_watch
+
+class ScriptedScheduler:
+    """Stands in for AdaptiveScheduler, refreshing one scripted list of positions per tick."""
+
+    def __init__(self, rounds):
+        self.rounds = deque(rounds)
+        self.config = SchedulerConfig(tick_seconds=0.001)
+
+    def due(self):
+        return self.rounds.popleft() if self.rounds else []
+
+    def observe_many(self, results):
+        pass
+
+    def seconds_until_due(self):
+        return 0.0
+
+class RecordingHistory:
+    def __init__(self):
+        self.batches = []
+
+    def record(self, tokens, timestamp=None):
+        self.batches.append(len(list(tokens)))
+
+    def maintain(self):
+        pass
+
+class RecordingHub:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, tokens, changes=()):
+        self.published.append((len(list(tokens)), len(changes)))
+
+def test_plain_watch_without_targets_does_not_crash(tmp_path):
+    client = DexScreenerClient(base_url="http://127.0.0.1:9")
+
+    assert run_watch(client, [], 1, 0.0, tmp_path / "changes.jsonl", max_cycles=2) == 0
+
+def test_scheduled_cycles_record_and_publish_only_what_changed(replay_server, tmp_path):
+    fixture = synthetic_fixture(2)
+    fixture.add(search_record("q-002", make_pairs(30, seed=9)))
+    server = replay_server(fixture)
+    jobs = [FetchJob(query="q-001"), FetchJob(query="q-002")]
+    history, hub = RecordingHistory(), RecordingHub()
+
+    run_watch(
+        DexScreenerClient(base_url=server.base_url),
+        jobs,
+        1,
+        0.0,
+        tmp_path / "changes.jsonl",
+        max_cycles=3,
+        history=history,
+        hub=hub,
+        scheduler=ScriptedScheduler([[0, 1], [], [1], [0]]),
+    )
+
+    # Each cycle records only the targets it refreshed, not carried-forward pools.
+    assert history.batches == [60, 30, 30]
+    # q-002's new page replaces its 30 pools; q-001's unchanged refresh publishes nothing.
+    assert hub.published == [(60, 60), (60, 60)]
+
+def test_cache_ttls_can_be_capped_at_the_refresh_interval(tmp_path):
+    cache = SQLiteResponseCache(tmp_path / "cache.sqlite3", default_ttl=30, ttls={"search": 60})
+
+    cache.cap_ttls(5)
+
+    assert cache.ttl_for("search") == 5
+    assert cache.ttl_for("pairs/solana/x") == 5
+    cache.close()